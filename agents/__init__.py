@@ -1,7 +1,20 @@
-from .career_mapper import create_career_mapper
-from .roi_analyzer import create_roi_analyzer
-from .fire_planner import create_fire_planner
-from .market_watcher import create_market_watcher
+# Agent factories import crewai, so they are loaded on first access
+_FACTORIES = {
+    'create_career_mapper': '.career_mapper',
+    'create_roi_analyzer': '.roi_analyzer',
+    'create_fire_planner': '.fire_planner',
+    'create_market_watcher': '.market_watcher',
+}
+
+
+def __getattr__(name):
+    if name in _FACTORIES:
+        from importlib import import_module
+        value = getattr(import_module(_FACTORIES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'create_career_mapper',
@@ -0,0 +1,38 @@
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+AGENTS_CONFIG = 'config/agents.yaml'
+TASKS_CONFIG = 'config/tasks.yaml'
+
+# {path: (mtime_ns, parsed config)}
+_cache: Dict[str, Tuple[int, Any]] = {}
+_lock = threading.Lock()
+
+
+def load_config(path: str) -> Any:
+    """Load a YAML config file, re-parsing it only when its mtime changes."""
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    with _lock:
+        _cache[path] = (mtime, config)
+    return config
+
+
+def agent_config(name: str, path: str = AGENTS_CONFIG) -> Dict[str, Any]:
+    """Config block of one agent from agents.yaml."""
+    return load_config(path)[name]
+
+
+def clear_config_cache() -> None:
+    """Drop every cached config file."""
+    with _lock:
+        _cache.clear()
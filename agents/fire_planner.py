@@ -1,23 +1,19 @@
-from crewai import Agent
-from langchain_groq import ChatGroq
-from tools import search_web, export_data
-import yaml
+from crewai import LLM, Agent
+from tools import search_indexed, search_web, export_data
+from .config import agent_config
 
 
-def create_fire_planner(llm: ChatGroq) -> Agent:
+def create_fire_planner(llm: LLM) -> Agent:
     """Create fire_planner agent."""
     
-    with open('config/agents.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    
-    agent_config = config['fire_planner']
+    config = agent_config('fire_planner')
     
     return Agent(
-        role=agent_config['role'],
-        goal=agent_config['goal'],
-        backstory=agent_config['backstory'],
-        verbose=agent_config['verbose'],
-        allow_delegation=agent_config['allow_delegation'],
+        role=config['role'],
+        goal=config['goal'],
+        backstory=config['backstory'],
+        verbose=config['verbose'],
+        allow_delegation=config['allow_delegation'],
         llm=llm,
-        tools=[search_web, export_data]
+        tools=[search_indexed, search_web, export_data]
     )
@@ -1,23 +1,19 @@
-from crewai import Agent
-from langchain_groq import ChatGroq
-from tools import search_web, export_data
-import yaml
+from crewai import LLM, Agent
+from tools import search_indexed, search_web, export_data
+from .config import agent_config
 
 
-def create_market_watcher(llm: ChatGroq) -> Agent:
+def create_market_watcher(llm: LLM) -> Agent:
     """Create market_watcher agent."""
     
-    with open('config/agents.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    
-    agent_config = config['market_watcher']
+    config = agent_config('market_watcher')
     
     return Agent(
-        role=agent_config['role'],
-        goal=agent_config['goal'],
-        backstory=agent_config['backstory'],
-        verbose=agent_config['verbose'],
-        allow_delegation=agent_config['allow_delegation'],
+        role=config['role'],
+        goal=config['goal'],
+        backstory=config['backstory'],
+        verbose=config['verbose'],
+        allow_delegation=config['allow_delegation'],
         llm=llm,
-        tools=[search_web, export_data]
+        tools=[search_indexed, search_web, export_data]
     )
@@ -0,0 +1,8 @@
+"""
+Benchmarks for the CrewAI workflow
+Run from the repository root, e.g. `python -m benchmarks.import_time`
+"""
+
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
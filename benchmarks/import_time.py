@@ -0,0 +1,101 @@
+"""
+Cold-start import cost
+Summarizes `python -X importtime` for the workflow's entry points and times `main.py --help`
+
+Usage: python -m benchmarks.import_time [--target MODULE] [--top N] [--runs N] [--json]
+
+Each target is imported in a fresh interpreter; the summary lists the total import
+time and the top-level packages that cost the most (cumulative, in ms). A module that
+fails to import (e.g. crewai not installed) is reported with its error.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks import ROOT_DIR
+
+TARGETS = ["agents", "tools", "agents.config", "pipeline", "main"]
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Cumulative microseconds per top-level package from -X importtime output"""
+    packages: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        # Nested imports are indented; the top-level entry already includes them
+        if name == name.lstrip():
+            packages[name.split(".")[0]] += int(cumulative)
+    return packages
+
+
+def measure_import(module: str, top: int) -> dict:
+    """Import one module in a fresh interpreter and summarize its import tree"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    packages = parse_importtime(proc.stderr)
+    row = {
+        "target": module,
+        "total_ms": round(sum(packages.get(name, 0) for name in packages) / 1000, 1),
+        "top": [
+            {"package": name, "ms": round(us / 1000, 1)}
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+    if proc.returncode:
+        row["error"] = proc.stderr.strip().splitlines()[-1]
+    return row
+
+
+def measure_help(runs: int) -> dict:
+    """Median wall-clock time of `main.py --help`, interpreter startup included"""
+    samples: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", "--help"], cwd=ROOT_DIR, capture_output=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"runs": runs, "median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", action="append", help=f"module to import (repeatable, default: {', '.join(TARGETS)})")
+    parser.add_argument("--top", type=int, default=5, help="most expensive packages to list per target")
+    parser.add_argument("--runs", type=int, default=5, help="`main.py --help` runs to take the median of")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": [measure_import(module, args.top) for module in args.target or TARGETS],
+        "help": measure_help(args.runs),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Python {report['python']}")
+    print(f"{'target':<16}{'total ms':>10}  most expensive packages")
+    for row in report["imports"]:
+        top = ", ".join(f"{p['package']} {p['ms']}" for p in row["top"])
+        print(f"{row['target']:<16}{row['total_ms']:>10}  {top}")
+        if "error" in row:
+            print(f"{'':<16}{'':>10}  failed: {row['error']}")
+    help_ = report["help"]
+    print(f"\nmain.py --help: median {help_['median_ms']} ms, min {help_['min_ms']} ms over {help_['runs']} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Web search latency and network calls
+Compares one-by-one queries, a concurrent batch, a repeat run served from the cache, and
+lookups in the local search index
+
+Usage: python -m benchmarks.search [--latency-ms N] [--live] [--json]
+
+Queries are the kind career_mapper sends in one run, including near-duplicates that
+normalize to the same cache key. Without --live each Serper call is simulated with a
+fixed latency; --live calls Serper (SERPER_API_KEY). Every run uses a fresh temporary
+cache directory.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import tools.search_index as search_index
+import tools.search_tool as search_tool
+
+QUERIES = [
+    "METU Statistics graduate data scientist LinkedIn",
+    "metu statistics graduate  data scientist linkedin",
+    "METU Statistics graduate quantitative analyst",
+    "METU Statistics alumni machine learning engineer Istanbul",
+    "METU Statistics graduate actuary salary Turkey",
+    "METU Statistics alumni remote data engineer Europe",
+    "METU Statistics graduate quantitative analyst ",
+    "METU Statistics alumni product analyst fintech",
+]
+
+
+class SimulatedSession:
+    """Stands in for the Serper session: fixed latency, deterministic results"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        time.sleep(self.latency_s)
+        query = search_tool.normalize_query(json["q"])
+        # The first few links are shared by every query, as popular pages are in practice
+        organic = [
+            {"title": f"{query} #{i}", "snippet": query,
+             "link": f"https://example.com/{i}/" if i < 4 else f"https://example.com/{query.replace(' ', '-')}/{i}"}
+            for i in range(json["num"])
+        ]
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"organic": organic})
+
+
+def _run(label: str, fn) -> dict:
+    before = search_tool.search_stats()
+    start = time.perf_counter()
+    results = fn()
+    after = search_tool.search_stats()
+    return {
+        "mode": label,
+        "seconds": round(time.perf_counter() - start, 3),
+        "network_calls": after["network"] - before["network"],
+        "cache_hits": after["cache_hits"] - before["cache_hits"],
+        "results": len(results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=600.0, help="simulated Serper latency per call")
+    parser.add_argument("--live", action="store_true", help="call Serper instead of simulating it")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    if args.live:
+        api_key = os.environ["SERPER_API_KEY"]
+    else:
+        api_key = "simulated"
+        search_tool._session = SimulatedSession(args.latency_ms / 1000)
+    os.environ["SERPER_API_KEY"] = api_key
+
+    def one_by_one():
+        return [item for query in QUERIES for item in search_tool.fetch_results(query, api_key)]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        search_index._index = search_index.SearchIndex(os.path.join(cache_dir, "index.sqlite3"))
+        search_tool.SEARCH_CACHE_DIR = os.path.join(cache_dir, "sequential")
+        rows.append(_run("sequential cold", one_by_one))
+        search_tool.SEARCH_CACHE_DIR = os.path.join(cache_dir, "batch")
+        rows.append(_run("batch cold", lambda: search_tool.search_many(QUERIES)))
+        rows.append(_run("batch repeat", lambda: search_tool.search_many(QUERIES)))
+        rows.append(_run("index lookup", lambda: [
+            item for query in QUERIES for item in search_index.get_index().search(query)
+        ]))
+        search_index._index.close()
+        search_index._index = None
+
+    report = {"queries": len(QUERIES), "live": args.live, "rows": rows}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    source = "Serper" if args.live else f"simulated {args.latency_ms:.0f} ms/call"
+    print(f"{len(QUERIES)} queries ({source}, {search_tool.SEARCH_WORKERS} workers)")
+    print(f"{'mode':<18}{'seconds':>9}{'network':>9}{'cached':>8}{'results':>9}")
+    for r in rows:
+        print(f"{r['mode']:<18}{r['seconds']:>9}{r['network_calls']:>9}{r['cache_hits']:>8}{r['results']:>9}")
+
+
+if __name__ == "__main__":
+    main()
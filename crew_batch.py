@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Multi-profile crew driver
+Runs one independent crew per profile or scenario variant across a process pool;
+all crews share one Groq rate limiter and the on-disk LLM cache, and every run is
+recorded in one aggregated manifest
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from multiprocessing.managers import BaseManager
+
+# crewai and the agent modules are imported in the worker processes, where they are used
+
+MANIFEST = 'manifest.jsonl'
+
+# Set in each worker process by _init_worker
+_worker = {}
+
+
+class LimitsManager(BaseManager):
+    """Server process holding the LLMLimits that every worker's LLM waits on."""
+
+
+def _shared_limits(rpm, tpm):
+    from tools.llm import LLMLimits
+
+    return LLMLimits(rpm, tpm)
+
+
+LimitsManager.register('LLMLimits', _shared_limits)
+
+
+def load_jobs(path):
+    """Job records from a JSONL or CSV file, each with a filesystem-safe id"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            records = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    jobs = []
+    for number, record in enumerate(records, 1):
+        job_id = re.sub(r'[^\w-]+', '_', str(record.get('id') or number)).strip('_')
+        jobs.append({'id': job_id, 'inputs': {k: v for k, v in record.items() if k != 'id'}})
+    return jobs
+
+
+def profile_block(inputs):
+    """Run-specific context appended to every task description"""
+    lines = [f"- {key}: {value}" for key, value in inputs.items() if value not in (None, '')]
+    if not lines:
+        return ''
+    return "\n\nTailor the work to this profile / scenario:\n" + "\n".join(lines)
+
+
+def _init_worker(limits, use_llm_cache, run_dir):
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _worker.update(limits=limits, use_llm_cache=use_llm_cache, run_dir=run_dir)
+
+
+def run_crew(job, fresh=False):
+    """Run the task graph for one job in this worker; returns its manifest record"""
+    from main import create_agents, create_tasks, load_tasks_config, setup_llm
+    from pipeline import CheckpointStore, TaskGraph
+    from tools.output_store import OutputStore, set_store
+    from tools.telemetry import end_run, start_run
+
+    job_dir = os.path.join(_worker['run_dir'], job['id'])
+    store = OutputStore(job_dir)
+    # Tools that export files (export_data) write into this job's directory
+    set_store(store)
+
+    record = {'id': job['id'], 'inputs': job['inputs'], 'dir': job_dir, 'pid': os.getpid()}
+    # Each crew is its own telemetry run, named <run>/<job id>
+    start_run(f"{os.path.basename(_worker['run_dir'])}/{job['id']}", job=job['id'], process='parallel')
+    started = time.perf_counter()
+    llm = setup_llm(cache=_worker['use_llm_cache'], limits=_worker['limits'])
+    # The cache object lives for the whole worker process; record this job's share of its counts
+    cache_before = llm.cache.stats() if _worker['use_llm_cache'] else None
+    graph = None
+    with open(os.path.join(job_dir, 'crew.log'), 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log):
+        try:
+            tasks_config = {
+                name: {**config, 'description': config['description'] + profile_block(job['inputs'])}
+                for name, config in load_tasks_config().items()
+            }
+            tasks = create_tasks(create_agents(llm), tasks_config)
+            graph = TaskGraph(tasks, checkpoints=None if fresh else CheckpointStore())
+            outputs = graph.run()
+            for name, output in outputs.items():
+                store.put(name, output.raw, 'md')
+            record['status'] = 'ok'
+        except Exception as e:
+            record.update(status='error', error=f"{type(e).__name__}: {e}")
+        if graph is not None:
+            print("\n" + graph.report())
+
+    record['seconds'] = round(time.perf_counter() - started, 1)
+    record['tasks'] = {
+        t.name: {'seconds': round(t.seconds, 1), 'checkpoint': t.checkpointed, 'error': t.error}
+        for t in graph.timings.values()
+    } if graph is not None else {}
+    record['llm'] = {agent: asdict(stats) for agent, stats in llm.stats.agents.items()}
+    record['outputs'] = store.latest()
+    if cache_before is not None:
+        cache_after = llm.cache.stats()
+        record['llm_cache'] = {k: cache_after[k] - cache_before[k] for k in ('hits', 'misses')}
+    end_run(record['status'])
+    return record
+
+
+def completed_ids(manifest_path):
+    """Ids whose latest manifest record succeeded"""
+    latest = {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    latest[record['id']] = record['status']
+    except FileNotFoundError:
+        pass
+    return {job_id for job_id, status in latest.items() if status == 'ok'}
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Run one crew per profile across a process pool")
+    parser.add_argument('jobs', help="JSONL or CSV file, one profile or scenario variant per record")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="crews run at once (default: CPU count)")
+    parser.add_argument('--run', help="run name; outputs go to $OUTPUT_DIR/crews/<run> (default: jobs file name)")
+    parser.add_argument('--rpm', type=float, help="Groq requests per minute shared by all crews (default: $GROQ_RPM)")
+    parser.add_argument('--tpm', type=float, help="Groq tokens per minute shared by all crews (default: $GROQ_TPM)")
+    parser.add_argument('--llm-cache', action='store_true', help="share the on-disk LLM cache across crews")
+    parser.add_argument('--fresh', action='store_true', help="rerun completed jobs and ignore task checkpoints")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run every job, appending each finished crew's record to the run manifest."""
+    args = parse_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    if not os.getenv('GROQ_API_KEY'):
+        print("❌ Error: GROQ_API_KEY not found in .env file")
+        return
+
+    from tools.rate_limit import GROQ_RPM, GROQ_TPM
+
+    run = args.run or os.path.splitext(os.path.basename(args.jobs))[0]
+    run_dir = os.path.join(os.getenv('OUTPUT_DIR', 'outputs'), 'crews', run)
+    os.makedirs(run_dir, exist_ok=True)
+    manifest_path = os.path.join(run_dir, MANIFEST)
+    use_llm_cache = args.llm_cache or os.getenv('LLM_CACHE', '0').lower() in ('1', 'true', 'yes')
+
+    jobs = load_jobs(args.jobs)
+    done = set() if args.fresh else completed_ids(manifest_path)
+    pending = [job for job in jobs if job['id'] not in done]
+    print(f"🚀 {len(jobs)} crews in run '{run}': {len(pending)} to run, {len(jobs) - len(pending)} already done")
+    print(f"⚙️  {args.workers} processes sharing {args.rpm or GROQ_RPM:g} requests / "
+          f"{args.tpm or GROQ_TPM:g} tokens per minute\n")
+
+    started = time.perf_counter()
+    failed = 0
+    with LimitsManager() as manager:
+        limits = manager.LLMLimits(args.rpm or GROQ_RPM, args.tpm or GROQ_TPM)
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(limits, use_llm_cache, run_dir)
+        ) as pool, open(manifest_path, 'a', encoding='utf-8') as manifest:
+            futures = {pool.submit(run_crew, job, args.fresh): job for job in pending}
+            for count, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {'id': job['id'], 'inputs': job['inputs'], 'status': 'error',
+                              'error': f"{type(e).__name__}: {e}"}
+                record['run'] = run
+                record['finished_at'] = time.time()
+                manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+                manifest.flush()
+                if record['status'] == 'ok':
+                    print(f"   ✅ [{count}/{len(pending)}] {job['id']} in {record['seconds']}s")
+                else:
+                    failed += 1
+                    print(f"   ❌ [{count}/{len(pending)}] {job['id']}: {record['error']}")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ {len(pending) - failed} crews finished, {failed} failed in {elapsed:.1f}s")
+    print(f"📁 Manifest: {manifest_path}")
+    if failed:
+        print("   Run the same command again to retry only the failed crews.")
+    print("📈 Slowest tasks and tools: python -m tools.telemetry")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,51 @@ Demo/Test version without requiring API keys
 Simulates the workflow with mock data
 """
 
-import os
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Create outputs directory
-os.makedirs('outputs', exist_ok=True)
+from tools.finance import (
+    accumulation_table,
+    fire_target,
+    milestone_years,
+    savings_schedule,
+    scenario_metrics
+)
+from tools.output_store import get_store
+
+# Education/career scenarios compared by the ROI analysis
+DEMO_SCENARIOS = [
+    {'name': 'Direct Work (No Master)', 'education_years': 0, 'education_cost': 0,
+     'starting_salary': 30000, 'annual_raise': 0.10},
+    {'name': 'Master\'s Degree (2 years)', 'education_years': 2, 'education_cost': 20000,
+     'starting_salary': 45000, 'annual_raise': 0.12},
+    {'name': 'PhD Degree (5 years)', 'education_years': 5, 'education_cost': 0,
+     'starting_salary': 60000, 'annual_raise': 0.15},
+]
+ROI_YEARS = 15
+DISCOUNT_RATE = 0.05
+
+# Inputs of the demo FIRE plan
+DEMO_PLAN = {
+    'age': 25,
+    'retire_age': 40,
+    'salary': 40000,
+    'salary_growth': 0.10,
+    'annual_return': 0.08,
+    'annual_expenses': 24000,
+    'withdrawal_rate': 0.04,
+}
+ALLOCATION = [
+    ('US Stock Market ETFs', 0.60, 'VTI, VOO, QQQ'),
+    ('International ETFs', 0.20, 'VXUS, VEA'),
+    ('Bonds', 0.10, 'BND, AGG'),
+    ('Alternative/Crypto', 0.10, 'Bitcoin, Ethereum'),
+]
+MILESTONES = [(50000, 'İlk büyük baraj'), (100000, 'Momentum kazanma'), (250000, 'Yarı yol'),
+              (400000, 'Home stretch')]
+BEAR_MARKET_DROP = 0.30
 
 def generate_career_paths():
     """Generate mock career path data"""
@@ -62,50 +101,91 @@ def generate_career_paths():
     }
     
     df = pd.DataFrame(data)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/career_paths_{timestamp}.csv'
-    df.to_csv(filename, index=False)
-    print(f"\n✅ Career paths data generated: {filename}")
+    filename = get_store().put('career_paths', df.to_csv(index=False), 'csv')
+    print(f"✅ Career paths data generated: {filename}")
     return filename
 
 def generate_roi_analysis():
     """Generate ROI analysis"""
+    metrics = scenario_metrics(
+        [sc['education_years'] for sc in DEMO_SCENARIOS],
+        [sc['education_cost'] for sc in DEMO_SCENARIOS],
+        [sc['starting_salary'] for sc in DEMO_SCENARIOS],
+        [sc['annual_raise'] for sc in DEMO_SCENARIOS],
+        years=ROI_YEARS,
+        discount_rate=DISCOUNT_RATE
+    )
     scenarios = {
-        'Scenario': [
-            'Direct Work (No Master)',
-            'Master\'s Degree (2 years)',
-            'PhD Degree (5 years)'
-        ],
-        'Education_Years': [0, 2, 5],
-        'Education_Cost_USD': [0, 20000, 0],
-        'Starting_Salary_USD': [30000, 45000, 60000],
-        'Annual_Raise': ['10%', '12%', '15%'],
-        'Working_Years': [15, 13, 10],
-        'Total_Earnings_15yr_USD': [726984, 813916, 809747],
-        'NPV_USD': [589243, 612407, 556194],
-        'Final_Year_Salary_USD': [114523, 158094, 243588]
+        'Scenario': [sc['name'] for sc in DEMO_SCENARIOS],
+        'Education_Years': [sc['education_years'] for sc in DEMO_SCENARIOS],
+        'Education_Cost_USD': [sc['education_cost'] for sc in DEMO_SCENARIOS],
+        'Starting_Salary_USD': [sc['starting_salary'] for sc in DEMO_SCENARIOS],
+        'Annual_Raise': [f"{sc['annual_raise']:.0%}" for sc in DEMO_SCENARIOS],
+        'Working_Years': metrics['working_years'],
+        f'Total_Earnings_{ROI_YEARS}yr_USD': metrics['total_earnings'].round().astype(int),
+        'NPV_USD': metrics['npv'].round().astype(int),
+        'Final_Year_Salary_USD': metrics['final_salary'].round().astype(int)
     }
     
     df = pd.DataFrame(scenarios)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/education_vs_work_{timestamp}.xlsx'
-    df.to_excel(filename, index=False, engine='openpyxl')
+    store = get_store()
+    tmp_path = store.temp_path('xlsx')
+    df.to_excel(tmp_path, index=False, engine='openpyxl')
+    filename = store.put_file('education_vs_work', tmp_path, 'xlsx')
     print(f"✅ ROI analysis generated: {filename}")
     return filename
 
 def generate_fire_plan():
     """Generate FIRE plan"""
+    plan = DEMO_PLAN
+    years = plan['retire_age'] - plan['age']
+    target = fire_target(plan['annual_expenses'], plan['withdrawal_rate'])
+    table = accumulation_table(
+        plan['age'], plan['salary'], plan['salary_growth'], savings_schedule(years), plan['annual_return']
+    )
+    target_year = milestone_years(table['portfolio'], [target])[0]
+
+    rows = []
+    for i in range(years):
+        year = int(table['year'][i])
+        if target_year and year > target_year:
+            status = "🏁 FI"
+        elif year == target_year:
+            status = "🎯 Target Reached!"
+        else:
+            status = "✅ On Track"
+        rows.append(
+            f"| {year} | {int(table['age'][i])} | ${table['salary'][i]:,.0f} | {table['savings_rate'][i]:.0%} "
+            f"| ${table['annual_savings'][i]:,.0f} | ${table['portfolio'][i]:,.0f} | {status} |"
+        )
+    projection = "\n".join(rows)
+
+    allocation = "\n".join(
+        f"- **{name}** ({weight:.0%}): ${target * weight / 1000:,.0f}K\n  - {funds}"
+        for name, weight, funds in ALLOCATION
+    )
+    equities = target * sum(weight for name, weight, _ in ALLOCATION if 'ETF' in name)
+
+    milestones = [(amount, label) for amount, label in MILESTONES if amount < target]
+    milestones.append((target, 'Financial Independence! 🎉'))
+    reached = milestone_years(table['portfolio'], [amount for amount, _ in milestones])
+    milestone_lines = "\n".join(
+        f"- 🎯 **${amount / 1000:,.0f}K** ({f'Year {year}' if year else f'after year {years}'}): {label}"
+        for (amount, label), year in zip(milestones, reached)
+    )
+
     report = f"""# 🔥 FIRE Plan - Erken Emeklilik Stratejisi
 
 **Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 ## 📊 Executive Summary
 
-- **Current Age**: 25
-- **Target Retirement Age**: 40
-- **Time Horizon**: 15 years
-- **Target Portfolio**: $600,000
-- **Annual Passive Income** (4% rule): $24,000/year
+- **Current Age**: {plan['age']}
+- **Target Retirement Age**: {plan['retire_age']}
+- **Time Horizon**: {years} years
+- **Target Portfolio**: ${target:,.0f}
+- **Annual Passive Income** ({plan['withdrawal_rate']:.0%} rule): ${plan['annual_expenses']:,.0f}/year
+- **Projected Portfolio at {plan['retire_age']}**: ${table['portfolio'][-1]:,.0f}
 
 ---
 
@@ -115,15 +195,7 @@ def generate_fire_plan():
 
 | Year | Age | Salary | Savings Rate | Annual Savings | Total Portfolio | Status |
 |------|-----|--------|--------------|----------------|-----------------|--------|
-| 1    | 25  | $40,000 | 30% | $12,000 | $12,800 | ✅ On Track |
-| 2    | 26  | $44,000 | 35% | $15,400 | $29,168 | ✅ On Track |
-| 3    | 27  | $48,400 | 35% | $16,940 | $49,279 | ✅ On Track |
-| 4    | 28  | $53,240 | 40% | $21,296 | $74,625 | ✅ On Track |
-| 5    | 29  | $58,564 | 40% | $23,426 | $105,524 | ✅ On Track |
-| 8    | 32  | $77,136 | 45% | $34,711 | $231,849 | ✅ On Track |
-| 10   | 35  | $92,973 | 45% | $41,838 | $351,487 | ✅ On Track |
-| 12   | 37  | $112,106 | 50% | $56,053 | $507,293 | ✅ On Track |
-| 15   | 40  | $149,474 | 50% | $74,737 | $625,194 | 🎯 Target Reached! |
+{projection}
 
 ---
 
@@ -131,17 +203,10 @@ def generate_fire_plan():
 
 ### Asset Allocation
 
-- **US Stock Market ETFs** (60%): $360K
-  - VTI, VOO, QQQ
-- **International ETFs** (20%): $120K
-  - VXUS, VEA
-- **Bonds** (10%): $60K
-  - BND, AGG
-- **Alternative/Crypto** (10%): $60K
-  - Bitcoin, Ethereum
+{allocation}
 
 ### Expected Returns
-- Average annual return: 8%
+- Average annual return: {plan['annual_return']:.0%}
 - Conservative estimate: 7%
 - Aggressive estimate: 10%
 
@@ -150,12 +215,12 @@ def generate_fire_plan():
 ## 📉 Risk Management
 
 ### Bear Market Scenario
-- Portfolio drop: -30% ($420K → $294K)
+- Portfolio drop: -{BEAR_MARKET_DROP:.0%} on equities (${equities / 1000:,.0f}K → ${equities * (1 - BEAR_MARKET_DROP) / 1000:,.0f}K)
 - Recovery time: 2-3 years
-- **Mitigation**: Keep 2 years expenses in cash ($48K)
+- **Mitigation**: Keep 2 years expenses in cash (${2 * plan['annual_expenses'] / 1000:,.0f}K)
 
 ### Recession Protection
-- Emergency fund: 6 months expenses ($12K)
+- Emergency fund: 6 months expenses (${plan['annual_expenses'] / 2000:,.0f}K)
 - Diversified income streams
 - Side hustles as buffer
 
@@ -179,11 +244,7 @@ def generate_fire_plan():
 
 ## 📅 Milestone Tracker
 
-- ✅ **$50K** (Year 3): İlk büyük baraj
-- ✅ **$100K** (Year 5): Momentum kazanma
-- 🎯 **$250K** (Year 8): Yarı yol
-- 🎯 **$400K** (Year 11): Home stretch
-- 🎯 **$600K** (Year 15): Financial Independence! 🎉
+{milestone_lines}
 
 ---
 
@@ -212,10 +273,7 @@ def generate_fire_plan():
 **Remember**: FIRE is a marathon, not a sprint. Stay consistent, track progress, and adjust as needed! 💪
 """
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/retirement_plan_{timestamp}.md'
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(report)
+    filename = get_store().put('retirement_plan', report, 'md')
     print(f"✅ FIRE plan generated: {filename}")
     return filename
 
@@ -365,10 +423,7 @@ def generate_microbusiness_report():
 **Remember**: %90'ı başarısız olur, ama denemezsen %100 başarısız olursun! 💪
 """
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/microbusiness_report_{timestamp}.md'
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(report)
+    filename = get_store().put('microbusiness_report', report, 'md')
     print(f"✅ Microbusiness report generated: {filename}")
     return filename
 
@@ -378,20 +433,19 @@ def main():
     print("="*60)
     print("\nGenerating mock data for demonstration...\n")
     
-    # Generate all outputs
-    career_file = generate_career_paths()
-    roi_file = generate_roi_analysis()
-    fire_file = generate_fire_plan()
-    micro_file = generate_microbusiness_report()
+    # Generate all outputs; the reports are independent, so build them in parallel
+    start = time.perf_counter()
+    generators = [generate_career_paths, generate_roi_analysis, generate_fire_plan, generate_microbusiness_report]
+    with ThreadPoolExecutor(max_workers=len(generators)) as pool:
+        files = [future.result() for future in [pool.submit(generate) for generate in generators]]
+    elapsed = time.perf_counter() - start
     
     print("\n" + "="*60)
-    print("✅ Demo completed successfully!")
+    print(f"✅ Demo completed successfully in {elapsed:.2f}s!")
     print("="*60)
     print("\n📁 Generated files:")
-    print(f"   - {career_file}")
-    print(f"   - {roi_file}")
-    print(f"   - {fire_file}")
-    print(f"   - {micro_file}")
+    for filename in files:
+        print(f"   - {filename}")
     print("\n💡 This is demo data. For real analysis, add API keys to .env")
     print("   and run: python main.py\n")
 
@@ -8,8 +8,12 @@ import os
 from dotenv import load_dotenv
 from groq import Groq
 from datetime import datetime
+import threading
 
+# Settings in .env must be loaded before the tools modules read them
 load_dotenv()
+from tools.streaming import BufferedStream, stream_chat
+
 client = Groq(api_key=os.getenv('GROQ_API_KEY'))
 
 def print_section(title, emoji="🎯"):
@@ -18,18 +22,27 @@ def print_section(title, emoji="🎯"):
     print(f"{emoji} {title}")
     print("="*70 + "\n")
 
-def call_ai(prompt: str, system: str) -> str:
-    """Call Groq API"""
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=4096
-    )
-    return response.choices[0].message.content
+def stream_ai(prompt: str, system: str):
+    """Stream a Groq completion chunk by chunk"""
+    return stream_chat(client, prompt, system)
+
+def start_analyses(profile):
+    """
+    Start streaming all four analyses in the background, in display order. The
+    worker threads are daemons, so leaving the session never waits on them.
+    """
+    streams = [BufferedStream(stream_ai(*build_prompt(profile))) for build_prompt in ANALYSES]
+    for stream in streams:
+        threading.Thread(target=stream.consume, daemon=True).start()
+    return streams
+
+def show_result(pending, waiting_message):
+    """Print an analysis as it streams: what has arrived so far, then the rest live"""
+    if not pending.done():
+        print(waiting_message)
+    for chunk in pending.follow():
+        print(chunk, end='', flush=True)
+    print()
 
 def get_user_input():
     """Get user profile interactively - DETAILED VERSION for undecided people"""
@@ -147,11 +160,8 @@ def get_user_input():
 
     return profile
 
-def show_career_analysis(profile):
-    """Show career path analysis - PERSONALIZED"""
-    print_section("KARİYER YOLU ANALİZİ", "🔍")
-    print("⏳ Detaylı profiline göre kariyer yolu oluşturuluyor...\n")
-
+def career_analysis_prompt(profile):
+    """User and system prompt for the career path analysis"""
     system = "Sen deneyimli bir kariyer koçusun. Kararsız insanlara NET ve UYGULANABILIR yol haritaları çıkarıyorsun."
 
     prompt = f"""ÇOK DETAYLI KİŞİSEL KARİYER ANALİZİ:
@@ -223,15 +233,16 @@ BU KİŞİ İÇİN DETAYLI KARİYER PLANI ÇıKAR:
 
 KISA, NET, UYGULANABILIR yaz. Max 40 satır."""
 
-    result = call_ai(prompt, system)
-    print(result)
-    print("\n" + "─" * 70)
+    return prompt, system
 
-def show_roi_analysis(profile):
-    """Show education ROI - PERSONALIZED"""
-    print_section("EĞİTİM ROI ANALİZİ", "💰")
-    print("⏳ Senin durumuna özel finansal analiz yapılıyor...\n")
+def show_career_analysis(pending):
+    """Show career path analysis - PERSONALIZED"""
+    print_section("KARİYER YOLU ANALİZİ", "🔍")
+    show_result(pending, "⏳ Detaylı profiline göre kariyer yolu oluşturuluyor...\n")
+    print("\n" + "─" * 70)
 
+def roi_analysis_prompt(profile):
+    """User and system prompt for the education ROI"""
     system = "Sen finansal analiz ve eğitim danışmanlığı uzmanısın. Kararsız insanlara NET KARAR vermelerine yardım ediyorsun."
 
     years_left = int(profile['retire_age']) - int(profile['age'])
@@ -306,15 +317,16 @@ HER SENARYO İÇİN HESAPLA:
 
 TABLO + DETAYLI AÇIKLAMA. Max 50 satır."""
 
-    result = call_ai(prompt, system)
-    print(result)
-    print("\n" + "─" * 70)
+    return prompt, system
 
-def show_fire_plan(profile):
-    """Show FIRE plan - ULTRA PERSONALIZED"""
-    print_section("FIRE PLANI", "🔥")
-    print("⏳ Senin durumuna özel emeklilik stratejisi hazırlanıyor...\n")
+def show_roi_analysis(pending):
+    """Show education ROI - PERSONALIZED"""
+    print_section("EĞİTİM ROI ANALİZİ", "💰")
+    show_result(pending, "⏳ Senin durumuna özel finansal analiz yapılıyor...\n")
+    print("\n" + "─" * 70)
 
+def fire_plan_prompt(profile):
+    """User and system prompt for the FIRE plan"""
     system = "Sen FIRE hareketi uzmanısın. Kararsız insanlara GERÇEKÇI ve UYGULANABILIR emeklilik planları yapıyorsun."
 
     current_age = int(profile['age'])
@@ -415,15 +427,16 @@ DETAYLI FIRE PLANI ÇıKAR:
 
 Max 60 satır. TABLO + DETAYLI AÇIKLAMA."""
 
-    result = call_ai(prompt, system)
-    print(result)
-    print("\n" + "─" * 70)
+    return prompt, system
 
-def show_side_hustles(profile):
-    """Show side hustle ideas - PERSONALIZED"""
-    print_section("YAN GELİR ÖNERİLERİ", "🚀")
-    print("⏳ Senin beceri ve hedeflerine özel fırsatlar bulunuyor...\n")
+def show_fire_plan(pending):
+    """Show FIRE plan - ULTRA PERSONALIZED"""
+    print_section("FIRE PLANI", "🔥")
+    show_result(pending, "⏳ Senin durumuna özel emeklilik stratejisi hazırlanıyor...\n")
+    print("\n" + "─" * 70)
 
+def side_hustles_prompt(profile):
+    """User and system prompt for the side hustle ideas"""
     system = "Sen girişimcilik ve yan gelir danışmanısın. Kararsız insanlara SOMUT, UYGULANABILIR ve GERÇEKÇİ yan iş fikirleri veriyorsun."
 
     prompt = f"""KİŞİYE ÖZEL YAN GELİR ANALİZİ:
@@ -533,10 +546,17 @@ SON OLARAK:
 
 Max 80 satır. DETAYLI, SOMUT, UYGULANABILIR."""
 
-    result = call_ai(prompt, system)
-    print(result)
+    return prompt, system
+
+def show_side_hustles(pending):
+    """Show side hustle ideas - PERSONALIZED"""
+    print_section("YAN GELİR ÖNERİLERİ", "🚀")
+    show_result(pending, "⏳ Senin beceri ve hedeflerine özel fırsatlar bulunuyor...\n")
     print("\n" + "─" * 70)
 
+# Prompt builders in display order; start_analyses() prefetches them all
+ANALYSES = [career_analysis_prompt, roi_analysis_prompt, fire_plan_prompt, side_hustles_prompt]
+
 def main():
     # Header
     print("\n" + "╔" + "═"*68 + "╗")
@@ -610,19 +630,26 @@ def main():
     print("   3️⃣ FIRE Emeklilik Planı")
     print("   4️⃣ Yan Gelir Stratejileri")
 
-    input("\n⏎  Hazırsan ENTER'a bas ve analizleri gör...")
-    
-    # Run analyses
-    show_career_analysis(profile)
-    input("\n⏎  Sonraki analize geçmek için ENTER...")
-    
-    show_roi_analysis(profile)
-    input("\n⏎  Sonraki analize geçmek için ENTER...")
-    
-    show_fire_plan(profile)
-    input("\n⏎  Sonraki analize geçmek için ENTER...")
-    
-    show_side_hustles(profile)
+    # Start generating now; later sections are usually ready by the time they are shown
+    streams = career, roi, fire, side_hustles = start_analyses(profile)
+    try:
+        input("\n⏎  Hazırsan ENTER'a bas ve analizleri gör...")
+
+        # Run analyses
+        show_career_analysis(career)
+        input("\n⏎  Sonraki analize geçmek için ENTER...")
+
+        show_roi_analysis(roi)
+        input("\n⏎  Sonraki analize geçmek için ENTER...")
+
+        show_fire_plan(fire)
+        input("\n⏎  Sonraki analize geçmek için ENTER...")
+
+        show_side_hustles(side_hustles)
+    finally:
+        # Stop streams still running (e.g. after Ctrl+C) and close their connections
+        for stream in streams:
+            stream.cancel()
     
     # Footer
     print_section("TAMAMLANDI!", "🎉")
@@ -4,40 +4,65 @@ Early Retirement Agentic Workflow System
 Main orchestration file for CrewAI agents
 """
 
+import argparse
 import os
-import yaml
-from dotenv import load_dotenv
-from crewai import Crew, Task, Process
-from langchain_groq import ChatGroq
+import time
 
-# Import agent creators
-from agents import (
-    create_career_mapper,
-    create_roi_analyzer,
-    create_fire_planner,
-    create_market_watcher
-)
+from agents.config import TASKS_CONFIG, load_config
+from pipeline import CheckpointStore, TaskGraph
+from tools.telemetry import emit, end_run, payload_size, start_run, telemetry_path
+
+# crewai and the agent modules are imported where they are used,
+# so `main.py --help` doesn't pay for them
 
 
 def load_tasks_config():
     """Load tasks from YAML configuration."""
-    with open('config/tasks.yaml', 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return load_config(TASKS_CONFIG)
+
 
+def setup_llm(cache=False, limits=None):
+    """
+    Initialize the LLM: a CrewAI LLM that shares Groq's request and token limits
+    across agents, optionally answering repeated calls from the persistent LLM cache.
+    Pass limits to share them with other crews (see crew_batch.py).
+    """
+    from tools.llm import CachedRateLimitedLLM, RateLimitedLLM
 
-def setup_llm():
-    """Initialize the LLM."""
-    return ChatGroq(
-        model=os.getenv('LLM_MODEL', 'llama-3.3-70b-versatile'),
+    model = os.getenv('LLM_MODEL', 'llama-3.3-70b-versatile')
+    llm_class = CachedRateLimitedLLM if cache else RateLimitedLLM
+    return llm_class(
+        model=model if '/' in model else f"groq/{model}",
         temperature=float(os.getenv('LLM_TEMPERATURE', 0.7)),
         max_tokens=int(os.getenv('LLM_MAX_TOKENS', 4096)),
-        groq_api_key=os.getenv('GROQ_API_KEY')
+        api_key=os.getenv('GROQ_API_KEY'),
+        limits=limits
+    )
+
+
+def create_agents(llm):
+    """Create the four agents, each with its own view of the shared LLM."""
+    from agents import (
+        create_career_mapper,
+        create_roi_analyzer,
+        create_fire_planner,
+        create_market_watcher
     )
 
+    # One view of the LLM per agent: shared rate limits, per-agent call stats
+    return {
+        'career_mapper': create_career_mapper(llm.for_agent('career_mapper')),
+        'roi_analyzer': create_roi_analyzer(llm.for_agent('roi_analyzer')),
+        'fire_planner': create_fire_planner(llm.for_agent('fire_planner')),
+        'market_watcher': create_market_watcher(llm.for_agent('market_watcher'))
+    }
+
 
 def create_tasks(agents_dict, tasks_config):
-    """Create Task objects from configuration."""
-    tasks = []
+    """Create Task objects from configuration, keyed by task name in run order."""
+    from crewai import Task
+
+    tasks = {}
     
     # Task 1: Research Career Paths
     career_task = Task(
@@ -45,7 +70,7 @@ def create_tasks(agents_dict, tasks_config):
         expected_output=tasks_config['research_career_paths']['expected_output'],
         agent=agents_dict['career_mapper']
     )
-    tasks.append(career_task)
+    tasks['research_career_paths'] = career_task
     
     # Task 2: Analyze Education ROI
     roi_task = Task(
@@ -54,7 +79,7 @@ def create_tasks(agents_dict, tasks_config):
         agent=agents_dict['roi_analyzer'],
         context=[career_task]  # Depends on career research
     )
-    tasks.append(roi_task)
+    tasks['analyze_education_roi'] = roi_task
     
     # Task 3: Create FIRE Plan
     fire_task = Task(
@@ -63,7 +88,7 @@ def create_tasks(agents_dict, tasks_config):
         agent=agents_dict['fire_planner'],
         context=[career_task, roi_task]  # Depends on both previous tasks
     )
-    tasks.append(fire_task)
+    tasks['create_fire_plan'] = fire_task
     
     # Task 4: Discover Income Streams
     market_task = Task(
@@ -71,19 +96,66 @@ def create_tasks(agents_dict, tasks_config):
         expected_output=tasks_config['discover_income_streams']['expected_output'],
         agent=agents_dict['market_watcher']
     )
-    tasks.append(market_task)
+    tasks['discover_income_streams'] = market_task
     
     return tasks
 
 
+def task_recorder():
+    """
+    Task callback for the sequential crew, which runs tasks back to back: each
+    task is timed from the end of the one before it.
+    """
+    last = {'end': time.time()}
+
+    def record(output):
+        end = time.time()
+        emit('task', name=output.name or output.description[:60], agent=output.agent,
+             start=last['end'], end=end, seconds=end - last['end'], status='ok',
+             output_bytes=payload_size(output.raw))
+        last['end'] = end
+
+    return record
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Early Retirement Agentic Workflow System")
+    parser.add_argument(
+        '--process',
+        choices=['parallel', 'sequential'],
+        help="parallel runs each task once its context tasks finish; "
+             "sequential uses a plain sequential Crew (default: $CREW_PROCESS or parallel)"
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help="ignore task checkpoints and run every task again (parallel process only)"
+    )
+    parser.add_argument(
+        '--llm-cache',
+        action='store_true',
+        help="answer repeated LLM calls from the on-disk cache (default: on if $LLM_CACHE is 1)"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main execution function."""
-    print("🚀 Early Retirement Agentic Workflow System")
-    print("=" * 60)
-    
+    args = parse_args()
+
+    from dotenv import load_dotenv
+
     # Load environment variables
     load_dotenv()
+    process = args.process or os.getenv('CREW_PROCESS', 'parallel')
+    use_llm_cache = args.llm_cache or os.getenv('LLM_CACHE', '0').lower() in ('1', 'true', 'yes')
+
+    print("🚀 Early Retirement Agentic Workflow System")
+    print("=" * 60)
     
+    from crewai import Crew, Process
+
     # Validate API keys
     if not os.getenv('GROQ_API_KEY'):
         print("❌ Error: GROQ_API_KEY not found in .env file")
@@ -93,18 +165,15 @@ def main():
     if not os.getenv('SERPER_API_KEY'):
         print("⚠️  Warning: SERPER_API_KEY not found. Web search may not work.")
     
+    run_id = start_run(process=process, llm_cache=use_llm_cache)
+
     # Initialize LLM
     print("\n🧠 Initializing LLM...")
-    llm = setup_llm()
+    llm = setup_llm(cache=use_llm_cache)
     
     # Create agents
     print("🤖 Creating agents...")
-    agents_dict = {
-        'career_mapper': create_career_mapper(llm),
-        'roi_analyzer': create_roi_analyzer(llm),
-        'fire_planner': create_fire_planner(llm),
-        'market_watcher': create_market_watcher(llm)
-    }
+    agents_dict = create_agents(llm)
     
     # Load tasks configuration
     print("📋 Loading tasks configuration...")
@@ -118,18 +187,26 @@ def main():
     print("👥 Assembling crew...")
     crew = Crew(
         agents=list(agents_dict.values()),
-        tasks=tasks,
+        tasks=list(tasks.values()),
         process=Process.sequential,
-        verbose=True
+        verbose=True,
+        task_callback=task_recorder()
     )
+    # Completed tasks are checkpointed; a re-run resumes from the first failed or changed one
+    graph = TaskGraph(tasks, checkpoints=None if args.fresh else CheckpointStore())
     
     # Execute workflow
     print("\n" + "=" * 60)
     print("🎯 Starting workflow execution...")
     print("=" * 60 + "\n")
     
+    status = 'ok'
     try:
-        result = crew.kickoff()
+        if process == 'sequential':
+            result = crew.kickoff()
+        else:
+            outputs = graph.run()
+            result = "\n\n".join(f"## {name}\n\n{output.raw}" for name, output in outputs.items())
         
         print("\n" + "=" * 60)
         print("✅ Workflow completed successfully!")
@@ -138,16 +215,32 @@ def main():
         print(result)
         
         print("\n📁 Output files have been generated in the 'outputs/' directory:")
-        print("   - career_paths_*.csv")
-        print("   - education_vs_work_*.xlsx")
-        print("   - retirement_plan_*.md")
-        print("   - microbusiness_report_*.md")
+        print("   - career_paths.csv")
+        print("   - education_vs_work.xlsx")
+        print("   - retirement_plan.md")
+        print("   - microbusiness_report.md")
+        print("   (earlier versions are listed in outputs/manifest.jsonl)")
         
     except Exception as e:
+        status = 'error'
         print(f"\n❌ Error during workflow execution: {str(e)}")
         import traceback
         traceback.print_exc()
 
+    if process != 'sequential':
+        print("\n⏱️  Task timings:")
+        print(graph.report())
+
+    print("\n🧠 LLM calls per agent:")
+    print(llm.stats.report())
+    if use_llm_cache:
+        print(llm.cache.summary())
+
+    end_run(status)
+    if run_id:
+        print(f"\n📈 Telemetry for run {run_id} appended to {telemetry_path()}")
+        print("   Slowest tasks and tools across runs: python -m tools.telemetry")
+
 
 if __name__ == "__main__":
     main()
@@ -3,27 +3,28 @@
 Personalized FIRE Workflow - Takes user input and creates custom analysis
 """
 
+import argparse
+import csv
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from groq import Groq
 from datetime import datetime
 import json
 
+# Settings in .env must be loaded before the tools modules read them
 load_dotenv()
+from tools.output_store import get_store
+from tools.rate_limit import GROQ_RPM, GROQ_TPM, LLMLimits, call_with_backoff, estimate_tokens
+from tools.streaming import stream_chat, stream_to_store
+
 client = Groq(api_key=os.getenv('GROQ_API_KEY'))
 
-def call_ai(prompt: str, system: str) -> str:
-    """Call Groq API"""
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=4096
-    )
-    return response.choices[0].message.content
+def stream_ai(prompt: str, system: str):
+    """Stream a Groq completion chunk by chunk"""
+    return stream_chat(client, prompt, system)
 
 
 def get_user_profile():
@@ -79,10 +80,8 @@ def get_user_profile():
     return profile
 
 
-def analyze_career_path(profile):
-    """Personalized career path analysis"""
-    print("🔍 1/4 - Kişiselleştirilmiş kariyer yolu analizi...")
-    
+def career_path_prompt(profile):
+    """User and system prompt for the personalized career path analysis"""
     system = "Sen deneyimli bir kariyer danışmanısın. Kişiye özel, gerçekçi ve ulaşılabilir kariyer tavsiyeleri veriyorsun."
     
     prompt = f"""Aşağıdaki profil için KİŞİSELLEŞTİRİLMİŞ kariyer yolu analizi yap:
@@ -109,24 +108,21 @@ BU KİŞİYE ÖZEL:
 
 Markdown formatında, tablolar ve emoji kullan."""
 
-    result = call_ai(prompt, system)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/personal_career_plan_{profile["name"]}_{timestamp}.md'
+    return prompt, system
+
+
+def analyze_career_path(profile):
+    """Personalized career path analysis"""
+    print("🔍 1/4 - Kişiselleştirilmiş kariyer yolu analizi...")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(f"# 🎯 Kişisel Kariyer Planı - {profile['name']}\n\n")
-        f.write(f"**Oluşturulma**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = run_analysis(profile, 'career')
     
     print(f"   ✅ {filename}")
     return result
 
 
-def create_personalized_roi(profile):
-    """Personalized education ROI"""
-    print("💰 2/4 - Senin için eğitim ROI analizi...")
-    
+def roi_prompt(profile):
+    """User and system prompt for the personalized education ROI"""
     system = "Sen finansal analiz uzmanısın. Gerçek verilerle, kişiye özel ROI hesaplamaları yaparsın."
     
     current_age = profile['age']
@@ -157,24 +153,21 @@ Her senaryo için:
 
 Markdown, tablolar, emoji kullan."""
 
-    result = call_ai(prompt, system)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/personal_roi_{profile["name"]}_{timestamp}.md'
+    return prompt, system
+
+
+def create_personalized_roi(profile):
+    """Personalized education ROI"""
+    print("💰 2/4 - Senin için eğitim ROI analizi...")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(f"# 💰 Kişisel ROI Analizi - {profile['name']}\n\n")
-        f.write(f"**Oluşturulma**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = run_analysis(profile, 'roi')
     
     print(f"   ✅ {filename}")
     return result
 
 
-def create_personalized_fire(profile):
-    """Personalized FIRE plan"""
-    print("🔥 3/4 - Senin için FIRE planı...")
-    
+def fire_prompt(profile):
+    """User and system prompt for the personalized FIRE plan"""
     system = "Sen FIRE (Financial Independence Retire Early) uzmanısın. Kişiye özel, gerçekçi erken emeklilik planları oluşturursun."
     
     current_age = profile['age']
@@ -207,24 +200,21 @@ DETAYLI PLAN:
 
 Markdown, detaylı tablolar, emoji kullan."""
 
-    result = call_ai(prompt, system)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/personal_fire_{profile["name"]}_{timestamp}.md'
+    return prompt, system
+
+
+def create_personalized_fire(profile):
+    """Personalized FIRE plan"""
+    print("🔥 3/4 - Senin için FIRE planı...")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(f"# 🔥 Kişisel FIRE Planı - {profile['name']}\n\n")
-        f.write(f"**Oluşturulma**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = run_analysis(profile, 'fire')
     
     print(f"   ✅ {filename}")
     return result
 
 
-def suggest_side_hustles(profile):
-    """Personalized side hustle suggestions"""
-    print("🚀 4/4 - Senin için yan gelir önerileri...")
-    
+def side_hustles_prompt(profile):
+    """User and system prompt for the personalized side hustle suggestions"""
     system = "Sen girişimcilik danışmanısın. Kişinin becerilerine, zamanına ve ilgi alanlarına göre yan gelir önerileri veriyorsun."
     
     prompt = f"""BU KİŞİ İÇİN kişiselleştirilmiş yan gelir önerileri:
@@ -254,21 +244,196 @@ Her fikir için:
 
 Markdown, tablolar, emoji, actionable advice kullan."""
 
-    result = call_ai(prompt, system)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/personal_sidehustle_{profile["name"]}_{timestamp}.md'
+    return prompt, system
+
+
+def suggest_side_hustles(profile):
+    """Personalized side hustle suggestions"""
+    print("🚀 4/4 - Senin için yan gelir önerileri...")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(f"# 🚀 Kişisel Yan Gelir Önerileri - {profile['name']}\n\n")
-        f.write(f"**Oluşturulma**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = run_analysis(profile, 'side_hustles')
     
     print(f"   ✅ {filename}")
     return result
 
 
+# Analyses by key: prompt builder, output name prefix, report title
+ANALYSES = {
+    'career': (career_path_prompt, 'personal_career_plan', '🎯 Kişisel Kariyer Planı'),
+    'roi': (roi_prompt, 'personal_roi', '💰 Kişisel ROI Analizi'),
+    'fire': (fire_prompt, 'personal_fire', '🔥 Kişisel FIRE Planı'),
+    'side_hustles': (side_hustles_prompt, 'personal_sidehustle', '🚀 Kişisel Yan Gelir Önerileri'),
+}
+
+
+def run_analysis(profile, key, name=None, echo=True, limits=None):
+    """
+    Stream one analysis into the output store (as <prefix>_<name> by default); retried
+    on rate limits. With limits (an LLMLimits), every attempt waits for a request slot
+    and the prompt's tokens, and the completion is charged once it has streamed.
+    """
+    build_prompt, prefix, title = ANALYSES[key]
+    name = name or f"{prefix}_{profile['name']}"
+    prompt, system = build_prompt(profile)
+    header = (
+        f"# {title} - {profile['name']}\n\n"
+        f"**Oluşturulma**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    )
+    prompt_tokens = estimate_tokens(system) + estimate_tokens(prompt)
+
+    def attempt():
+        if limits is not None:
+            limits.acquire(prompt_tokens)
+        return stream_to_store(stream_ai(prompt, system), name, 'md', header, echo=echo)
+
+    text, path = call_with_backoff(attempt)
+    if limits is not None:
+        limits.consume(estimate_tokens(text))
+    return text, path
+
+
+# Batch input: missing or empty fields get the interactive defaults
+PROFILE_DEFAULTS = {
+    'name': "Kullanıcı", 'age': 25, 'university': "ODTÜ", 'major': "İstatistik",
+    'graduation_year': 2024, 'current_job': "Henüz çalışmıyor", 'current_salary': "0",
+    'programming': "Python, R", 'ml_experience': "1", 'other_skills': "Statistics, Data Analysis",
+    'education_plan': "hayır", 'dream_job': "Senior Data Scientist", 'target_salary': 100000,
+    'target_retirement_age': 40, 'target_portfolio': 600000, 'risk_tolerance': "orta",
+    'side_interests': "SaaS, Course", 'available_time': "10",
+}
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 4))
+
+
+def normalize_profile(raw):
+    """Profile from a batch record, typed like get_user_profile(); ValueError names a bad field"""
+    if not isinstance(raw, dict):
+        raise ValueError(f"kayıt bir nesne değil: {raw!r}")
+    profile = {}
+    for field, default in PROFILE_DEFAULTS.items():
+        value = raw.get(field)
+        value = default if value is None or str(value).strip() == "" else value
+        if isinstance(default, int):
+            try:
+                profile[field] = int(float(value))
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"{field}: sayı değil: {value!r}") from None
+        else:
+            profile[field] = str(value).strip()
+    for field in ('education_type', 'education_field'):
+        if raw.get(field):
+            profile[field] = str(raw[field]).strip()
+    return profile
+
+
+def _read_records(f, csv_file):
+    """(number, record or ValueError) for each non-empty JSONL line or CSV row"""
+    if csv_file:
+        for number, raw in enumerate(csv.DictReader(f), 1):
+            yield number, raw
+        return
+    number = 0
+    for line in f:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            raw = ValueError(f"geçersiz JSON: {e}")
+        yield number, raw
+
+
+def load_profiles(path):
+    """
+    (id, profile) pairs from a JSONL or CSV file, and (id, error) pairs for records
+    that could not be read or typed; id is the record's id or its line number
+    """
+    profiles, rejected = [], []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for number, raw in _read_records(f, path.endswith('.csv')):
+            record_id = raw.get('id') if isinstance(raw, dict) else None
+            profile_id = re.sub(r'[^\w-]+', '_', str(record_id or number)).strip('_')
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                profiles.append((profile_id, normalize_profile(raw)))
+            except ValueError as e:
+                rejected.append((profile_id, str(e)))
+    return profiles, rejected
+
+
+def run_batch(path, workers=BATCH_WORKERS, rpm=GROQ_RPM, run=None, tpm=GROQ_TPM):
+    """
+    Run the four analyses for every profile in path over a bounded worker pool that
+    shares one request and token budget. Outputs are named <prefix>_<run>_<id>; pairs
+    that already have a stored output are skipped, so an interrupted run can be resumed.
+    Records that cannot be read are reported and counted as failed; the rest still run.
+    """
+    store = get_store()
+    run = run or os.path.splitext(os.path.basename(path))[0]
+    profiles, rejected = load_profiles(path)
+    done = {e['name'] for e in store.entries()}
+    limits = LLMLimits(rpm, tpm)
+
+    for profile_id, error in rejected:
+        print(f"   ⚠️  {profile_id} atlandı: {error}")
+
+    jobs = []
+    for profile_id, profile in profiles:
+        profile_name = f'user_profile_{run}_{profile_id}'
+        if profile_name not in done:
+            store.put(profile_name, json.dumps(profile, indent=2, ensure_ascii=False), 'json')
+        for key, (_, prefix, _) in ANALYSES.items():
+            name = f'{prefix}_{run}_{profile_id}'
+            if name not in done:
+                jobs.append((profile, key, name))
+
+    skipped = len(profiles) * len(ANALYSES) - len(jobs)
+    print(f"📋 {len(profiles)} profil, {len(jobs)} analiz çalışacak ({skipped} tamamlanmış atlandı)")
+    print(f"⚙️  {workers} paralel iş, dakikada en fazla {rpm:g} istek ve {tpm:g} token\n")
+
+    start = time.perf_counter()
+    failed = len(rejected)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_analysis, profile, key, name, False, limits): name
+            for profile, key, name in jobs
+        }
+        for count, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                _, filename = future.result()
+                print(f"   ✅ [{count}/{len(jobs)}] {filename}")
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ [{count}/{len(jobs)}] {name}: {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(jobs) + len(rejected) - failed} tamamlandı, {failed} hata, {skipped} atlandı ({elapsed:.1f}s)")
+    if failed:
+        print("   Aynı komutu tekrar çalıştırınca sadece eksik analizler yapılır.")
+    return failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Personalized FIRE workflow')
+    parser.add_argument('--batch', metavar='FILE', help='Run headless for every profile in a JSONL or CSV file')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help='Concurrent analyses in batch mode')
+    parser.add_argument('--rpm', type=float, default=GROQ_RPM, help='Maximum Groq requests per minute')
+    parser.add_argument('--tpm', type=float, default=GROQ_TPM, help='Maximum Groq tokens per minute')
+    parser.add_argument('--run', help='Batch run name used in output names (default: input file name)')
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.batch:
+        if not os.getenv('GROQ_API_KEY'):
+            print("❌ Error: GROQ_API_KEY not found")
+            return
+        run_batch(args.batch, args.workers, args.rpm, args.run, args.tpm)
+        return
+
     print("\n" + "="*60)
     print("🎯 KİŞİSELLEŞTİRİLMİŞ FIRE WORKFLOW")
     print("="*60)
@@ -287,10 +452,11 @@ def main():
     profile = get_user_profile()
     
     # Save profile
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    profile_file = f'outputs/user_profile_{profile["name"]}_{timestamp}.json'
-    with open(profile_file, 'w', encoding='utf-8') as f:
-        json.dump(profile, f, indent=2, ensure_ascii=False)
+    profile_file = get_store().put(
+        f'user_profile_{profile["name"]}',
+        json.dumps(profile, indent=2, ensure_ascii=False),
+        'json'
+    )
     
     print(f"📝 Profil kaydedildi: {profile_file}\n")
     
@@ -0,0 +1,236 @@
+"""
+Task Pipeline for the CrewAI workflow
+Runs tasks as a dependency graph built from their context links, so tasks that don't
+depend on each other execute concurrently, and checkpoints each task's output so a
+re-run resumes from the first failed or changed task
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from tools.telemetry import payload_size, span
+
+# Same separator CrewAI uses between context outputs in a sequential crew
+CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+def _model_name(llm) -> str:
+    """Model id of a CrewAI LLM or LangChain chat model"""
+    return str(getattr(llm, 'model', None) or getattr(llm, 'model_name', None) or type(llm).__name__)
+
+
+class CheckpointStore:
+    """
+    Task outputs on disk, keyed by a hash of everything that determines them: the
+    task description and expected output, the agent's role, goal, backstory and
+    tools, its model and temperature, and the upstream outputs passed as context.
+    A task whose key matches a stored checkpoint is not run again; editing a task
+    or getting a different upstream output changes the key.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_age: Optional[float] = None):
+        # Settings are read here, not at import: main.py loads .env after importing this module
+        self.root = root or os.getenv('CHECKPOINT_DIR', os.path.join('.cache', 'checkpoints'))
+        if max_age is None:
+            max_age = float(os.getenv('CHECKPOINT_MAX_AGE_DAYS', 7)) * 86400
+        os.makedirs(self.root, exist_ok=True)
+        now = time.time()
+        for entry in os.scandir(self.root):
+            # crew_batch.py workers share this directory and may expire the same file at once
+            with contextlib.suppress(FileNotFoundError):
+                if entry.name.endswith('.json') and now - entry.stat().st_mtime > max_age:
+                    os.remove(entry.path)
+
+    @staticmethod
+    def key(task, context: str) -> str:
+        agent = task.agent
+        llm = getattr(agent, 'llm', None)
+        payload = {
+            'description': task.description,
+            'expected_output': task.expected_output,
+            'agent': {
+                'role': agent.role,
+                'goal': agent.goal,
+                'backstory': agent.backstory,
+                'tools': sorted(t.name for t in (task.tools or agent.tools or [])),
+            },
+            'model': _model_name(llm),
+            'temperature': getattr(llm, 'temperature', None),
+            'context': context,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _path(self, name: str, key: str) -> str:
+        return os.path.join(self.root, f"{name}-{key[:32]}.json")
+
+    def load(self, name: str, task, key: str):
+        """Stored TaskOutput for the key, or None"""
+        try:
+            with open(self._path(name, key), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        from crewai.tasks.task_output import TaskOutput
+
+        output = TaskOutput(
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=data['raw'],
+            agent=data['agent'],
+        )
+        task.output = output
+        return output
+
+    def save(self, name: str, key: str, output) -> None:
+        path = self._path(name, key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'task': name, 'key': key, 'raw': output.raw, 'agent': output.agent,
+                       'saved_at': time.time()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+@dataclass
+class TaskTiming:
+    """Wall-clock timing of one task, in seconds since the run started"""
+    name: str
+    deps: Tuple[str, ...]
+    start: float = 0.0
+    end: float = 0.0
+    error: Optional[str] = None
+    checkpointed: bool = False
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class TaskGraph:
+    """
+    Dependency graph of named CrewAI tasks.
+
+    Edges come from each task's context list; run() starts every task as soon as
+    the tasks it reads from are done and returns {name: TaskOutput}. With a
+    CheckpointStore, tasks whose inputs are unchanged reuse their stored output.
+    """
+    tasks: Dict[str, object]
+    max_workers: Optional[int] = None
+    checkpoints: Optional[CheckpointStore] = None
+    timings: Dict[str, TaskTiming] = field(default_factory=dict)
+    wall: float = 0.0
+
+    def __post_init__(self):
+        names = {id(task): name for name, task in self.tasks.items()}
+        self.deps: Dict[str, Tuple[str, ...]] = {}
+        for name, task in self.tasks.items():
+            context = task.context if isinstance(task.context, list) else []
+            unknown = [c.description[:40] for c in context if id(c) not in names]
+            if unknown:
+                raise ValueError(f"Task {name} has context tasks outside the graph: {unknown}")
+            self.deps[name] = tuple(names[id(c)] for c in context)
+            self.timings[name] = TaskTiming(name, self.deps[name])
+
+    def _execute(self, name: str, context: str, started: float):
+        task = self.tasks[name]
+        stats = getattr(task.agent.llm, 'stats', None)
+        agent = getattr(task.agent.llm, 'agent', None)
+        tokens_before = stats.tokens(agent) if stats else (0, 0)
+        self.timings[name].start = time.perf_counter() - started
+        try:
+            with span('task', name, agent=task.agent.role, deps=list(self.deps[name]),
+                      context_bytes=payload_size(context)) as event:
+                try:
+                    key = self.checkpoints.key(task, context) if self.checkpoints else None
+                    if key:
+                        output = self.checkpoints.load(name, task, key)
+                        if output is not None:
+                            self.timings[name].checkpointed = True
+                            event.update(checkpointed=True, output_bytes=payload_size(output.raw))
+                            return output
+                    output = task.execute_sync(
+                        agent=task.agent,
+                        context=context,
+                        tools=task.tools or task.agent.tools,
+                    )
+                    if key:
+                        self.checkpoints.save(name, key, output)
+                    event['output_bytes'] = payload_size(output.raw)
+                    return output
+                finally:
+                    # Agents run one task each per graph, so the agent's delta is this task's usage
+                    if stats:
+                        prompt_tokens, completion_tokens = stats.tokens(agent)
+                        event.update(prompt_tokens=prompt_tokens - tokens_before[0],
+                                     completion_tokens=completion_tokens - tokens_before[1])
+        finally:
+            self.timings[name].end = time.perf_counter() - started
+
+    def run(self) -> Dict[str, object]:
+        started = time.perf_counter()
+        outputs: Dict[str, object] = {}
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(self.tasks)) as pool:
+            def submit_ready():
+                running = set(pending.values())
+                for name, deps in self.deps.items():
+                    if name in outputs or name in running:
+                        continue
+                    if all(d in outputs for d in deps):
+                        context = CONTEXT_SEPARATOR.join(outputs[d].raw for d in deps)
+                        pending[pool.submit(self._execute, name, context, started)] = name
+
+            submit_ready()
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except Exception as e:
+                        self.timings[name].error = type(e).__name__
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    if self.timings[name].checkpointed:
+                        print(f"♻️  {name} reused from checkpoint")
+                    else:
+                        print(f"✅ {name} finished in {self.timings[name].seconds:.1f}s")
+                submit_ready()
+                if not pending and len(outputs) < len(self.tasks):
+                    raise ValueError("Task context links form a cycle")
+
+        self.wall = time.perf_counter() - started
+        return outputs
+
+    def critical_path(self) -> List[str]:
+        """Chain of tasks that determined the finish time, first to last"""
+        if not self.timings:
+            return []
+        timing = max(self.timings.values(), key=lambda t: t.end)
+        path = [timing.name]
+        while timing.deps:
+            timing = max((self.timings[d] for d in timing.deps), key=lambda t: t.end)
+            path.append(timing.name)
+        return path[::-1]
+
+    def report(self) -> str:
+        """Per-task wall-clock table, total and critical path"""
+        lines = [f"{'task':<26}{'after':<28}{'start s':>9}{'end s':>9}{'took s':>9}"]
+        for t in sorted(self.timings.values(), key=lambda t: t.start):
+            after = ", ".join(t.deps) or "-"
+            status = f"  ({t.error})" if t.error else "  (checkpoint)" if t.checkpointed else ""
+            lines.append(f"{t.name:<26}{after:<28}{t.start:>9.1f}{t.end:>9.1f}{t.seconds:>9.1f}{status}")
+        serial = sum(t.seconds for t in self.timings.values())
+        lines.append(f"\nWall clock: {self.wall:.1f}s (tasks back to back: {serial:.1f}s)")
+        lines.append(f"Critical path: {' → '.join(self.critical_path())}")
+        return "\n".join(lines)
+
+
+__all__ = ["CONTEXT_SEPARATOR", "CheckpointStore", "TaskGraph", "TaskTiming"]
@@ -9,27 +9,17 @@ from groq import Groq
 import pandas as pd
 from datetime import datetime
 
-# Load environment
+# Settings in .env must be loaded before the tools modules read them
 load_dotenv()
+from tools.streaming import stream_chat, stream_to_store
+
 
 # Initialize Groq client
 client = Groq(api_key=os.getenv('GROQ_API_KEY'))
 
-def call_ai(prompt: str, system: str = "You are a helpful AI assistant.") -> str:
-    """Call Groq API directly"""
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Error: {str(e)}"
+def stream_ai(prompt: str, system: str):
+    """Stream a Groq completion chunk by chunk"""
+    return stream_chat(client, prompt, system)
 
 
 def research_career_paths():
@@ -57,14 +47,11 @@ Gerçekçi veri kullan. Data science, machine learning, analytics rollerine odak
 Çıktıyı CSV formatında ver (header dahil):
 name,graduation_year,first_job,current_position,years_experience,education_level,estimated_salary_usd,career_transitions,notes"""
 
-    result = call_ai(prompt, system)
-    
-    # Save to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/career_paths_{timestamp}.csv'
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(result)
+    result, filename = stream_to_store(
+        stream_ai(prompt, system),
+        'career_paths',
+        'csv'
+    )
     
     print(f"✅ Created: {filename}")
     return filename, result
@@ -104,16 +91,13 @@ Her senaryo için hesapla:
 
 Sonucu tablo formatında ver. Hangisi en iyi ROI'yi veriyor açıkla."""
 
-    result = call_ai(prompt, system)
-    
-    # Save to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/education_roi_{timestamp}.md'
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("# 📊 Education ROI Analysis\n\n")
-        f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = stream_to_store(
+        stream_ai(prompt, system),
+        'education_roi',
+        'md',
+        "# 📊 Education ROI Analysis\n\n"
+        f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    )
     
     print(f"✅ Created: {filename}")
     return filename, result
@@ -150,16 +134,13 @@ Detaylı plan içermeli:
 
 Markdown formatında, tablolar ve emoji ile zenginleştir."""
 
-    result = call_ai(prompt, system)
-    
-    # Save to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/fire_plan_{timestamp}.md'
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("# 🔥 FIRE Plan - Early Retirement Strategy\n\n")
-        f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = stream_to_store(
+        stream_ai(prompt, system),
+        'fire_plan',
+        'md',
+        "# 🔥 FIRE Plan - Early Retirement Strategy\n\n"
+        f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    )
     
     print(f"✅ Created: {filename}")
     return filename, result
@@ -197,16 +178,13 @@ Her fikir için:
 Markdown formatında, emoji ve tablolar kullan.
 Başarı ipuçları ekle."""
 
-    result = call_ai(prompt, system)
-    
-    # Save to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f'outputs/side_hustles_{timestamp}.md'
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write("# 🚀 Side Income Opportunities Report\n\n")
-        f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(result)
+    result, filename = stream_to_store(
+        stream_ai(prompt, system),
+        'side_hustles',
+        'md',
+        "# 🚀 Side Income Opportunities Report\n\n"
+        f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    )
     
     print(f"✅ Created: {filename}")
     return filename, result
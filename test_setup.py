@@ -13,7 +13,7 @@ def test_imports():
     
     required_packages = [
         ('crewai', 'CrewAI'),
-        ('langchain_groq', 'LangChain Groq'),
+        ('groq', 'Groq'),
         ('pandas', 'Pandas'),
         ('dotenv', 'Python-dotenv'),
         ('yaml', 'PyYAML'),
@@ -114,17 +114,17 @@ def test_groq_connection():
         return True
     
     try:
-        from langchain_groq import ChatGroq
+        from groq import Groq
         
-        llm = ChatGroq(
+        client = Groq(api_key=groq_key)
+        
+        response = client.chat.completions.create(
             model='llama-3.3-70b-versatile',
-            groq_api_key=groq_key,
+            messages=[{"role": "user", "content": "Say 'test successful' if you can read this."}],
             temperature=0.7
         )
-        
-        response = llm.invoke("Say 'test successful' if you can read this.")
         print(f"   ✓ Connection successful")
-        print(f"   Response: {response.content[:50]}...")
+        print(f"   Response: {response.choices[0].message.content[:50]}...")
         return True
         
     except Exception as e:
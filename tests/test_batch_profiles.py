@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+pytest.importorskip('dotenv')
+pytest.importorskip('groq')
+os.environ.setdefault('GROQ_API_KEY', 'test')
+
+import personalized_workflow as workflow  # noqa: E402
+
+
+def test_bad_rows_are_rejected_and_the_rest_load(tmp_path):
+    path = tmp_path / "profiles.jsonl"
+    path.write_text(
+        '{"id": "a", "name": "Ayşe", "age": "29"}\n'
+        '{"id": "b", "age": "yirmi"}\n'
+        'not json\n'
+        '{"id": "c", "target_salary": "1e6"}\n',
+        encoding='utf-8',
+    )
+    profiles, rejected = workflow.load_profiles(str(path))
+    assert [(i, p['age']) for i, p in profiles] == [('a', 29), ('c', 25)]
+    assert profiles[1][1]['target_salary'] == 1000000
+    assert [i for i, _ in rejected] == ['b', '3']
+    assert 'age' in rejected[0][1]
+
+
+def test_csv_row_with_a_malformed_salary_is_rejected(tmp_path):
+    path = tmp_path / "profiles.csv"
+    path.write_text("id,name,target_salary\nx,Ali,100k\ny,Can,90000\n", encoding='utf-8')
+    profiles, rejected = workflow.load_profiles(str(path))
+    assert [i for i, _ in profiles] == ['y']
+    assert rejected[0][0] == 'x' and 'target_salary' in rejected[0][1]
+
+
+def test_analysis_waits_for_prompt_tokens_and_charges_the_completion(tmp_path, monkeypatch):
+    calls = []
+
+    class Limits:
+        def acquire(self, tokens):
+            calls.append(('acquire', tokens))
+            return 0.0
+
+        def consume(self, tokens):
+            calls.append(('consume', tokens))
+
+    monkeypatch.setattr(workflow, 'stream_ai', lambda prompt, system: iter(["x" * 400]))
+    monkeypatch.setattr(workflow, 'stream_to_store',
+                        lambda chunks, name, ext, header, echo: (''.join(chunks), str(tmp_path / name)))
+    profile = workflow.normalize_profile({'name': "Test"})
+    workflow.run_analysis(profile, 'career', 'out', False, Limits())
+    assert calls[0][0] == 'acquire' and calls[0][1] > 100
+    assert calls[1] == ('consume', workflow.estimate_tokens("x" * 400))
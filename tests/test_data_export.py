@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip('crewai_tools')
+pa = pytest.importorskip('pyarrow')
+
+from tools.data_export_tool import TYPE_SAMPLE_ROWS, write_arrow, write_xlsx  # noqa: E402
+
+# Numeric for longer than the type sample, then a value that isn't a number
+LATE_TEXT = "year,amount\n" + "".join(f"{i},{i * 10}\n" for i in range(TYPE_SAMPLE_ROWS + 200)) + "2099,N/A\n"
+
+
+def test_xlsx_keeps_text_after_the_type_sample(tmp_path):
+    from openpyxl import load_workbook
+
+    path = str(tmp_path / "late.xlsx")
+    write_xlsx(LATE_TEXT, path)
+    rows = list(load_workbook(path, read_only=True)['Data'].values)
+    assert rows[1] == (0, 0)
+    assert rows[-1] == (2099, "N/A")
+
+
+@pytest.mark.parametrize("format", ["parquet", "feather"])
+def test_arrow_widens_a_column_with_late_text(tmp_path, format):
+    path = str(tmp_path / f"late.{format}")
+    write_arrow(LATE_TEXT, path, format)
+    table = _read(path, format)
+    assert table.schema.field('year').type == pa.float64()
+    assert table.schema.field('amount').type == pa.string()
+    assert table.column('amount').to_pylist()[-1] == "N/A"
+
+
+def test_arrow_column_empty_in_the_first_chunk(tmp_path):
+    data = "name,score\na,\nb,\nc,\nd,4\ne,5.5\n"
+    path = str(tmp_path / "sparse.parquet")
+    assert write_arrow(data, path, 'parquet', chunk_rows=3) == 5
+    table = _read(path, 'parquet')
+    assert table.schema.field('score').type == pa.float64()
+    assert table.column('score').to_pylist() == [None, None, None, 4.0, 5.5]
+
+
+def _read(path, format):
+    if format == 'parquet':
+        import pyarrow.parquet
+        return pa.parquet.read_table(path)
+    import pyarrow.feather
+    return pa.feather.read_table(path)
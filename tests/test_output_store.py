@@ -0,0 +1,46 @@
+import json
+import os
+import stat
+
+from tools.output_store import FILE_MODE, LATEST_INDEX, OutputStore
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_stored_files_get_umask_permissions(tmp_path):
+    store = OutputStore(str(tmp_path))
+    path = store.put('retirement_plan', 'plan', 'md')
+    assert stat.S_IMODE(os.stat(path).st_mode) == FILE_MODE
+
+
+def test_rewrite_after_another_process_wrote_a_different_version(tmp_path):
+    # Two stores on one directory stand in for two processes sharing OUTPUT_DIR
+    first, second = OutputStore(str(tmp_path)), OutputStore(str(tmp_path))
+    first.put('career_paths', 'a,b\n1,2\n', 'csv')
+    second.put('career_paths', 'a,b\n3,4\n', 'csv')
+    path = first.put('career_paths', 'a,b\n1,2\n', 'csv')
+
+    assert _read(path) == 'a,b\n1,2\n'
+    assert len(first.entries('career_paths')) == 3
+    assert first.latest()['career_paths.csv']['blob'] == first.entries()[-1]['blob']
+
+
+def test_identical_rerun_records_no_new_version(tmp_path):
+    store = OutputStore(str(tmp_path))
+    store.put('report', 'same', 'md')
+    store.put('report', 'same', 'md')
+    assert len(store.entries('report')) == 1
+
+
+def test_latest_is_served_from_the_index(tmp_path):
+    store = OutputStore(str(tmp_path))
+    store.put('report', 'v1', 'md')
+    store.put('report', 'v2', 'md')
+    with open(os.path.join(str(tmp_path), LATEST_INDEX), 'r', encoding='utf-8') as f:
+        assert json.load(f) == store.latest()
+    # The history is not read for listing
+    os.remove(os.path.join(str(tmp_path), 'manifest.jsonl'))
+    assert store.latest()['report.md']['size'] == 2
@@ -0,0 +1,39 @@
+import time
+
+from tools.search_index import SearchIndex
+
+
+def _index():
+    index = SearchIndex(':memory:')
+    index.add("python developer salary 2025", [
+        {'title': f"Python developer salary 2025 #{i}", 'link': f"https://example.com/python/{i}",
+         'snippet': "Average python developer salary in Istanbul for 2025"}
+        for i in range(5)
+    ])
+    return index
+
+
+def test_related_query_is_answered_from_index():
+    assert len(_index().search("python developer salary")) == 5
+
+
+def test_one_shared_word_is_not_a_match():
+    assert _index().search("nurse practitioner residency Turkey 2025") == []
+
+
+def test_like_fallback_applies_the_same_cutoff():
+    index = _index()
+    index.fts = False
+    assert index.search("nurse practitioner residency Turkey 2025") == []
+    assert len(index.search("python developer salary")) == 5
+
+
+def test_results_past_max_age_are_pruned_on_open(tmp_path):
+    path = str(tmp_path / "index.sqlite3")
+    index = SearchIndex(path, max_age=None)
+    index.add("old query", [{'title': "Old", 'link': "https://example.com/old"}], fetched_at=time.time() - 3600)
+    index.add("new query", [{'title': "New", 'link': "https://example.com/new"}])
+    index.close()
+
+    assert len(SearchIndex(path, max_age=None)) == 2
+    assert len(SearchIndex(path, max_age=60)) == 1
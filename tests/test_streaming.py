@@ -0,0 +1,34 @@
+import threading
+import time
+
+from tools.streaming import BufferedStream
+
+
+def test_cancel_stops_a_running_stream_and_closes_its_source():
+    closed = threading.Event()
+
+    def chunks():
+        try:
+            for i in range(1000):
+                time.sleep(0.01)
+                yield f"{i} "
+        finally:
+            closed.set()
+
+    stream = BufferedStream(chunks())
+    worker = threading.Thread(target=stream.consume, daemon=True)
+    worker.start()
+    time.sleep(0.05)
+
+    stream.cancel()
+    assert stream.done()
+    worker.join(timeout=1)
+    assert not worker.is_alive()
+    assert closed.is_set()
+    assert 0 < len("".join(stream.follow()).split()) < 1000
+
+
+def test_follow_replays_buffered_chunks_then_live_ones():
+    stream = BufferedStream(iter(["a", "b", "c"]))
+    stream.consume()
+    assert "".join(stream.follow()) == "abc"
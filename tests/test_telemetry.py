@@ -0,0 +1,37 @@
+from tools import telemetry
+
+
+def _run(run_id):
+    telemetry.start_run(run_id)
+    telemetry.emit('task', name="t", seconds=1.0, payload="x" * 600)
+    telemetry.end_run()
+
+
+def test_start_run_rotates_an_oversized_file(tmp_path, monkeypatch):
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setenv('TELEMETRY_PATH', str(path))
+    monkeypatch.setenv('TELEMETRY_MAX_MB', str(1 / 1024))  # 1 KiB
+
+    _run('one')
+    _run('two')
+    assert not (tmp_path / "telemetry.jsonl.1").exists()
+    _run('three')
+    assert (tmp_path / "telemetry.jsonl.1").exists()
+    assert {e['run'] for e in telemetry.load_events(str(path) + '.1')} >= {'one', 'two'}
+    _run('four')
+    _run('five')
+
+    # Only the current file and one rotated file are kept
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["telemetry.jsonl", "telemetry.jsonl.1"]
+    runs = [e['run'] for e in telemetry.load_events(str(path)) if e['type'] == 'run_end']
+    assert runs[-2:] == ['four', 'five'] and 'one' not in runs
+
+
+def test_no_rotation_when_disabled(tmp_path, monkeypatch):
+    path = tmp_path / "telemetry.jsonl"
+    monkeypatch.setenv('TELEMETRY_PATH', str(path))
+    monkeypatch.setenv('TELEMETRY_MAX_MB', '0')
+    for i in range(5):
+        _run(str(i))
+    assert not (tmp_path / "telemetry.jsonl.1").exists()
+    assert len(telemetry.load_events(str(path))) == 15
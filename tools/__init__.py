@@ -1,3 +1,19 @@
-from .search_tool import search_web, export_data
+# Tools import crewai, so they are loaded on first access
+_TOOLS = {
+    'search_web': '.search_tool',
+    'search_web_batch': '.search_tool',
+    'search_indexed': '.search_tool',
+    'export_data': '.search_tool',
+}
 
-__all__ = ['search_web', 'export_data']
+
+def __getattr__(name):
+    if name in _TOOLS:
+        from importlib import import_module
+        value = getattr(import_module(_TOOLS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['search_web', 'search_web_batch', 'search_indexed', 'export_data']
@@ -2,6 +2,8 @@ from crewai_tools import BaseTool
 from typing import Type, Dict, List
 from pydantic import BaseModel, Field
 import pandas as pd
+from .finance import scenario_metrics
+from .telemetry import traced_tool
 
 
 class CalculatorInput(BaseModel):
@@ -22,6 +24,7 @@ class ROICalculatorTool(BaseTool):
     )
     args_schema: Type[BaseModel] = CalculatorInput
 
+    @traced_tool('roi_calculator', method=True)
     def _run(
         self, 
         scenarios: List[Dict], 
@@ -30,37 +33,30 @@ class ROICalculatorTool(BaseTool):
     ) -> str:
         """Calculate ROI for different scenarios."""
         try:
-            results = []
+            names = [scenario.get('name', 'Unknown') for scenario in scenarios]
+            education_years = [scenario.get('education_years', 0) for scenario in scenarios]
+            education_cost = [scenario.get('education_cost', 0) for scenario in scenarios]
+            metrics = scenario_metrics(
+                education_years,
+                education_cost,
+                [scenario.get('starting_salary', 30000) for scenario in scenarios],
+                [scenario.get('annual_raise', 0.10) for scenario in scenarios],
+                years=years,
+                discount_rate=discount_rate
+            )
             
-            for scenario in scenarios:
-                name = scenario.get('name', 'Unknown')
-                education_years = scenario.get('education_years', 0)
-                education_cost = scenario.get('education_cost', 0)
-                starting_salary = scenario.get('starting_salary', 30000)
-                annual_raise = scenario.get('annual_raise', 0.10)
-                
-                # Calculate earnings
-                working_years = years - education_years
-                total_earnings = 0
-                npv = -education_cost  # Initial investment
-                
-                for year in range(working_years):
-                    yearly_salary = starting_salary * ((1 + annual_raise) ** year)
-                    total_earnings += yearly_salary
-                    
-                    # Discount future earnings
-                    discount_factor = 1 / ((1 + discount_rate) ** (year + education_years))
-                    npv += yearly_salary * discount_factor
-                
-                results.append({
-                    'Scenario': name,
-                    'Education Years': education_years,
-                    'Education Cost': f"${education_cost:,.0f}",
-                    'Working Years': working_years,
-                    'Total Earnings': f"${total_earnings:,.0f}",
-                    'NPV': f"${npv:,.0f}",
-                    'Final Salary': f"${starting_salary * ((1 + annual_raise) ** (working_years - 1)):,.0f}"
-                })
+            results = [
+                {
+                    'Scenario': names[i],
+                    'Education Years': education_years[i],
+                    'Education Cost': f"${education_cost[i]:,.0f}",
+                    'Working Years': int(metrics['working_years'][i]),
+                    'Total Earnings': f"${metrics['total_earnings'][i]:,.0f}",
+                    'NPV': f"${metrics['npv'][i]:,.0f}",
+                    'Final Salary': f"${metrics['final_salary'][i]:,.0f}"
+                }
+                for i in range(len(scenarios))
+            ]
             
             # Create DataFrame for better formatting
             df = pd.DataFrame(results)
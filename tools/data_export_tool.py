@@ -1,60 +1,222 @@
 from crewai_tools import BaseTool
-from typing import Type, Any
+from typing import Iterator, List, Optional, Type
 from pydantic import BaseModel, Field
-import pandas as pd
+import csv
+import io
+import itertools
 import os
-from datetime import datetime
+import re
+from .output_store import get_store
+from .telemetry import traced_tool
+
+# Rows parsed per chunk for Parquet/Feather exports
+EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', 50000))
+# Rows sampled to decide which columns are numeric
+TYPE_SAMPLE_ROWS = 1000
+# Rows copied to the xlsx Chart Data sheet and plotted
+CHART_MAX_ROWS = 50
+
+_NUMBER = re.compile(r"^[-+]?\$?[\d,]*\.?\d+%?$")
 
 
 class ExportInput(BaseModel):
     """Input for Data Export Tool."""
     data: str = Field(..., description="Data to export (CSV, JSON, or text format)")
     filename: str = Field(..., description="Output filename")
-    format: str = Field(default="csv", description="Export format: csv, xlsx, md")
+    format: str = Field(default="csv", description="Export format: csv, xlsx, md, parquet, feather")
+
+
+def _to_number(value: str) -> Optional[float]:
+    """Parse plain, currency ($1,200) and percent (12%) values; None if not a number."""
+    value = value.strip()
+    if not _NUMBER.match(value):
+        return None
+    number = float(value.replace('$', '').replace(',', '').rstrip('%'))
+    return number / 100 if value.endswith('%') else number
+
+
+def _is_table(data: str) -> bool:
+    """Whether the text looks like CSV: at least two columns, same count on the first lines."""
+    rows = [row for _, row in zip(range(5), _rows(data))]
+    return len(rows) > 1 and len(rows[0]) > 1 and all(len(row) == len(rows[0]) for row in rows)
+
+
+def _rows(data: str) -> Iterator[List[str]]:
+    """CSV rows streamed from the text, blank lines skipped."""
+    return (row for row in csv.reader(io.StringIO(data)) if row)
+
+
+def numeric_columns(data: str, sample: Optional[int] = TYPE_SAMPLE_ROWS) -> List[int]:
+    """
+    Indexes of columns whose sampled non-empty values all parse as numbers;
+    sample=None checks every row.
+    """
+    rows = _rows(data)
+    header = next(rows, [])
+    candidates = set(range(len(header)))
+    seen = set()
+    for row in rows if sample is None else itertools.islice(rows, sample):
+        for i in list(candidates):
+            if i < len(row) and row[i].strip():
+                if _to_number(row[i]) is None:
+                    candidates.discard(i)
+                else:
+                    seen.add(i)
+    return sorted(candidates & seen)
+
+
+def _cell(value: str):
+    """Number for a numeric column's cell, or the original text when it doesn't parse."""
+    if not value.strip():
+        return value
+    number = _to_number(value)
+    return value if number is None else number
+
+
+def write_xlsx(data: str, file_path: str) -> int:
+    """
+    Stream CSV text into a write-only workbook: a Data sheet with typed cells and, when
+    there are numeric columns, a Chart Data sheet (label + numeric columns of the first
+    CHART_MAX_ROWS rows) with a bar chart. Column types come from a sample, so a later
+    value that isn't a number is written as text.
+    Returns the number of data rows.
+    """
+    from openpyxl import Workbook
+    from openpyxl.chart import BarChart, Reference
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Data')
+    numeric = numeric_columns(data)
+
+    rows = _rows(data)
+    header = next(rows, [])
+    sheet.append(header)
+    count = 0
+    for row in rows:
+        sheet.append([_cell(value) if i in numeric else value for i, value in enumerate(row)])
+        count += 1
+
+    chart_columns = [i for i in numeric if i != 0]
+    if chart_columns and count:
+        chart_sheet = workbook.create_sheet('Chart Data')
+        rows = _rows(data)
+        next(rows, None)
+        chart_rows = min(count, CHART_MAX_ROWS)
+        chart_sheet.append([header[0]] + [header[i] for i in chart_columns])
+        for _, row in zip(range(chart_rows), rows):
+            chart_sheet.append([row[0]] + [
+                _to_number(row[i]) if i < len(row) and row[i].strip() else None
+                for i in chart_columns
+            ])
+
+        chart = BarChart()
+        chart.title = os.path.splitext(os.path.basename(file_path))[0]
+        chart.add_data(
+            Reference(chart_sheet, min_col=2, max_col=len(chart_columns) + 1, min_row=1, max_row=chart_rows + 1),
+            titles_from_data=True
+        )
+        chart.set_categories(Reference(chart_sheet, min_col=1, min_row=2, max_row=chart_rows + 1))
+        chart_sheet.add_chart(chart, f"{get_column_letter(len(chart_columns) + 3)}2")
+
+    workbook.save(file_path)
+    return count
+
+
+def write_text_xlsx(data: str, file_path: str) -> int:
+    """Non-tabular text as one line per row in a write-only workbook."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Data')
+    sheet.append(['Data'])
+    count = 0
+    for line in io.StringIO(data):
+        sheet.append([line.rstrip('\n')])
+        count += 1
+    workbook.save(file_path)
+    return count
+
+
+def write_arrow(data: str, file_path: str, format: str, chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+    """
+    Parse CSV text in chunks and write a Parquet or Feather (Arrow IPC) file with typed
+    columns, one record batch per chunk. A column is float64 only when every value in
+    it parses as a number, string otherwise, and every chunk is written with that one
+    schema. Returns the number of rows.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(f"{format} export requires pyarrow (pip install pyarrow)")
+    import pandas as pd
+
+    # Typed on every row, not a sample: written chunks can't be widened afterwards
+    numeric = set(numeric_columns(data, sample=None))
+    schema, writer, count = None, None, 0
+    try:
+        for chunk in pd.read_csv(io.StringIO(data), chunksize=chunk_rows, dtype=str, keep_default_na=False):
+            if schema is None:
+                schema = pa.schema([
+                    (column, pa.float64() if i in numeric else pa.string())
+                    for i, column in enumerate(chunk.columns)
+                ])
+                if format == 'parquet':
+                    writer = pa.parquet.ParquetWriter(file_path, schema)
+                else:
+                    writer = pa.ipc.new_file(file_path, schema)
+            for i, column in enumerate(chunk.columns):
+                if i in numeric:
+                    chunk[column] = [_to_number(v) if v.strip() else None for v in chunk[column]]
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            writer.write_table(table)
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
 
 
 class DataExportTool(BaseTool):
     name: str = "Data Export Tool"
     description: str = (
-        "Exports data to various formats (CSV, Excel, Markdown). "
+        "Exports data to various formats (CSV, Excel, Markdown, Parquet, Feather). "
         "Saves files to the outputs directory."
     )
     args_schema: Type[BaseModel] = ExportInput
 
+    @traced_tool('data_export', method=True)
     def _run(self, data: str, filename: str, format: str = "csv") -> str:
         """Export data to specified format."""
         try:
-            # Ensure output directory exists
-            output_dir = "outputs"
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Add timestamp to filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_name = filename.rsplit('.', 1)[0]
-            file_path = os.path.join(output_dir, f"{base_name}_{timestamp}.{format}")
-            
-            if format == "csv":
-                # Try to parse as CSV
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(data)
-                    
+            store = get_store()
+            base_name = os.path.basename(filename).rsplit('.', 1)[0]
+
+            if format in ("csv", "md"):
+                file_path = store.put(base_name, data, format)
+
             elif format == "xlsx":
-                # Convert to DataFrame and save as Excel
-                try:
-                    df = pd.read_csv(pd.compat.StringIO(data))
-                    df.to_excel(file_path, index=False, engine='openpyxl')
-                except:
-                    # If not CSV format, save as text in Excel
-                    df = pd.DataFrame({'Data': [data]})
-                    df.to_excel(file_path, index=False, engine='openpyxl')
-                    
-            elif format == "md":
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(data)
+                # Typed cells and a chart sheet for CSV, one line per row otherwise
+                tmp_path = store.temp_path(format)
+                if _is_table(data):
+                    write_xlsx(data, tmp_path)
+                else:
+                    write_text_xlsx(data, tmp_path)
+                file_path = store.put_file(base_name, tmp_path, format)
+
+            elif format in ("parquet", "feather"):
+                if not _is_table(data):
+                    return f"{format} export needs CSV data with a header row"
+                tmp_path = store.temp_path(format)
+                write_arrow(data, tmp_path, format)
+                file_path = store.put_file(base_name, tmp_path, format)
+
             else:
                 return f"Unsupported format: {format}"
-            
+
             return f"Successfully exported to {file_path}"
-            
+
         except Exception as e:
             return f"Error exporting data: {str(e)}"
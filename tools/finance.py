@@ -0,0 +1,90 @@
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+def scenario_metrics(
+    education_years: Sequence[float],
+    education_cost: Sequence[float],
+    starting_salary: Sequence[float],
+    annual_raise: Sequence[float],
+    years: int = 15,
+    discount_rate: float = 0.05
+) -> Dict[str, np.ndarray]:
+    """
+    Earnings of education/career scenarios over a fixed horizon, one value per scenario.
+
+    Salary starts after education and grows by annual_raise each working year; NPV
+    discounts each year's salary back to today and subtracts the education cost.
+    """
+    education_years = np.asarray(education_years, dtype=int)
+    education_cost = np.asarray(education_cost, dtype=float)
+    starting_salary = np.asarray(starting_salary, dtype=float)
+    annual_raise = np.asarray(annual_raise, dtype=float)
+
+    working_years = np.maximum(years - education_years, 0)
+    year = np.arange(years)[None, :]
+    working = year < working_years[:, None]
+    salary = starting_salary[:, None] * (1 + annual_raise[:, None]) ** year
+    discount = (1 + discount_rate) ** -(year + education_years[:, None])
+
+    return {
+        'working_years': working_years,
+        'total_earnings': np.where(working, salary, 0.0).sum(axis=1),
+        'npv': np.where(working, salary * discount, 0.0).sum(axis=1) - education_cost,
+        'final_salary': starting_salary * (1 + annual_raise) ** (working_years - 1),
+    }
+
+
+def savings_schedule(
+    years: int,
+    start: float = 0.30,
+    step: float = 0.05,
+    every: int = 3,
+    cap: float = 0.50
+) -> np.ndarray:
+    """Savings rate per year: start, raised by step every `every` years, up to cap."""
+    return np.minimum(start + step * (np.arange(years) // every), cap)
+
+
+def accumulation_table(
+    start_age: int,
+    salary: float,
+    salary_growth: float,
+    savings_rates: Sequence[float],
+    annual_return: float
+) -> Dict[str, np.ndarray]:
+    """
+    Year-by-year portfolio growth, one entry per year of savings_rates.
+
+    Contributions arrive evenly through the year, so each year's savings earn half
+    a year of returns in the year they are made.
+    """
+    savings_rates = np.asarray(savings_rates, dtype=float)
+    year = np.arange(1, len(savings_rates) + 1)
+    salaries = salary * (1 + salary_growth) ** (year - 1)
+    savings = salaries * savings_rates
+    growth = 1 + annual_return
+    contributions = savings * (1 + annual_return / 2)
+    # P_n = sum_t c_t * g^(n-t), computed as g^n * cumsum(c_t / g^t)
+    portfolio = growth ** year * np.cumsum(contributions / growth ** year)
+    return {
+        'year': year,
+        'age': start_age + year - 1,
+        'salary': salaries,
+        'savings_rate': savings_rates,
+        'annual_savings': savings,
+        'portfolio': portfolio,
+    }
+
+
+def fire_target(annual_expenses: float, withdrawal_rate: float = 0.04) -> float:
+    """Portfolio whose safe withdrawals cover the annual expenses."""
+    return annual_expenses / withdrawal_rate
+
+
+def milestone_years(portfolio: Sequence[float], thresholds: Iterable[float]) -> List[int]:
+    """First year (1-based) the portfolio reaches each threshold; 0 if it never does."""
+    reached = np.maximum.accumulate(np.asarray(portfolio, dtype=float))
+    index = np.searchsorted(reached, np.asarray(list(thresholds), dtype=float))
+    return [int(i) + 1 if i < len(reached) else 0 for i in index]
@@ -0,0 +1,131 @@
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from crewai import LLM
+
+from .llm_cache import CachedLLM
+from .rate_limit import LLMLimits, call_with_backoff, estimate_tokens, is_rate_limited
+from .telemetry import span
+
+
+def _message_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get('content', '')) for m in messages)
+
+
+@dataclass
+class AgentLLMStats:
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    max_latency: float = 0.0
+    waited: float = 0.0
+
+
+class LLMStats:
+    """Thread-safe per-agent counts of calls, 429s, estimated tokens, latency and limiter waits."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.agents: Dict[str, AgentLLMStats] = {}
+
+    def record(self, agent: str, **values) -> None:
+        with self._lock:
+            stats = self.agents.setdefault(agent, AgentLLMStats())
+            for name, value in values.items():
+                if name == 'max_latency':
+                    stats.max_latency = max(stats.max_latency, value)
+                else:
+                    setattr(stats, name, getattr(stats, name) + value)
+
+    def tokens(self, agent: str) -> Tuple[int, int]:
+        """Estimated (prompt, completion) tokens recorded for agent so far"""
+        with self._lock:
+            stats = self.agents.get(agent) or AgentLLMStats()
+            return stats.prompt_tokens, stats.completion_tokens
+
+    def report(self) -> str:
+        """Per-agent table plus totals; tokens are estimates from text length"""
+        lines = [
+            f"{'agent':<18}{'calls':>7}{'429s':>6}{'errors':>8}{'~tok in':>10}{'~tok out':>10}"
+            f"{'avg s':>8}{'max s':>8}{'waited s':>10}"
+        ]
+        with self._lock:
+            rows = sorted(self.agents.items())
+            for agent, s in rows:
+                avg = s.latency / s.calls if s.calls else 0.0
+                lines.append(
+                    f"{agent:<18}{s.calls:>7}{s.rate_limited:>6}{s.errors:>8}{s.prompt_tokens:>10,}"
+                    f"{s.completion_tokens:>10,}{avg:>8.1f}{s.max_latency:>8.1f}{s.waited:>10.1f}"
+                )
+            calls = sum(s.calls for _, s in rows)
+            tokens = sum(s.prompt_tokens + s.completion_tokens for _, s in rows)
+        lines.append(f"\nTotal: {calls} calls, ~{tokens:,} tokens")
+        return "\n".join(lines)
+
+
+class RateLimitedLLM(LLM):
+    """
+    CrewAI LLM that shares one request and token budget across agents.
+
+    Every call waits on the shared LLMLimits, is retried with backoff on HTTP 429,
+    and is recorded in the shared LLMStats under the agent it belongs to. Use
+    for_agent() to give each agent its own view of the same limits and stats.
+    """
+
+    def __init__(self, *args, limits: Optional[LLMLimits] = None, stats: Optional[LLMStats] = None,
+                 agent: str = 'default', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limits = limits or LLMLimits()
+        self.stats = stats or LLMStats()
+        self.agent = agent
+
+    def for_agent(self, agent: str) -> 'RateLimitedLLM':
+        """Copy of this LLM whose calls are recorded under agent; limits and stats are shared."""
+        llm = copy.copy(self)
+        llm.agent = agent
+        return llm
+
+    def call(self, messages, *args, **kwargs) -> str:
+        prompt_tokens = estimate_tokens(_message_text(messages))
+        waits = []
+
+        def attempt():
+            waited = self.limits.acquire(prompt_tokens)
+            waits.append(waited)
+            started = time.perf_counter()
+            try:
+                return super(RateLimitedLLM, self).call(messages, *args, **kwargs)
+            except Exception as e:
+                self.stats.record(self.agent, rate_limited=int(is_rate_limited(e)))
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                self.stats.record(self.agent, waited=waited, latency=elapsed, max_latency=elapsed)
+
+        with span('llm', self.agent, model=self.model, prompt_tokens=prompt_tokens) as event:
+            try:
+                response = call_with_backoff(attempt)
+            except Exception:
+                self.stats.record(self.agent, calls=1, errors=1, prompt_tokens=prompt_tokens)
+                raise
+            finally:
+                event.update(attempts=len(waits), waited=sum(waits))
+            completion_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+            event['completion_tokens'] = completion_tokens
+        self.limits.consume(completion_tokens)
+        self.stats.record(
+            self.agent, calls=1, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return response
+
+
+class CachedRateLimitedLLM(CachedLLM, RateLimitedLLM):
+    """Cache hits return at once; misses go through the shared rate limits."""
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from crewai import LLM
+
+from .telemetry import emit, payload_size
+
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_cache.sqlite3'))
+LLM_CACHE_MAX_BYTES = int(float(os.getenv('LLM_CACHE_MAX_MB', 100)) * 1024 * 1024)
+LLM_CACHE_MAX_AGE = float(os.getenv('LLM_CACHE_MAX_AGE_DAYS', 30)) * 86400
+# Size limits are enforced after this many new responses, and whenever the cache is opened
+TRIM_EVERY = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses(used_at);
+"""
+
+# LLM attributes that change the completion; anything else (api keys, callbacks) does not
+CACHE_PARAMS = (
+    'temperature', 'top_p', 'n', 'stop', 'max_tokens', 'max_completion_tokens',
+    'presence_penalty', 'frequency_penalty', 'logit_bias', 'response_format', 'seed',
+    'base_url', 'api_version',
+)
+
+
+def cache_key(model: str, params: Dict[str, Any], messages: Any) -> str:
+    """Hash of the model, the generation parameters and the full message list."""
+    payload = json.dumps(
+        {'model': model, 'params': params, 'messages': messages},
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache of LLM responses in SQLite.
+
+    Entries expire after max_age; beyond max_bytes of responses the least recently
+    used ones are dropped. Hits and misses are counted for the run summary.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 max_age: float = LLM_CACHE_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # Several processes may share the file (crew_batch.py), so wait out their write locks
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self.trim()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.max_age)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET used_at = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses (key, model, response, size, created_at, used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, response, len(response.encode('utf-8')), now, now)
+            )
+            self._writes += 1
+            trim = self._writes % TRIM_EVERY == 0
+        if trim:
+            self.trim()
+
+    def trim(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from most recently used and keep entries while they fit the budget
+                kept, drop = 0, []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY used_at DESC"):
+                    if kept + size <= self.max_bytes:
+                        kept += size
+                    else:
+                        drop.append((key,))
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", drop)
+                removed += len(drop)
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+                'bytes': size,
+            }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (
+            f"LLM cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%} hit rate), "
+            f"{s['entries']} entries, {s['bytes'] / 1024 / 1024:.1f} MB"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Process-wide cache at LLM_CACHE_PATH."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
+
+
+class CachedLLM(LLM):
+    """
+    CrewAI LLM that answers repeated calls from an LLMCache.
+
+    The key covers the model, the generation parameters and the messages, so any
+    change to a prompt or setting is a miss. Calls that pass tools or functions to
+    execute are never cached, since the call itself has side effects.
+    """
+
+    def __init__(self, *args, cache: Optional[LLMCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache or get_llm_cache()
+
+    def call(self, messages, *args, **kwargs) -> str:
+        if kwargs.get('tools') or kwargs.get('available_functions'):
+            return super().call(messages, *args, **kwargs)
+
+        params = {name: getattr(self, name, None) for name in CACHE_PARAMS}
+        key = cache_key(self.model, params, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            emit('llm', name=getattr(self, 'agent', None) or self.model, model=self.model, cached=True,
+                 seconds=0.0, prompt_bytes=payload_size(messages), response_bytes=payload_size(cached))
+            return cached
+
+        response = super().call(messages, *args, **kwargs)
+        if isinstance(response, str) and response:
+            self.cache.put(key, self.model, response)
+        return response
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads are serialized
+    fcntl = None
+
+OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'outputs')
+OUTPUT_MAX_BYTES = int(float(os.getenv('OUTPUT_MAX_MB', 200)) * 1024 * 1024)
+OUTPUT_MAX_AGE = float(os.getenv('OUTPUT_MAX_AGE_DAYS', 30)) * 86400
+# Retention runs after this many writes, and whenever the store is opened
+RETENTION_EVERY = 50
+
+MANIFEST = 'manifest.jsonl'
+# Latest entry per name, rewritten with every write so listing doesn't scan the history
+LATEST_INDEX = 'latest.json'
+BLOBS = 'blobs'
+CHUNK_SIZE = 1 << 20
+
+
+def _file_mode() -> int:
+    """Mode for new files under the current umask, as open() would create them"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once: os.umask can only be read by setting it, which is not thread-safe
+FILE_MODE = _file_mode()
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputStore:
+    """
+    Content-addressed store for generated outputs.
+
+    Each output is written once to blobs/<sha256[:2]>/<sha256>.<ext>; manifest.jsonl
+    records every (name, timestamp) → blob, latest.json the latest entry per name, and
+    <root>/<name>.<ext> is a link to the latest version of each name. Identical outputs share one blob. Writes are atomic
+    (temp file + rename). Retention drops versions older than max_age, then the oldest
+    superseded versions until the blobs fit in max_bytes; the latest version of each
+    name is only dropped once it is past max_age.
+    """
+
+    def __init__(self, root: str = OUTPUT_DIR, max_bytes: int = OUTPUT_MAX_BYTES,
+                 max_age: float = OUTPUT_MAX_AGE):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._writes = 0
+        os.makedirs(os.path.join(root, BLOBS), exist_ok=True)
+        self.apply_retention()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize manifest changes across threads and, where supported, processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _blob_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, BLOBS, digest[:2], f"{digest}.{ext}")
+
+    def _named_path(self, name: str, ext: str) -> str:
+        return os.path.join(self.root, f"{name}.{ext}")
+
+    def temp_path(self, ext: str) -> str:
+        """Path for a library to write an output to before put_file() stores it."""
+        fd, path = tempfile.mkstemp(suffix=f".{ext}", dir=self.root, prefix='.tmp-')
+        try:
+            # mkstemp creates files 0600; stored outputs get the usual permissions
+            if hasattr(os, 'fchmod'):
+                os.fchmod(fd, FILE_MODE)
+        finally:
+            os.close(fd)
+        return path
+
+    def partial_path(self, name: str, ext: str) -> str:
+        """
+        Visible <name>.partial.<ext> path for output written while it is generated;
+        put_file() stores it once complete, and it stays behind if generation fails.
+        """
+        return os.path.join(self.root, f"{name}.partial.{ext}")
+
+    def put(self, name: str, data: Union[str, bytes], ext: str) -> str:
+        """Store text or bytes as the latest version of name; returns its path."""
+        path = self.temp_path(ext)
+        with open(path, 'wb') as f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+        return self.put_file(name, path, ext)
+
+    def put_file(self, name: str, path: str, ext: str) -> str:
+        """Move a finished file into the store as the latest version of name; returns its path."""
+        digest = _hash_file(path)
+        blob = self._blob_path(digest, ext)
+        named = self._named_path(name, ext)
+        with self._locked():
+            if os.path.exists(blob):
+                os.remove(path)
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.replace(path, blob)
+            latest = self._read_latest()
+            current = latest.get(f"{name}.{ext}")
+            if current and current['blob'] == digest and self._same_content(named, blob):
+                # Identical re-run: the named file already holds this content, whichever process wrote it
+                return named
+            self._link(blob, named)
+            entry = {
+                'name': name,
+                'ext': ext,
+                'time': datetime.now().strftime("%Y%m%d_%H%M%S"),
+                'ts': time.time(),
+                'blob': digest,
+                'size': os.path.getsize(blob),
+            }
+            with open(os.path.join(self.root, MANIFEST), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            latest[f"{name}.{ext}"] = entry
+            self._write_latest(latest)
+            self._writes += 1
+        if self._writes % RETENTION_EVERY == 0:
+            self.apply_retention()
+        return named
+
+    def _link(self, blob: str, named: str) -> None:
+        """Point named at blob atomically: hard link where possible, else a copy."""
+        tmp = f"{named}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(blob, tmp)
+        except OSError:
+            shutil.copyfile(blob, tmp)
+        os.replace(tmp, named)
+
+    @staticmethod
+    def _same_content(named: str, blob: str) -> bool:
+        try:
+            return os.path.samefile(named, blob) or _hash_file(named) == _hash_file(blob)
+        except FileNotFoundError:
+            return False
+
+    def _read_latest(self) -> Dict[str, Dict]:
+        """The latest-entry index; rebuilt from the manifest if missing. Call under the lock."""
+        try:
+            with open(os.path.join(self.root, LATEST_INDEX), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {f"{e['name']}.{e['ext']}": e for e in self.entries()}
+
+    def _write_latest(self, latest: Dict[str, Dict]) -> None:
+        path = os.path.join(self.root, LATEST_INDEX)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(latest, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def entries(self, name: Optional[str] = None) -> List[Dict]:
+        """Manifest entries, oldest first, optionally for one name; reads the whole history."""
+        try:
+            with open(os.path.join(self.root, MANIFEST), 'r', encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        return [e for e in entries if name is None or e['name'] == name]
+
+    def latest(self) -> Dict[str, Dict]:
+        """Latest entry per name and extension, from the index rather than the manifest."""
+        try:
+            with open(os.path.join(self.root, LATEST_INDEX), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            with self._locked():
+                return self._read_latest()
+
+    def apply_retention(self) -> Dict[str, int]:
+        """Drop expired and over-budget versions and the blobs nobody references."""
+        with self._locked():
+            entries = self.entries()
+            now = time.time()
+            latest = {(e['name'], e['ext']): e for e in entries}
+            latest_ids = {id(e) for e in latest.values()}
+            keep = [e for e in entries if now - e['ts'] <= self.max_age]
+
+            # Oldest superseded versions go first until the unique blobs fit the budget
+            def blob_bytes(kept):
+                return sum({(e['blob'], e['ext']): e['size'] for e in kept}.values())
+
+            while blob_bytes(keep) > self.max_bytes:
+                superseded = [e for e in keep if id(e) not in latest_ids]
+                if not superseded:
+                    break
+                keep.remove(superseded[0])
+
+            referenced = {(e['blob'], e['ext']) for e in keep}
+            removed_blobs = 0
+            for e in entries:
+                key = (e['blob'], e['ext'])
+                path = self._blob_path(*key)
+                if key not in referenced and os.path.exists(path):
+                    os.remove(path)
+                    removed_blobs += 1
+                    try:
+                        os.rmdir(os.path.dirname(path))
+                    except OSError:
+                        pass
+
+            kept_names = {(e['name'], e['ext']) for e in keep}
+            for name, ext in latest:
+                if (name, ext) not in kept_names:
+                    try:
+                        os.remove(self._named_path(name, ext))
+                    except FileNotFoundError:
+                        pass
+
+            # Temp files left behind by interrupted writes
+            for entry in os.scandir(self.root):
+                if entry.name.startswith('.tmp-') and now - entry.stat().st_mtime > 3600:
+                    os.remove(entry.path)
+
+            self._write_latest({f"{e['name']}.{e['ext']}": e for e in keep})
+            if len(keep) != len(entries):
+                manifest = os.path.join(self.root, MANIFEST)
+                tmp = f"{manifest}.tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.writelines(json.dumps(e, ensure_ascii=False) + '\n' for e in keep)
+                os.replace(tmp, manifest)
+
+            return {'entries': len(keep), 'dropped': len(entries) - len(keep), 'blobs_removed': removed_blobs}
+
+
+_store: Optional[OutputStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> OutputStore:
+    """Process-wide store at OUTPUT_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OutputStore()
+        return _store
+
+
+def set_store(store: Optional[OutputStore]) -> None:
+    """Replace the process-wide store, e.g. to give each crew in a batch its own directory."""
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Groq's free tier allows 30 requests and 12,000 tokens per minute on llama-3.3-70b
+GROQ_RPM = float(os.getenv('GROQ_RPM', 30))
+GROQ_TPM = float(os.getenv('GROQ_TPM', 12000))
+RATE_LIMIT_RETRIES = int(os.getenv('RATE_LIMIT_RETRIES', 5))
+
+# Rough token count: about four characters per token for English and Turkish text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: refills at rate tokens per second up to capacity,
+    and acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float = GROQ_RPM) -> 'TokenBucket':
+        """Bucket allowing short bursts of a few requests within a per-minute budget."""
+        return cls(requests_per_minute / 60.0, capacity=max(1.0, min(requests_per_minute / 10.0, 5.0)))
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, waiting for the refill if needed; returns the seconds waited."""
+        # A request larger than the bucket waits for a full bucket rather than forever
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def consume(self, tokens: float) -> None:
+        """Take tokens without waiting, e.g. for usage only known after a call; may go negative."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+
+class LLMLimits:
+    """Requests-per-minute and tokens-per-minute buckets shared by every agent's LLM."""
+
+    def __init__(self, rpm: float = GROQ_RPM, tpm: float = GROQ_TPM):
+        self.requests = TokenBucket.per_minute(rpm)
+        self.tokens = TokenBucket(tpm / 60.0, capacity=tpm)
+
+    def acquire(self, prompt_tokens: int) -> float:
+        """Wait for a request slot and the prompt's tokens; returns the seconds waited."""
+        return self.requests.acquire() + self.tokens.acquire(prompt_tokens)
+
+    def consume(self, completion_tokens: int) -> None:
+        """Charge the completion, known only once the call returns."""
+        self.tokens.consume(completion_tokens)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether an API error is an HTTP 429 (Groq, OpenAI and LiteLLM errors carry status_code)."""
+    return getattr(error, 'status_code', None) == 429
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait, from the Retry-After header if present."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_backoff(fn: Callable[[], T], limiter: Optional[TokenBucket] = None,
+                      retries: int = RATE_LIMIT_RETRIES, base_delay: float = 2.0) -> T:
+    """
+    Call fn once the limiter allows it, retrying on HTTP 429 with exponential backoff
+    (or the server's Retry-After). Other errors, and the last 429, are raised.
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn()
+        except Exception as e:
+            if not is_rate_limited(e) or attempt == retries:
+                raise
+            time.sleep(retry_after(e) or min(base_delay * 2 ** attempt, 60.0))
@@ -0,0 +1,167 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH', os.path.join('.cache', 'search_index.sqlite3'))
+# Share of a query's distinct words a stored result must contain to count as a match
+SEARCH_INDEX_MIN_MATCH = float(os.getenv('SEARCH_INDEX_MIN_MATCH', 0.75))
+# Older results are never served, and are pruned when the index is opened
+SEARCH_INDEX_MAX_AGE = float(os.getenv('SEARCH_INDEX_MAX_AGE', 7 * 86400))
+# Candidates fetched per requested result before the coverage filter
+_CANDIDATES_PER_RESULT = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    query TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_fetched_at ON results(fetched_at);
+"""
+
+# External-content FTS5 table kept in sync with results by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5(
+    title, snippet, query, content='results', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS results_ai AFTER INSERT ON results BEGIN
+    INSERT INTO results_fts(rowid, title, snippet, query) VALUES (new.id, new.title, new.snippet, new.query);
+END;
+CREATE TRIGGER IF NOT EXISTS results_ad AFTER DELETE ON results BEGIN
+    INSERT INTO results_fts(results_fts, rowid, title, snippet, query)
+    VALUES ('delete', old.id, old.title, old.snippet, old.query);
+END;
+CREATE TRIGGER IF NOT EXISTS results_au AFTER UPDATE ON results BEGIN
+    INSERT INTO results_fts(results_fts, rowid, title, snippet, query)
+    VALUES ('delete', old.id, old.title, old.snippet, old.query);
+    INSERT INTO results_fts(rowid, title, snippet, query) VALUES (new.id, new.title, new.snippet, new.query);
+END;
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _coverage(tokens: List[str], row) -> int:
+    """How many of the query's distinct words appear in a stored result"""
+    words = set(_TOKEN.findall(f"{row['title']} {row['snippet']} {row['query']}".lower()))
+    return sum(1 for t in tokens if t in words)
+
+
+class SearchIndex:
+    """
+    Local full-text index of web search results.
+
+    Results are stored once per link, tagged with the query that found them and
+    when. Lookups rank with BM25 through SQLite FTS5, or fall back to LIKE
+    matching when the SQLite build has no FTS5. Either way a result only counts
+    when it contains at least min_match of the query's distinct words, so one
+    shared common word ("2025", "salary") is not a hit. Results older than
+    max_age are deleted when the index is opened (max_age=None keeps them).
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH, max_age: Optional[float] = SEARCH_INDEX_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        # Several processes may share the file (crew_batch.py), so wait out their write locks
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        if max_age:
+            self.prune(max_age)
+
+    def add(self, query: str, items: List[Dict], fetched_at: Optional[float] = None) -> int:
+        """Store search results, replacing older entries for the same link."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [
+            (item['link'], item.get('title', ''), item.get('snippet', ''), query, fetched_at)
+            for item in items if item.get('link')
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO results (link, title, snippet, query, fetched_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    title = excluded.title, snippet = excluded.snippet,
+                    query = excluded.query, fetched_at = excluded.fetched_at
+                """,
+                rows
+            )
+        return len(rows)
+
+    def search(self, query: str, limit: int = 10, max_age: Optional[float] = None,
+               min_match: float = SEARCH_INDEX_MIN_MATCH) -> List[Dict]:
+        """Best matches for a query, most relevant first."""
+        tokens = list(dict.fromkeys(t.lower() for t in _TOKEN.findall(query)))
+        if not tokens:
+            return []
+        since = time.time() - max_age if max_age else 0.0
+        candidates = limit * _CANDIDATES_PER_RESULT
+        with self._lock:
+            if self.fts:
+                match = " OR ".join(f'"{t}"' for t in tokens)
+                rows = self._conn.execute(
+                    """
+                    SELECT r.title, r.link, r.snippet, r.query, r.fetched_at, bm25(results_fts) AS score
+                    FROM results_fts JOIN results r ON r.id = results_fts.rowid
+                    WHERE results_fts MATCH ? AND r.fetched_at >= ?
+                    ORDER BY score LIMIT ?
+                    """,
+                    (match, since, candidates)
+                ).fetchall()
+            else:
+                matched = " + ".join(["((title || ' ' || snippet || ' ' || query) LIKE ?)"] * len(tokens))
+                rows = self._conn.execute(
+                    f"""
+                    SELECT title, link, snippet, query, fetched_at, -({matched}) AS score
+                    FROM results WHERE fetched_at >= ? AND score < 0
+                    ORDER BY score, fetched_at DESC LIMIT ?
+                    """,
+                    [f"%{t}%" for t in tokens] + [since, candidates]
+                ).fetchall()
+        needed = min_match * len(tokens)
+        results = [dict(row) for row in rows if _coverage(tokens, row) >= needed]
+        return results[:limit]
+
+    def prune(self, max_age: float) -> int:
+        """Delete results older than max_age seconds."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM results WHERE fetched_at < ?", (time.time() - max_age,)
+            ).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    """Process-wide index at SEARCH_INDEX_PATH."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+        return _index
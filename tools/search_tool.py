@@ -1,55 +1,216 @@
 from crewai.tools import tool
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+import hashlib
+import json
 import os
+import re
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from .output_store import get_store
+from .search_index import SEARCH_INDEX_MAX_AGE, get_index
+from .telemetry import traced_tool
+
+SERPER_URL = "https://google.serper.dev/search"
+SEARCH_RESULTS = 10
+SEARCH_TIMEOUT = float(os.getenv('SEARCH_TIMEOUT', 10))
+SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', 8))
+SEARCH_CACHE_DIR = os.getenv('SEARCH_CACHE_DIR', os.path.join('.cache', 'search'))
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', 86400))
+# Local-first search answers from the index when it has this many fresh matches
+SEARCH_INDEX_MIN_HITS = int(os.getenv('SEARCH_INDEX_MIN_HITS', 3))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_stats = {'network': 0, 'cache_hits': 0, 'index_hits': 0}
+_stats_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Shared session so queries reuse pooled keep-alive connections to Serper."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=SEARCH_WORKERS))
+        return _session
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def search_stats() -> Dict[str, int]:
+    """Network calls and cache hits since the process started."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as the cache key."""
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+def _cache_path(query: str) -> str:
+    key = hashlib.sha256(f"{normalize_query(query)}|{SEARCH_RESULTS}".encode('utf-8')).hexdigest()
+    return os.path.join(SEARCH_CACHE_DIR, f"{key}.json")
+
+
+def _read_cache(query: str) -> Optional[List[Dict]]:
+    path = _cache_path(query)
+    try:
+        if time.time() - os.path.getmtime(path) > SEARCH_CACHE_TTL:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(query: str, items: List[Dict]) -> None:
+    path = _cache_path(query)
+    try:
+        os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def fetch_results(query: str, api_key: str) -> List[Dict]:
+    """Organic Serper results for a query, served from the on-disk cache when fresh."""
+    items = _read_cache(query)
+    if items is not None:
+        _count('cache_hits')
+        return items
+
+    _count('network')
+    response = _get_session().post(
+        SERPER_URL,
+        json={"q": query, "num": SEARCH_RESULTS},
+        headers={'X-API-KEY': api_key, 'Content-Type': 'application/json'},
+        timeout=SEARCH_TIMEOUT
+    )
+    response.raise_for_status()
+    items = response.json().get('organic', [])[:SEARCH_RESULTS]
+    _write_cache(query, items)
+    try:
+        get_index().add(query, items)
+    except Exception:
+        pass
+    return items
+
+
+def _format(items: List[Dict]) -> str:
+    formatted = [
+        f"Title: {item.get('title', 'N/A')}\n"
+        f"Link: {item.get('link', 'N/A')}\n"
+        f"Snippet: {item.get('snippet', 'N/A')}\n"
+        for item in items
+    ]
+    return "\n---\n".join(formatted) if formatted else "No results found"
+
+
+def _url_key(url: str) -> str:
+    """URL with host case, fragment and trailing slash ignored, for deduplication."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), parts.query, ''))
+
+
+def search_many(queries: List[str]) -> List[Dict]:
+    """
+    Run several queries concurrently and merge their results, dropping repeated URLs.
+
+    Queries that normalize to the same text are sent once; a failed query is skipped.
+    """
+    api_key = os.getenv('SERPER_API_KEY')
+    unique = list({normalize_query(q): q for q in queries if q.strip()}.values())
+    if not api_key or not unique:
+        return []
+
+    def fetch(query: str) -> List[Dict]:
+        try:
+            return fetch_results(query, api_key)
+        except Exception:
+            return []
+
+    with ThreadPoolExecutor(max_workers=min(SEARCH_WORKERS, len(unique))) as pool:
+        batches = list(pool.map(fetch, unique))
+
+    merged, seen = [], set()
+    for items in batches:
+        for item in items:
+            key = _url_key(item.get('link', ''))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+    return merged
 
 
 @tool("web_search")
+@traced_tool('search_web')
 def search_web(query: str) -> str:
     """Search the web using Serper API. Useful for finding LinkedIn profiles and research."""
     api_key = os.getenv('SERPER_API_KEY')
     if not api_key:
         return f"Searching for: {query}\n(Mock results - SERPER_API_KEY not configured)"
 
-    url = "https://google.serper.dev/search"
-    payload = {"q": query, "num": 10}
-    headers = {'X-API-KEY': api_key, 'Content-Type': 'application/json'}
+    try:
+        return _format(fetch_results(query, api_key))
+    except Exception as e:
+        return f"Error during search: {str(e)}"
+
+
+@tool("batch_web_search")
+@traced_tool('search_web_batch')
+def search_web_batch(queries: List[str]) -> str:
+    """Search the web for several queries at once using Serper API. Results are merged and duplicate links removed."""
+    if not os.getenv('SERPER_API_KEY'):
+        return f"Searching for: {'; '.join(queries)}\n(Mock results - SERPER_API_KEY not configured)"
+
+    return _format(search_many(queries))
 
+
+@tool("indexed_search")
+@traced_tool('search_indexed')
+def search_indexed(query: str) -> str:
+    """Search previously collected web results first, falling back to a live web search when they don't cover the query."""
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        results = response.json()
-        
-        formatted = []
-        if 'organic' in results:
-            for item in results['organic'][:10]:
-                formatted.append(
-                    f"Title: {item.get('title', 'N/A')}\n"
-                    f"Link: {item.get('link', 'N/A')}\n"
-                    f"Snippet: {item.get('snippet', 'N/A')}\n"
-                )
-        
-        return "\n---\n".join(formatted) if formatted else "No results found"
-        
+        items = get_index().search(query, limit=SEARCH_RESULTS, max_age=SEARCH_INDEX_MAX_AGE)
+    except Exception:
+        items = []
+    if len(items) >= SEARCH_INDEX_MIN_HITS:
+        _count('index_hits')
+        return f"(From local search index)\n{_format(items)}"
+
+    api_key = os.getenv('SERPER_API_KEY')
+    if not api_key:
+        if items:
+            return f"(From local search index)\n{_format(items)}"
+        return f"Searching for: {query}\n(Mock results - SERPER_API_KEY not configured)"
+
+    try:
+        return _format(fetch_results(query, api_key))
     except Exception as e:
         return f"Error during search: {str(e)}"
 
 
 @tool("export_data")
+@traced_tool('export_data')
 def export_data(data: str, filename: str) -> str:
     """Export data to a file in the outputs directory."""
     try:
-        import os
-        from datetime import datetime
-        
-        os.makedirs('outputs', exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = filename.rsplit('.', 1)[0]
+        base_name = os.path.basename(filename).rsplit('.', 1)[0]
         ext = filename.rsplit('.', 1)[1] if '.' in filename else 'txt'
-        file_path = os.path.join('outputs', f"{base_name}_{timestamp}.{ext}")
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(data)
-            
+        file_path = get_store().put(base_name, data, ext)
+
         return f"Successfully exported to {file_path}"
         
     except Exception as e:
@@ -0,0 +1,116 @@
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .output_store import get_store
+
+GROQ_MODEL = 'llama-3.3-70b-versatile'
+
+
+def stream_chat(client, prompt: str, system: str, model: str = GROQ_MODEL,
+                temperature: float = 0.7, max_tokens: int = 4096) -> Iterator[str]:
+    """Text chunks of a Groq chat completion as they arrive."""
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    )
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Also runs when the consumer closes this generator early: drop the HTTP response
+        stream.close()
+
+
+def stream_to_store(chunks: Iterable[str], name: str, ext: str = 'md', header: str = '',
+                    echo: bool = True) -> Tuple[str, str]:
+    """
+    Print chunks as they arrive and append them to <name>.partial.<ext> after the
+    header, flushing each one; the finished file is stored as the latest version of
+    name. If the stream fails, the partial file keeps what was generated.
+    Returns the streamed text (without the header) and the stored path.
+    """
+    store = get_store()
+    path = store.partial_path(name, ext)
+    parts: List[str] = []
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for chunk in chunks:
+            parts.append(chunk)
+            f.write(chunk)
+            f.flush()
+            if echo:
+                print(chunk, end='', flush=True)
+    if echo:
+        print()
+    return ''.join(parts), store.put_file(name, path, ext)
+
+
+class BufferedStream:
+    """
+    A stream consumed in the background (run consume() on a worker) whose chunks can
+    be followed from the start at any time: buffered chunks first, then live ones.
+    cancel() stops consuming at the next chunk and closes the source.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = chunks
+        self._buffer: List[str] = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cancelled = threading.Event()
+        self._cond = threading.Condition()
+
+    def consume(self) -> None:
+        try:
+            for chunk in self._chunks:
+                if self._cancelled.is_set():
+                    break
+                with self._cond:
+                    self._buffer.append(chunk)
+                    self._cond.notify_all()
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+        finally:
+            # A generator can only be closed from the thread running it, so it is done here
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Stop consuming at the next chunk; followers see the stream end there."""
+        self._cancelled.set()
+        with self._cond:
+            self._done = True
+            self._cond.notify_all()
+
+    def done(self) -> bool:
+        with self._cond:
+            return self._done
+
+    def follow(self) -> Iterator[str]:
+        """All chunks from the start, waiting for new ones until the stream ends."""
+        seen = 0
+        while True:
+            with self._cond:
+                while seen == len(self._buffer) and not self._done:
+                    self._cond.wait()
+                new = self._buffer[seen:]
+                seen = len(self._buffer)
+                finished = self._done
+                error = self._error
+            yield from new
+            if finished and seen == len(self._buffer):
+                if error is not None:
+                    raise error
+                return
@@ -0,0 +1,249 @@
+"""
+Run telemetry as JSONL: one event per run, task, tool call and LLM call, with
+timestamps, durations, token counts and payload sizes.
+
+Summarize the slowest tasks and tools across runs with:
+    python -m tools.telemetry [--path FILE] [--runs N] [--top N]
+"""
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+_lock = threading.Lock()
+# Task running in this thread; tool and LLM events are tagged with it
+_local = threading.local()
+# The active run in this process; events are only recorded while one is active
+_run: Optional[Dict[str, Any]] = None
+
+
+def telemetry_path() -> str:
+    return os.getenv('TELEMETRY_PATH', os.path.join('.cache', 'telemetry.jsonl'))
+
+
+def telemetry_max_bytes() -> int:
+    return int(float(os.getenv('TELEMETRY_MAX_MB', 20)) * 1024 * 1024)
+
+
+def rotate(path: str, max_bytes: int) -> bool:
+    """
+    Move path to path.1, replacing the previous one, once it is larger than max_bytes,
+    so telemetry keeps at most about twice that. Writers open the file per event, so
+    another process still recording simply starts the new file.
+    """
+    try:
+        if max_bytes <= 0 or os.path.getsize(path) <= max_bytes:
+            return False
+        os.replace(path, path + '.1')
+    except FileNotFoundError:
+        return False  # not written yet, or rotated by another process
+    return True
+
+
+def payload_size(value: Any) -> int:
+    """Size in bytes of a value as the model or tool sees it."""
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str, ensure_ascii=False)
+    return len(value.encode('utf-8'))
+
+
+def _write(event: Dict[str, Any]) -> None:
+    path = _run['path']
+    line = (json.dumps(event, default=str, ensure_ascii=False) + '\n').encode('utf-8')
+    # One O_APPEND write per event keeps lines whole across threads and processes
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def emit(kind: str, **fields) -> None:
+    """Record an event for the active run; a no-op when no run is active."""
+    with _lock:
+        if _run is None:
+            return
+        event = {'run': _run['id'], 'type': kind, 'ts': time.time(), 'pid': os.getpid()}
+        task = getattr(_local, 'task', None)
+        if task and kind != 'task':
+            event['task'] = task
+        event.update(fields)
+        _write(event)
+
+
+def start_run(run_id: Optional[str] = None, **meta) -> Optional[str]:
+    """
+    Start recording to TELEMETRY_PATH unless TELEMETRY=0; returns the run id. The file
+    is rotated first if it has grown past TELEMETRY_MAX_MB.
+    """
+    global _run
+    if os.getenv('TELEMETRY', '1').lower() in ('0', 'false', 'no'):
+        return None
+    path = telemetry_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    rotate(path, telemetry_max_bytes())
+    run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+    with _lock:
+        _run = {'id': run_id, 'path': path, 'start': time.time()}
+    emit('run_start', **meta)
+    return run_id
+
+
+def end_run(status: str = 'ok', **fields) -> None:
+    global _run
+    if _run is None:
+        return
+    end = time.time()
+    emit('run_end', status=status, start=_run['start'], end=end, seconds=end - _run['start'], **fields)
+    with _lock:
+        _run = None
+
+
+@contextmanager
+def span(kind: str, name: str, **fields) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block and emit one event for it when it ends; fields added to the
+    yielded dict are recorded too. Errors are recorded and re-raised. Events
+    emitted inside a 'task' span in the same thread are tagged with its name.
+    """
+    event = dict(fields)
+    outer = getattr(_local, 'task', None)
+    if kind == 'task':
+        _local.task = name
+    start = time.time()
+    try:
+        yield event
+        event.setdefault('status', 'ok')
+    except BaseException as e:
+        event['status'] = 'error'
+        event['error'] = type(e).__name__
+        raise
+    finally:
+        end = time.time()
+        _local.task = outer
+        emit(kind, name=name, start=start, end=end, seconds=end - start, **event)
+
+
+def traced_tool(name: str, method: bool = False):
+    """
+    Record each call of a tool function with its latency and input/output sizes;
+    pass method=True for a tool class's _run so self isn't counted as input.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            inputs = [args[1:] if method else args, kwargs]
+            with span('tool', name, input_bytes=payload_size(inputs)) as event:
+                result = fn(*args, **kwargs)
+                event['output_bytes'] = payload_size(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def load_events(path: str) -> List[Dict[str, Any]]:
+    """Events in path, preceded by those in its rotated path.1 if there is one."""
+    events = []
+    paths = [p for p in (path + '.1', path) if os.path.exists(p)] or [path]
+    for p in paths:
+        with open(p, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash
+    return events
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def _grouped(events: List[Dict[str, Any]], kind: str) -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        if event['type'] == kind:
+            groups.setdefault(event.get('name') or event.get('agent') or '?', []).append(event)
+    return groups
+
+
+def summarize(events: List[Dict[str, Any]], top: int = 10) -> str:
+    """Slowest tasks and tools by total time, plus LLM call times per agent."""
+    runs = [e for e in events if e['type'] == 'run_end']
+    lines = [f"Runs: {len(runs)} finished"
+             + (f", mean wall clock {sum(e['seconds'] for e in runs) / len(runs):.1f}s" if runs else "")]
+
+    lines.append(f"\nSlowest tasks\n{'task':<26}{'runs':>6}{'total s':>10}{'mean s':>9}{'p95 s':>8}"
+                 f"{'max s':>8}{'~tokens':>10}{'reused':>8}{'errors':>8}")
+    tasks = _grouped(events, 'task')
+    for name, group in sorted(tasks.items(), key=lambda kv: -sum(e['seconds'] for e in kv[1]))[:top]:
+        seconds = [e['seconds'] for e in group]
+        tokens = [e.get('prompt_tokens', 0) + e.get('completion_tokens', 0) for e in group]
+        lines.append(
+            f"{name[:25]:<26}{len(group):>6}{sum(seconds):>10.1f}{sum(seconds) / len(group):>9.1f}"
+            f"{_percentile(seconds, 0.95):>8.1f}{max(seconds):>8.1f}{sum(tokens) // len(group):>10,}"
+            f"{sum(1 for e in group if e.get('checkpointed')):>8}"
+            f"{sum(1 for e in group if e.get('status') == 'error'):>8}"
+        )
+
+    lines.append(f"\nSlowest tools\n{'tool':<26}{'calls':>6}{'total s':>10}{'mean s':>9}{'p95 s':>8}"
+                 f"{'max s':>8}{'in B':>9}{'out B':>9}{'errors':>8}")
+    tools = _grouped(events, 'tool')
+    for name, group in sorted(tools.items(), key=lambda kv: -sum(e['seconds'] for e in kv[1]))[:top]:
+        seconds = [e['seconds'] for e in group]
+        lines.append(
+            f"{name[:25]:<26}{len(group):>6}{sum(seconds):>10.1f}{sum(seconds) / len(group):>9.2f}"
+            f"{_percentile(seconds, 0.95):>8.2f}{max(seconds):>8.2f}"
+            f"{sum(e.get('input_bytes', 0) for e in group) // len(group):>9,}"
+            f"{sum(e.get('output_bytes', 0) for e in group) // len(group):>9,}"
+            f"{sum(1 for e in group if e.get('status') == 'error'):>8}"
+        )
+
+    lines.append(f"\nLLM calls\n{'agent':<26}{'calls':>6}{'total s':>10}{'mean s':>9}{'p95 s':>8}"
+                 f"{'cached':>8}{'waited s':>10}")
+    for agent, group in sorted(_grouped(events, 'llm').items(), key=lambda kv: -sum(e['seconds'] for e in kv[1])):
+        seconds = [e['seconds'] for e in group]
+        lines.append(
+            f"{agent[:25]:<26}{len(group):>6}{sum(seconds):>10.1f}{sum(seconds) / len(group):>9.1f}"
+            f"{_percentile(seconds, 0.95):>8.1f}{sum(1 for e in group if e.get('cached')):>8}"
+            f"{sum(e.get('waited', 0) for e in group):>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize crew run telemetry: slowest tasks, tools and LLM calls")
+    parser.add_argument('--path', default=telemetry_path(), help="telemetry JSONL file (default: $TELEMETRY_PATH)")
+    parser.add_argument('--runs', type=int, help="only the most recent N runs")
+    parser.add_argument('--top', type=int, default=10, help="rows per table")
+    parser.add_argument('--json', action='store_true', help="print the selected events as JSONL instead")
+    args = parser.parse_args(argv)
+
+    try:
+        events = load_events(args.path)
+    except FileNotFoundError:
+        print(f"No telemetry at {args.path} yet; run main.py or crew_batch.py first")
+        return
+    if args.runs:
+        order = list(dict.fromkeys(e['run'] for e in events))
+        keep = set(order[-args.runs:])
+        events = [e for e in events if e['run'] in keep]
+    if args.json:
+        for event in events:
+            print(json.dumps(event, ensure_ascii=False))
+    else:
+        print(summarize(events, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Benchmarks for Guindo Backend
+Run from web/backend, e.g. `python -m benchmarks.prompt_render`
+"""
+
+import json
+import os
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bundled UserProfile payloads: a fully filled-in profile and a student with mostly defaults
+PROFILES = {
+    "sample": os.path.join(BENCHMARKS_DIR, "sample_profile.json"),
+    "sparse": os.path.join(BENCHMARKS_DIR, "sparse_profile.json"),
+}
+
+
+def load_sample_profile(name: str = "sample") -> dict:
+    """Load a bundled profile by name, or any UserProfile JSON file by path"""
+    path = PROFILES.get(name, name)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,77 @@
+"""
+analyze-all DAG simulation
+Replays analyze-all with each analysis taking its estimated generation time and reports
+fan-out (sequential) vs DAG wall-clock time and the critical path
+
+Usage: python -m benchmarks.analysis_dag [--profile sample|sparse|PATH] [--decode-tps N]
+                                         [--prefill-tps N] [--scale S] [--json]
+
+Durations are prefill + decode of each prompt's full line budget, including the upstream
+summaries dependent analyses receive; --scale shrinks the sleeps (0.01 = 1 s -> 10 ms).
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks import load_sample_profile
+from combined import ANALYSIS_TYPES
+from dag import DEPENDENCIES, SUMMARY_MAX_LINES, DagRun
+from prompts import PROMPT_VERSION, render_prompt
+from routing import TOKENS_PER_LINE
+from tokens import estimate_tokens
+
+
+def estimate_seconds(analysis_type: str, profile: dict, prefill_tps: float, decode_tps: float) -> float:
+    """Prefill + full-budget decode time, with placeholder upstream summaries"""
+    placeholder = "\n".join("- ..." for _ in range(SUMMARY_MAX_LINES))
+    upstream = {name: placeholder for name in DEPENDENCIES.get(analysis_type, {})} or None
+    rendered = render_prompt(analysis_type, profile, upstream=upstream)
+    prompt_tokens = estimate_tokens(rendered.system) + estimate_tokens(rendered.prompt)
+    return prompt_tokens / prefill_tps + (rendered.max_lines or 0) * TOKENS_PER_LINE / decode_tps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", default="sample", help="sample, sparse or a profile JSON path")
+    parser.add_argument("--prefill-tps", type=float, default=1500.0, help="prompt tokens processed per second")
+    parser.add_argument("--decode-tps", type=float, default=250.0, help="output tokens generated per second")
+    parser.add_argument("--scale", type=float, default=0.01, help="sleep this fraction of each estimate")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    profile = load_sample_profile(args.profile)
+    seconds = {t: estimate_seconds(t, profile, args.prefill_tps, args.decode_tps) for t in ANALYSIS_TYPES}
+
+    def node(analysis_type: str):
+        def run(upstream):
+            time.sleep(seconds[analysis_type] * args.scale)
+            return analysis_type
+        return tuple(DEPENDENCIES.get(analysis_type, {})), run
+
+    dag = DagRun({t: node(t) for t in ANALYSIS_TYPES})
+    list(dag.run())
+    trace = dag.trace()
+    report = {
+        "prompt_version": PROMPT_VERSION,
+        "estimated_s": {t: round(s, 1) for t, s in seconds.items()},
+        "fanout_s": round(sum(seconds.values()), 1),
+        "dag_s": round(trace["wall_ms"] / 1000 / args.scale, 1),
+        "critical_path": trace["critical_path"],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION} (prefill {args.prefill_tps:.0f} tok/s, decode {args.decode_tps:.0f} tok/s)")
+    for analysis_type, s in report["estimated_s"].items():
+        deps = ", ".join(DEPENDENCIES.get(analysis_type, {})) or "-"
+        print(f"  {analysis_type:<20}{s:>6} s   after: {deps}")
+    print(f"Fan-out (sequential): {report['fanout_s']} s")
+    print(f"DAG:                  {report['dag_s']} s")
+    print(f"Critical path:        {' -> '.join(report['critical_path'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Cache hit-rate simulation
+Replays a synthetic request stream through analysis and shared-section caches of several sizes
+
+Usage: python -m benchmarks.cache_hit_rate [--corpus PATH | --users N] [--requests N]
+                                           [--zipf S] [--edit-rate F] [--sizes 64,256,...] [--json]
+
+Users are drawn from the corpus with Zipf-distributed popularity (a few users come back
+often), each request asks for one analysis type, and with --edit-rate the user has
+changed a money field since their last request. Keys are the ones generate_analysis
+uses, so the hit rates are what the backend's LRU caches would see without expiry.
+"""
+
+import argparse
+import json
+import random
+from itertools import accumulate
+from typing import Dict, List
+
+from benchmarks.synthetic import generate_profiles, load_corpus
+from cache import TTLCache
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+from shared import render_shared
+
+
+def request_stream(profiles: List[dict], requests: int, zipf: float, edit_rate: float, seed: int = 7):
+    """(analysis type, profile) pairs"""
+    rng = random.Random(seed)
+    weights = list(accumulate(1.0 / (rank + 1) ** zipf for rank in range(len(profiles))))
+    types = list(TEMPLATES)
+    edits: Dict[int, int] = {}
+    for _ in range(requests):
+        user = rng.choices(range(len(profiles)), cum_weights=weights)[0]
+        if rng.random() < edit_rate:
+            edits[user] = edits.get(user, 0) + 1
+        profile = profiles[user]
+        if edits.get(user):
+            profile = dict(profile, monthly_expenses=str(1000 + 50 * edits[user]))
+        yield rng.choice(types), profile
+
+
+def simulate(stream: list, size: int) -> dict:
+    """Hit rates of an analysis cache and a shared-section cache of the given size"""
+    analysis_cache = TTLCache(maxsize=size, ttl=float("inf"))
+    shared_cache = TTLCache(maxsize=size, ttl=float("inf"))
+    for analysis_type, rendered, industry in stream:
+        if analysis_cache.get(rendered.cache_key) is None:
+            analysis_cache.set(rendered.cache_key, True)
+            for heading in rendered.shared:
+                key = render_shared(analysis_type, heading, industry).cache_key
+                if shared_cache.get(key) is None:
+                    shared_cache.set(key, True)
+
+    def rate(cache):
+        stats = cache.stats()
+        total = stats["hits"] + stats["misses"]
+        return round(100.0 * stats["hits"] / total, 1) if total else 0.0
+
+    return {"size": size, "analysis_hit_pct": rate(analysis_cache), "shared_hit_pct": rate(shared_cache),
+            "shared_lookups": shared_cache.hits + shared_cache.misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="JSONL corpus from benchmarks.synthetic (default: generate --users)")
+    parser.add_argument("--users", type=int, default=2000, help="profiles to use")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="user popularity skew")
+    parser.add_argument("--edit-rate", type=float, default=0.05, help="chance a request follows a profile edit")
+    parser.add_argument("--sizes", default="64,256,1024,4096", help="cache sizes to simulate")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    profiles = load_corpus(args.corpus, args.users) if args.corpus else list(generate_profiles(args.users))
+    # Render each request once; every cache size replays the same keys
+    stream = [
+        (analysis_type, render_prompt(analysis_type, profile), profile.get("primary_industry"))
+        for analysis_type, profile in request_stream(profiles, args.requests, args.zipf, args.edit_rate)
+    ]
+    rows = [simulate(stream, int(size)) for size in args.sizes.split(",")]
+
+    report = {"prompt_version": PROMPT_VERSION, "users": len(profiles), "requests": args.requests,
+              "zipf": args.zipf, "edit_rate": args.edit_rate, "rows": rows}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION} ({len(profiles)} users, {args.requests} requests, "
+          f"zipf {args.zipf}, edit rate {args.edit_rate})")
+    print(f"{'cache size':>10}{'analysis hit %':>16}{'shared hit %':>14}")
+    for r in rows:
+        print(f"{r['size']:>10}{r['analysis_hit_pct']:>16}{r['shared_hit_pct']:>14}")
+
+
+if __name__ == "__main__":
+    main()
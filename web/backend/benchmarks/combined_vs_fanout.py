@@ -0,0 +1,138 @@
+"""
+Combined vs fan-out analyze-all
+Compares prompt tokens, output budget and (with --live) latency of five single-analysis
+requests against one combined request
+
+Usage: python -m benchmarks.combined_vs_fanout [--profile sample|sparse|PATH] [--json]
+                                               [--live] [--runs N]
+
+--live calls the Groq API (GROQ_API_KEY) with the routed primary models and reports
+wall-clock latency and the token usage the API returns. Fan-out requests run
+sequentially, as /api/analyze-all does.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from benchmarks import load_sample_profile
+from combined import ANALYSIS_TYPES, render_combined, split_sections
+from prompts import PROMPT_VERSION, render_prompt
+from routing import get_route, max_tokens_for
+from tokens import estimate_tokens
+
+
+def _prompt_tokens(rendered) -> int:
+    return estimate_tokens(rendered.system) + estimate_tokens(rendered.prompt)
+
+
+def _max_tokens(analysis_type: str, rendered) -> int:
+    return max_tokens_for(rendered.max_lines, get_route(analysis_type).max_tokens_cap)
+
+
+def measure_static(profile: dict) -> dict:
+    """Estimated prompt tokens and output budget for both modes"""
+    fanout = [render_prompt(t, profile) for t in ANALYSIS_TYPES]
+    combined = render_combined(profile)
+    fanout_tokens = sum(_prompt_tokens(r) for r in fanout)
+    combined_tokens = _prompt_tokens(combined)
+    return {
+        "fanout": {
+            "requests": len(fanout),
+            "prompt_tokens": fanout_tokens,
+            "max_tokens": sum(_max_tokens(r.analysis_type, r) for r in fanout),
+        },
+        "combined": {
+            "requests": 1,
+            "prompt_tokens": combined_tokens,
+            "max_tokens": _max_tokens("combined", combined),
+        },
+        "saved_prompt_tokens": fanout_tokens - combined_tokens,
+        "saved_pct": round(100.0 * (fanout_tokens - combined_tokens) / fanout_tokens, 1),
+    }
+
+
+def _complete(client, analysis_type: str, rendered) -> dict:
+    route = get_route(analysis_type)
+    start = time.perf_counter()
+    response = client.chat.completions.create(
+        model=route.model,
+        messages=[
+            {"role": "system", "content": rendered.system},
+            {"role": "user", "content": rendered.prompt},
+        ],
+        temperature=route.temperature,
+        max_tokens=_max_tokens(analysis_type, rendered),
+    )
+    return {
+        "latency_s": time.perf_counter() - start,
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens,
+        "content": response.choices[0].message.content or "",
+    }
+
+
+def measure_live(profile: dict, runs: int) -> dict:
+    """Wall-clock latency and reported usage for both modes, averaged over runs"""
+    from groq import Groq
+
+    client = Groq(api_key=os.environ["GROQ_API_KEY"])
+    totals = {mode: {"latency_s": 0.0, "prompt_tokens": 0, "completion_tokens": 0} for mode in ("fanout", "combined")}
+    sections_found = 0
+
+    for _ in range(runs):
+        for analysis_type in ANALYSIS_TYPES:
+            result = _complete(client, analysis_type, render_prompt(analysis_type, profile))
+            for key in totals["fanout"]:
+                totals["fanout"][key] += result[key]
+
+        result = _complete(client, "combined", render_combined(profile))
+        for key in totals["combined"]:
+            totals["combined"][key] += result[key]
+        sections_found += len(split_sections(result["content"]))
+
+    report = {mode: {key: round(value / runs, 2) for key, value in stats.items()} for mode, stats in totals.items()}
+    report["combined"]["sections_found"] = round(sections_found / runs, 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", action="append", help="sample, sparse or a profile JSON path (repeatable)")
+    parser.add_argument("--live", action="store_true", help="call the Groq API and measure latency")
+    parser.add_argument("--runs", type=int, default=1, help="live runs to average")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {"prompt_version": PROMPT_VERSION, "profiles": {}}
+    for name in args.profile or ["sample", "sparse"]:
+        profile = load_sample_profile(name)
+        report["profiles"][name] = {"static": measure_static(profile)}
+        if args.live:
+            report["profiles"][name]["live"] = measure_live(profile, args.runs)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION}")
+    for name, result in report["profiles"].items():
+        static = result["static"]
+        print(f"\nProfile: {name}")
+        print(f"{'mode':<10}{'requests':>9}{'prompt tok':>12}{'max_tokens':>12}")
+        for mode in ("fanout", "combined"):
+            row = static[mode]
+            print(f"{mode:<10}{row['requests']:>9}{row['prompt_tokens']:>12}{row['max_tokens']:>12}")
+        print(f"Prompt tokens saved: {static['saved_prompt_tokens']} ({static['saved_pct']}%)")
+        if "live" in result:
+            live = result["live"]
+            print(f"{'live':<10}{'latency s':>10}{'prompt':>9}{'completion':>12}")
+            for mode in ("fanout", "combined"):
+                row = live[mode]
+                print(f"{mode:<10}{row['latency_s']:>10}{row['prompt_tokens']:>9}{row['completion_tokens']:>12}")
+            print(f"Combined sections found: {live['combined']['sections_found']}/{len(ANALYSIS_TYPES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Skeleton-then-expand vs single-call generation
+Estimates wall-clock time and token cost of both modes for each expandable analysis
+
+Usage: python -m benchmarks.expansion [--profile sample|sparse|PATH] [--json]
+                                      [--prefill-tps N] [--decode-tps N] [--skeleton-decode-tps N]
+                                      [--workers N] [--live] [--runs N]
+
+The estimate assumes every call uses its full line budget: single-call time is
+prefill + decode of the whole document; expanded time is the skeleton call (on the
+fast model) plus the slowest call of each wave of concurrent section calls.
+--live calls the Groq API (GROQ_API_KEY) with the routed models and reports measured
+wall-clock time and usage tokens.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import load_sample_profile
+from expansion import EXPANDABLE, EXPANSION_WORKERS, plan_expansion
+from prompts import PROMPT_VERSION, render_prompt
+from routing import TOKENS_PER_LINE, get_route, max_tokens_for
+from tokens import estimate_tokens
+
+
+def _call_seconds(rendered, prefill_tps: float, decode_tps: float) -> float:
+    prompt_tokens = estimate_tokens(rendered.system) + estimate_tokens(rendered.prompt)
+    return prompt_tokens / prefill_tps + (rendered.max_lines or 0) * TOKENS_PER_LINE / decode_tps
+
+
+def _prompt_tokens(prompts) -> int:
+    return sum(estimate_tokens(r.system) + estimate_tokens(r.prompt) for r in prompts)
+
+
+def measure_static(analysis_type: str, profile: dict, prefill_tps: float, decode_tps: float,
+                   skeleton_decode_tps: float, workers: int) -> dict:
+    """Estimated wall-clock seconds and prompt tokens for both modes"""
+    single = render_prompt(analysis_type, profile)
+    plan = plan_expansion(analysis_type, profile)
+    # Outline placeholder of the size the skeleton call is allowed to write
+    outline = "\n".join("- ..." for _ in range(plan.skeleton.max_lines))
+    sections = plan.expansion_prompts(outline)
+
+    section_seconds = sorted((_call_seconds(r, prefill_tps, decode_tps) for r in sections), reverse=True)
+    waves = [section_seconds[i] for i in range(0, len(section_seconds), workers)]
+    single_s = _call_seconds(single, prefill_tps, decode_tps)
+    expanded_s = _call_seconds(plan.skeleton, prefill_tps, skeleton_decode_tps) + sum(waves)
+    return {
+        "type": analysis_type,
+        "sections": len(sections),
+        "single_s": round(single_s, 1),
+        "expanded_s": round(expanded_s, 1),
+        "speedup": round(single_s / expanded_s, 2),
+        "single_prompt_tokens": _prompt_tokens([single]),
+        "expanded_prompt_tokens": _prompt_tokens([plan.skeleton] + sections),
+    }
+
+
+def _complete(client, route_name: str, rendered) -> dict:
+    route = get_route(route_name)
+    start = time.perf_counter()
+    response = client.chat.completions.create(
+        model=route.model,
+        messages=[
+            {"role": "system", "content": rendered.system},
+            {"role": "user", "content": rendered.prompt},
+        ],
+        temperature=route.temperature,
+        max_tokens=max_tokens_for(rendered.max_lines, route.max_tokens_cap),
+    )
+    return {
+        "seconds": time.perf_counter() - start,
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens,
+        "content": response.choices[0].message.content or "",
+    }
+
+
+def measure_live(analysis_type: str, profile: dict, workers: int, runs: int) -> dict:
+    """Measured wall-clock seconds and usage tokens for both modes, averaged over runs"""
+    from groq import Groq
+
+    client = Groq(api_key=os.environ["GROQ_API_KEY"])
+    totals = {mode: {"seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0} for mode in ("single", "expanded")}
+
+    for _ in range(runs):
+        result = _complete(client, analysis_type, render_prompt(analysis_type, profile))
+        for key in totals["single"]:
+            totals["single"][key] += result[key]
+
+        start = time.perf_counter()
+        plan = plan_expansion(analysis_type, profile)
+        skeleton = _complete(client, "skeleton", plan.skeleton)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            sections = list(pool.map(
+                lambda rendered: _complete(client, analysis_type, rendered),
+                plan.expansion_prompts(skeleton["content"])
+            ))
+        totals["expanded"]["seconds"] += time.perf_counter() - start
+        for key in ("prompt_tokens", "completion_tokens"):
+            totals["expanded"][key] += skeleton[key] + sum(s[key] for s in sections)
+
+    report = {mode: {key: round(value / runs, 2) for key, value in stats.items()} for mode, stats in totals.items()}
+    report["speedup"] = round(report["single"]["seconds"] / report["expanded"]["seconds"], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", action="append", help="sample, sparse or a profile JSON path (repeatable)")
+    parser.add_argument("--prefill-tps", type=float, default=1500.0, help="prompt tokens processed per second")
+    parser.add_argument("--decode-tps", type=float, default=250.0, help="output tokens generated per second")
+    parser.add_argument("--skeleton-decode-tps", type=float, default=750.0,
+                        help="output tokens per second of the skeleton route's (fast) model")
+    parser.add_argument("--workers", type=int, default=EXPANSION_WORKERS, help="concurrent section calls")
+    parser.add_argument("--live", action="store_true", help="call the Groq API and measure wall-clock time")
+    parser.add_argument("--runs", type=int, default=1, help="live runs to average")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {"prompt_version": PROMPT_VERSION, "workers": args.workers, "profiles": {}}
+    for name in args.profile or ["sample"]:
+        profile = load_sample_profile(name)
+        rows = []
+        for analysis_type in EXPANDABLE:
+            row = measure_static(analysis_type, profile, args.prefill_tps, args.decode_tps,
+                                 args.skeleton_decode_tps, args.workers)
+            if args.live:
+                row["live"] = measure_live(analysis_type, profile, args.workers, args.runs)
+            rows.append(row)
+        report["profiles"][name] = rows
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION} (prefill {args.prefill_tps:.0f} tok/s, "
+          f"decode {args.decode_tps:.0f} tok/s, {args.workers} workers)")
+    for name, rows in report["profiles"].items():
+        print(f"\nProfile: {name}")
+        print(f"{'analysis':<14}{'sections':>9}{'single s':>10}{'expanded s':>12}{'speedup':>9}"
+              f"{'prompt tok':>12}{'expanded tok':>14}")
+        for r in rows:
+            print(f"{r['type']:<14}{r['sections']:>9}{r['single_s']:>10}{r['expanded_s']:>12}{r['speedup']:>9}"
+                  f"{r['single_prompt_tokens']:>12}{r['expanded_prompt_tokens']:>14}")
+            if "live" in r:
+                live = r["live"]
+                print(f"{'  live':<14}{'':>9}{live['single']['seconds']:>10}{live['expanded']['seconds']:>12}"
+                      f"{live['speedup']:>9}{live['single']['prompt_tokens']:>12}{live['expanded']['prompt_tokens']:>14}")
+
+
+if __name__ == "__main__":
+    main()
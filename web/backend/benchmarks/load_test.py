@@ -0,0 +1,95 @@
+"""
+Load test
+Replays synthetic profiles against a running backend and reports latency percentiles
+
+Usage: python -m benchmarks.load_test [--url URL] [--corpus PATH | --count N]
+                                      [--concurrency N] [--requests N] [--analysis TYPE] [--json]
+
+Each request posts one corpus profile to /api/analyze. The backend rate-limits
+/api/analyze per client IP (10/minute), so 429s are reported separately; raise the
+limit or spread clients to measure generation throughput.
+"""
+
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from benchmarks.synthetic import generate_profiles, load_corpus
+from prompts import TEMPLATES
+
+
+def post(url: str, body: dict, timeout: float) -> tuple:
+    """(status, seconds) of one JSON POST; status 0 for connection errors"""
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, TimeoutError):
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--corpus", help="JSONL corpus from benchmarks.synthetic (default: generate --count)")
+    parser.add_argument("--count", type=int, default=200, help="profiles to draw requests from")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--analysis", default="career", choices=list(TEMPLATES))
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    profiles = load_corpus(args.corpus, args.count) if args.corpus else list(generate_profiles(args.count))
+    bodies = [{"profile": p, "analysis_type": args.analysis} for p in islice(cycle(profiles), args.requests)]
+    url = f"{args.url.rstrip('/')}/api/analyze"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda body: post(url, body, args.timeout), bodies))
+    wall = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    ok = sorted(seconds for status, seconds in results if status == 200)
+
+    def pct(p):
+        return round(ok[min(len(ok) - 1, int(len(ok) * p))], 2) if ok else None
+
+    report = {
+        "url": url,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 1),
+        "throughput_rps": round(len(results) / wall, 2),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "p50_s": pct(0.5),
+        "p95_s": pct(0.95),
+        "max_s": round(ok[-1], 2) if ok else None,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['requests']} requests to {url} at concurrency {args.concurrency} in {report['wall_s']}s "
+          f"({report['throughput_rps']} req/s)")
+    print(f"statuses: {report['statuses']}")
+    if ok:
+        print(f"latency of 200s: p50 {report['p50_s']}s, p95 {report['p95_s']}s, max {report['max_s']}s")
+    else:
+        print("no successful requests")
+
+
+if __name__ == "__main__":
+    main()
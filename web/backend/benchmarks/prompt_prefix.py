@@ -0,0 +1,152 @@
+"""
+Stable prompt prefix report
+Measures how much of each request is identical across users, per prompt layout, and the
+time-to-first-token that prefix caching saves
+
+Usage: python -m benchmarks.prompt_prefix [--profile sample|sparse|PATH] [--variants N]
+                                          [--prefill-tps N] [--json] [--live] [--model M]
+
+Requests are grouped by system prompt (industry-specific prompts never share a prefix
+across industries); the stable prefix of a group is the text every request in it
+starts with. The estimate assumes cached prefix tokens cost nothing to prefill.
+--live sends each request with max_tokens=1, streamed, and reports measured TTFT and the
+cached tokens the API reports where the model supports prefix caching (GROQ_API_KEY).
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks import load_sample_profile
+from prompts import LAYOUTS, PROMPT_VERSION, TEMPLATES, render_prompt
+from tokens import estimate_tokens
+
+# Field values swapped in to make synthetic users
+VARIATIONS = {
+    "name": ["Mehmet Kaya", "Elif Sahin", "Jonas Weber", "Maria Rossi", "Kenji Sato"],
+    "age": [22, 27, 31, 38, 45],
+    "dream_job": ["Staff Engineer", "Product Manager", "Data Science Lead", "Founder"],
+    "current_salary": ["24000", "52000", "85000", "130000"],
+    "location": ["Istanbul, Turkey", "Berlin, Germany", "Austin, USA", "Lisbon, Portugal"],
+    "passion_topics": ["robotics", "climate tech", "music production", "game design"],
+    "masters_concerns": ["time", "cost", "visa", "none"],
+}
+
+
+def make_variants(base: dict, count: int, seed: int = 7) -> List[dict]:
+    """Deterministic synthetic profiles derived from a base profile"""
+    rng = random.Random(seed)
+    variants = []
+    for _ in range(count):
+        profile = dict(base)
+        for field, values in VARIATIONS.items():
+            profile[field] = rng.choice(values)
+        profile["retire_age"] = max(int(profile["age"]) + 10, int(base["retire_age"]))
+        variants.append(profile)
+    return variants
+
+
+def _common_prefix(texts: List[str]) -> str:
+    first, last = min(texts), max(texts)
+    i = 0
+    while i < len(first) and first[i] == last[i]:
+        i += 1
+    return first[:i]
+
+
+def measure(analysis_type: str, profiles: List[dict], layout: str, prefill_tps: float) -> dict:
+    """Stable prefix share and estimated TTFT for one analysis type and layout"""
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for profile in profiles:
+        rendered = render_prompt(analysis_type, profile, layout=layout)
+        groups[rendered.system].append(f"{rendered.system}\n{rendered.prompt}")
+
+    total = stable = 0
+    for texts in groups.values():
+        prefix_tokens = estimate_tokens(_common_prefix(texts)) if len(texts) > 1 else 0
+        for text in texts:
+            total += estimate_tokens(text)
+            stable += prefix_tokens
+    return {
+        "type": analysis_type,
+        "layout": layout,
+        "requests": len(profiles),
+        "avg_tokens": round(total / len(profiles)),
+        "avg_stable_tokens": round(stable / len(profiles)),
+        "stable_pct": round(100.0 * stable / total, 1),
+        "ttft_ms": round(1000.0 * total / len(profiles) / prefill_tps),
+        "cached_ttft_ms": round(1000.0 * (total - stable) / len(profiles) / prefill_tps),
+    }
+
+
+def measure_live(analysis_type: str, profiles: List[dict], layout: str, model: str) -> dict:
+    """Measured TTFT and API-reported cached tokens, averaged over the requests"""
+    from groq import Groq
+
+    client = Groq(api_key=os.environ["GROQ_API_KEY"])
+    ttft, cached = [], 0
+    for profile in profiles:
+        rendered = render_prompt(analysis_type, profile, layout=layout)
+        start = time.perf_counter()
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": rendered.system},
+                {"role": "user", "content": rendered.prompt},
+            ],
+            max_tokens=1,
+            stream=True,
+        )
+        first = None
+        for chunk in stream:
+            if first is None:
+                first = time.perf_counter() - start
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached += getattr(details, "cached_tokens", 0) or 0
+        ttft.append(1000.0 * (first or time.perf_counter() - start))
+    ttft.sort()
+    return {"p50_ttft_ms": round(ttft[len(ttft) // 2]), "avg_cached_tokens": round(cached / len(profiles))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", action="append", help="sample, sparse or a profile JSON path (repeatable)")
+    parser.add_argument("--variants", type=int, default=8, help="synthetic users derived from the first profile")
+    parser.add_argument("--prefill-tps", type=float, default=1500.0, help="prompt tokens processed per second")
+    parser.add_argument("--live", action="store_true", help="measure TTFT against the Groq API")
+    parser.add_argument("--model", default=os.getenv("LLM_MODEL", "llama-3.3-70b-versatile"))
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    profiles = [load_sample_profile(name) for name in args.profile or ["sample", "sparse"]]
+    profiles += make_variants(profiles[0], args.variants)
+
+    rows = []
+    for analysis_type in TEMPLATES:
+        for layout in LAYOUTS:
+            row = measure(analysis_type, profiles, layout, args.prefill_tps)
+            if args.live:
+                row["live"] = measure_live(analysis_type, profiles, layout, args.model)
+            rows.append(row)
+
+    if args.json:
+        print(json.dumps({"prompt_version": PROMPT_VERSION, "rows": rows}, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION} ({len(profiles)} profiles, prefill {args.prefill_tps:.0f} tok/s)")
+    print(f"{'analysis':<20}{'layout':<15}{'tokens':>7}{'stable':>8}{'%':>7}{'ttft ms':>9}{'cached':>8}")
+    for r in rows:
+        print(f"{r['type']:<20}{r['layout']:<15}{r['avg_tokens']:>7}{r['avg_stable_tokens']:>8}"
+              f"{r['stable_pct']:>7}{r['ttft_ms']:>9}{r['cached_ttft_ms']:>8}")
+        if "live" in r:
+            print(f"{'':<20}{'  live':<15}{'':>7}{r['live']['avg_cached_tokens']:>8}{'':>7}"
+                  f"{r['live']['p50_ttft_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
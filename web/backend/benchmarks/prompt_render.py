@@ -0,0 +1,47 @@
+"""
+Prompt render benchmark
+Measures time to render the system + user prompt for each analysis type
+
+Usage: python -m benchmarks.prompt_render [--iterations N]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import load_sample_profile
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+
+
+def bench(analysis_type: str, profile: dict, iterations: int) -> dict:
+    """Render one analysis type repeatedly and return timing stats in microseconds"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        rendered = render_prompt(analysis_type, profile)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        "type": analysis_type,
+        "chars": len(rendered.system) + len(rendered.prompt),
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p95_us": timings[int(len(timings) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    profile = load_sample_profile()
+    print(f"Prompt version: {PROMPT_VERSION}")
+    print(f"{'analysis':<20}{'chars':>8}{'mean µs':>10}{'p50 µs':>10}{'p95 µs':>10}")
+    for analysis_type in TEMPLATES:
+        r = bench(analysis_type, profile, args.iterations)
+        print(f"{r['type']:<20}{r['chars']:>8}{r['mean_us']:>10.1f}{r['p50_us']:>10.1f}{r['p95_us']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Prompt token report
+Compares raw and compacted prompts per analysis type: tokens, saving and estimated prefill latency
+
+Token counts are local estimates (tokens.py) and the prefill saving is modelled as
+saved tokens / --prefill-tps; neither is measured against the provider.
+
+Usage: python -m benchmarks.prompt_tokens [--profile sample|sparse|PATH] [--sections] [--json]
+                                          [--prefill-tps N] [--min-saving-pct P]
+
+Exits with status 1 when any compacted prompt is larger than the raw one, or when the
+average saving is below --min-saving-pct, so it can run as a CI check.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks import load_sample_profile
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+from tokens import estimate_tokens, section_tokens
+
+
+def measure(analysis_type: str, profile: dict, prefill_tps: float) -> dict:
+    """Token counts for the raw and compacted prompt of one analysis type"""
+    raw = render_prompt(analysis_type, profile, compact=False)
+    compact = render_prompt(analysis_type, profile, compact=True)
+    raw_tokens = estimate_tokens(raw.system) + estimate_tokens(raw.prompt)
+    compact_tokens = estimate_tokens(compact.system) + estimate_tokens(compact.prompt)
+    saved = raw_tokens - compact_tokens
+    return {
+        "type": analysis_type,
+        "raw_tokens": raw_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_tokens": saved,
+        "saved_pct": round(100.0 * saved / raw_tokens, 1) if raw_tokens else 0.0,
+        "est_saved_prefill_ms": round(1000.0 * saved / prefill_tps, 1),
+        "sections": [
+            {"section": title, "raw": raw_count, "compact": dict(section_tokens(compact.prompt)).get(title, 0)}
+            for title, raw_count in section_tokens(raw.prompt)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", action="append", help="sample, sparse or a profile JSON path (repeatable)")
+    parser.add_argument("--prefill-tps", type=float, default=1500.0, help="prompt tokens processed per second")
+    parser.add_argument("--sections", action="store_true", help="show tokens per prompt section")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser.add_argument("--min-saving-pct", type=float, default=0.0)
+    args = parser.parse_args()
+
+    report = {"prompt_version": PROMPT_VERSION, "prefill_tps": args.prefill_tps, "profiles": {}}
+    for name in args.profile or ["sample", "sparse"]:
+        profile = load_sample_profile(name)
+        report["profiles"][name] = [measure(t, profile, args.prefill_tps) for t in TEMPLATES]
+
+    rows = [row for rows in report["profiles"].values() for row in rows]
+    avg_saving = sum(r["saved_pct"] for r in rows) / len(rows)
+    failed = any(r["saved_tokens"] < 0 for r in rows) or avg_saving < args.min_saving_pct
+    report["avg_saved_pct"] = round(avg_saving, 1)
+    report["ok"] = not failed
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"Prompt version: {PROMPT_VERSION} (estimated tokens; prefill modelled at {args.prefill_tps:.0f} tok/s)")
+        for name, rows in report["profiles"].items():
+            print(f"\nProfile: {name}")
+            print(f"{'analysis':<20}{'raw':>8}{'compact':>9}{'saved':>8}{'%':>7}{'est. ms':>9}")
+            for r in rows:
+                print(f"{r['type']:<20}{r['raw_tokens']:>8}{r['compact_tokens']:>9}"
+                      f"{r['saved_tokens']:>8}{r['saved_pct']:>7}{r['est_saved_prefill_ms']:>9}")
+                if args.sections:
+                    for s in r["sections"]:
+                        print(f"    {s['section'][:40]:<40}{s['raw']:>6}{s['compact']:>6}")
+        print(f"\nAverage saving: {report['avg_saved_pct']}%  {'OK' if report['ok'] else 'FAIL'}")
+
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
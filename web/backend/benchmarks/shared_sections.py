@@ -0,0 +1,56 @@
+"""
+Shared section report
+Output budget per analysis with shared sections written inline vs split out and cached
+
+Usage: python -m benchmarks.shared_sections [--profile sample|sparse|PATH] [--decode-tps N] [--json]
+
+Split-out sections are generated once per industry and prompt version, so per
+request the model only writes the personalized part.
+"""
+
+import argparse
+import json
+
+from benchmarks import load_sample_profile
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+from routing import TOKENS_PER_LINE
+
+
+def measure(analysis_type: str, profile: dict, decode_tps: float) -> dict:
+    """Line budget and estimated decode time with and without shared sections"""
+    inline = render_prompt(analysis_type, profile, split_shared=False)
+    split = render_prompt(analysis_type, profile, split_shared=True)
+    saved_lines = (inline.max_lines or 0) - (split.max_lines or 0)
+    return {
+        "type": analysis_type,
+        "shared_sections": list(split.shared),
+        "inline_lines": inline.max_lines,
+        "split_lines": split.max_lines,
+        "saved_lines": saved_lines,
+        "saved_decode_s": round(saved_lines * TOKENS_PER_LINE / decode_tps, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", default="sample", help="sample, sparse or a profile JSON path")
+    parser.add_argument("--decode-tps", type=float, default=250.0, help="output tokens generated per second")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    profile = load_sample_profile(args.profile)
+    rows = [measure(t, profile, args.decode_tps) for t in TEMPLATES]
+
+    if args.json:
+        print(json.dumps({"prompt_version": PROMPT_VERSION, "analyses": rows}, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION} (decode {args.decode_tps:.0f} tok/s)")
+    print(f"{'analysis':<20}{'shared':>8}{'inline':>8}{'split':>7}{'saved s':>9}")
+    for r in rows:
+        print(f"{r['type']:<20}{len(r['shared_sections']):>8}{r['inline_lines']:>8}"
+              f"{r['split_lines']:>7}{r['saved_decode_s']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Synthetic UserProfile corpus
+Generates seeded, realistic profile payloads as JSONL for the load, validation and cache benchmarks
+
+Usage: python -m benchmarks.synthetic [--count N] [--seed S] [--out PATH] [--workers N]
+                                      [--empty-rate F] [--edge-rate F]
+
+Profile i of a seed is always the same payload, whatever the count or worker split,
+so corpora of different sizes share their prefix. Industries cover every industry-
+specific system prompt table plus unset and unknown industries (the "Other" fallback);
+money fields sometimes hold edge-case strings ("18,000", "$18k", "₺25.000", "" ...) and
+optional fields are sometimes left at their model defaults.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional
+
+from benchmarks import load_sample_profile
+from prompts import TEMPLATES
+
+# Industries with their own system prompts, plus unset ("") and one no table knows
+INDUSTRIES: List[str] = sorted(
+    {name for t in TEMPLATES.values() if isinstance(t.system, dict) for name in t.system} - {"Other"}
+) + ["Other", "", "Agriculture"]
+
+# Per-industry pools: (majors, current jobs, dream jobs, skills, tools)
+INDUSTRY_POOLS: Dict[str, tuple] = {
+    "Technology & Engineering": (
+        ["Computer Engineering", "Statistics", "Electrical Engineering", "Mathematics"],
+        ["Junior Data Analyst", "Backend Developer", "QA Engineer", "DevOps Intern"],
+        ["Staff Engineer", "Senior Data Scientist", "ML Engineer", "CTO"],
+        ["Python, SQL", "Java, Spring", "Go, Kubernetes", "TypeScript, React"],
+        ["AWS, Docker", "pandas, Power BI", "GCP, Terraform", "Git, Jira"],
+    ),
+    "Business & Finance": (
+        ["Economics", "Business Administration", "Finance", "Accounting"],
+        ["Financial Analyst", "Audit Associate", "Sales Executive", "Bank Teller"],
+        ["CFO", "Investment Banker", "Product Manager", "Portfolio Manager"],
+        ["Excel modelling, valuation", "negotiation, CRM", "IFRS, auditing"],
+        ["Excel, Bloomberg", "Salesforce, HubSpot", "SAP, Tableau"],
+    ),
+    "Healthcare & Medicine": (
+        ["Medicine", "Nursing", "Pharmacy", "Biomedical Engineering"],
+        ["Resident Doctor", "Nurse", "Pharmacist", "Lab Technician"],
+        ["Chief Surgeon", "Hospital Director", "Health-tech Founder", "Clinical Researcher"],
+        ["patient care, diagnostics", "clinical research", "pharmacology"],
+        ["EHR systems, PACS", "SPSS, REDCap", "LIMS"],
+    ),
+    "Creative & Design": (
+        ["Graphic Design", "Architecture", "Film", "Industrial Design"],
+        ["Junior Designer", "Illustrator", "Video Editor", "UX Intern"],
+        ["Creative Director", "Principal Product Designer", "Studio Owner", "Art Director"],
+        ["branding, typography", "UX research, prototyping", "3D modelling"],
+        ["Figma, Adobe CC", "Blender, After Effects", "Procreate"],
+    ),
+    "Education": (
+        ["Mathematics Education", "English Literature", "Psychology", "History"],
+        ["Teacher", "Teaching Assistant", "Tutor", "Curriculum Developer"],
+        ["School Principal", "EdTech Founder", "Professor", "Education Consultant"],
+        ["curriculum design, classroom management", "tutoring, assessment"],
+        ["Moodle, Google Classroom", "Canva, Kahoot"],
+    ),
+    "Legal": (
+        ["Law", "International Relations", "Political Science"],
+        ["Trainee Lawyer", "Paralegal", "Legal Assistant", "Compliance Officer"],
+        ["Partner at Law Firm", "General Counsel", "Judge", "Legal-tech Founder"],
+        ["contract drafting, litigation", "compliance, GDPR", "legal research"],
+        ["LexisNexis, Westlaw", "Clio, DocuSign"],
+    ),
+}
+
+FIRST_NAMES = ["Ayşe", "Mehmet", "Elif", "Can", "Zeynep", "Jonas", "Maria", "Kenji", "Ana", "Omar",
+               "Şükrü", "Lena", "Ioana", "Priya", "Lucas", "Ngozi"]
+LAST_NAMES = ["Demir", "Kaya", "Şahin", "Yılmaz", "Weber", "Rossi", "Sato", "Silva", "Haddad",
+              "Öztürk", "Novak", "Okafor", "Müller", "Çelik"]
+UNIVERSITIES = ["METU", "Boğaziçi University", "ITU", "Bilkent University", "TU Munich",
+                "University of Lisbon", "Sapienza", "Hacettepe University"]
+LOCATIONS = ["Ankara, Turkey", "Istanbul, Turkey", "Izmir, Turkey", "Berlin, Germany",
+             "Lisbon, Portugal", "Austin, USA", "Remote", "Amsterdam, Netherlands"]
+
+MONEY_FIELDS = {
+    "current_salary": (0, 150000),
+    "dream_salary": (30000, 400000),
+    "monthly_expenses": (300, 6000),
+    "savings": (0, 200000),
+    "monthly_savings_goal": (100, 5000),
+    "debts": (0, 50000),
+    "monthly_side_income_goal": (100, 10000),
+}
+
+# Money strings users actually type
+MONEY_EDGE_CASES = ["0", "", "18,000", "18.000", "$18k", "€2.5k", "₺25.000", "25000 TL", " 900 ",
+                    "1e5", "n/a", "-", "100000000000", "12000-15000", "~3000", "yok"]
+
+# Optional UserProfile fields and the value the model fills in when they are omitted
+OPTIONAL_DEFAULTS = {
+    "primary_industry": "", "current_salary": "0", "job_satisfaction": "0",
+    "years_current_job": "0", "industry": "none", "company_size": "none",
+    "share_skills": "no", "key_skills": "", "skill_level": "", "tools_platforms": "",
+    "certifications": "", "portfolio_work": "", "programming_langs": "", "prog_level": "",
+    "ml_exp": "", "frameworks": "", "cloud_exp": "", "data_tools": "", "github_projects": "",
+    "masters_fields_interested": "", "masters_location_preference": "",
+    "masters_program_language": "", "masters_type": "", "can_afford_masters": "",
+    "masters_timeline": "", "masters_work_while_study": "", "masters_priority": "",
+    "masters_specific_programs": "", "masters_concerns": "",
+}
+MASTERS_FIELDS = [f for f in OPTIONAL_DEFAULTS if f.startswith("masters_") or f == "can_afford_masters"]
+
+CHOICES = {
+    "relocation_ok": ["yes", "no", "maybe"],
+    "company_size": ["startup", "sme", "enterprise", "none"],
+    "industry": ["fintech", "e-commerce", "public sector", "consulting", "health", "media", "none"],
+    "skill_level": ["beginner", "intermediate", "advanced", "expert"],
+    "considering_masters": ["yes", "no", "undecided"],
+    "masters_fields_interested": ["Data Science", "MBA", "Public Health", "Design", "LLM (Master of Laws)"],
+    "masters_location_preference": ["Europe", "USA", "Turkey", "online"],
+    "masters_program_language": ["English", "German", "Turkish"],
+    "masters_type": ["full-time", "part-time", "online"],
+    "can_afford_masters": ["yes", "partially", "no"],
+    "masters_timeline": ["this year", "next year", "in 2-3 years"],
+    "masters_work_while_study": ["yes", "no", "maybe"],
+    "masters_priority": ["career impact", "cost", "prestige", "network"],
+    "masters_specific_programs": ["TU Munich MSc Data Engineering", "LSE MSc Finance", "none yet"],
+    "masters_concerns": ["cost", "time", "visa", "language", "none"],
+    "career_path_preference": ["individual contributor", "management", "entrepreneurship", "undecided"],
+    "willing_to_study": ["yes", "no", "maybe"],
+    "family_support": ["yes", "no", "partial"],
+    "risk_tolerance": ["low", "medium", "high"],
+    "fire_lifestyle": ["lean", "regular", "fat", "barista"],
+    "retirement_location": ["Portugal", "Turkey coast", "Bali", "Mexico", "home town", ""],
+    "passive_income_interest": ["low", "medium", "high"],
+    "time_for_side": ["0 hours/week", "5 hours/week", "10 hours/week", "20+ hours/week"],
+    "side_interests": ["data consulting, courses", "illustration commissions", "tutoring", "YouTube", ""],
+    "freelance_exp": ["none", "some", "a lot"],
+    "preferred_side_income": ["digital products", "freelancing", "content", "investing", "teaching"],
+    "learning_style": ["hands-on", "video courses", "books", "mentorship"],
+    "biggest_obstacle": ["lack of experience", "time", "money", "motivation", "visa", ""],
+    "need_most": ["clear roadmap", "mentor", "network", "confidence", "money"],
+    "passion_topics": ["AI for education", "climate tech", "music production", "game design", "<script>alert(1)</script>"],
+    "flow_activities": ["building dashboards", "drawing", "writing", "teaching", "cooking"],
+    "dream_projects": ["open-source learning platform", "own studio", "a clinic in my home town", ""],
+    "role_models": ["Andrew Ng", "Ray Dalio", "Zaha Hadid", "{unknown}", ""],
+}
+
+
+def _money(rng: random.Random, field: str, edge_rate: float) -> str:
+    if rng.random() < edge_rate:
+        return rng.choice(MONEY_EDGE_CASES)
+    low, high = MONEY_FIELDS[field]
+    return str(int(rng.uniform(low, high)) // 100 * 100)
+
+
+def generate_profile(seed: int, index: int, empty_rate: float = 0.3, edge_rate: float = 0.1) -> dict:
+    """Profile number index of the corpus for seed"""
+    rng = random.Random(seed * 1_000_003 + index)
+    industry = rng.choice(INDUSTRIES)
+    majors, jobs, dreams, skills, tools = INDUSTRY_POOLS.get(industry, INDUSTRY_POOLS["Technology & Engineering"])
+    age = rng.randint(18, 58)
+    grad_year = 2026 - max(age - 22, 0)
+
+    profile = {
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "age": age,
+        "university": rng.choice(UNIVERSITIES),
+        "major": rng.choice(majors),
+        "grad_year": str(grad_year) if grad_year <= 2026 and rng.random() > 0.05 else "Expected 2027",
+        "location": rng.choice(LOCATIONS),
+        "relocation_ok": rng.choice(CHOICES["relocation_ok"]),
+        "current_job": "student" if age < 22 else rng.choice(jobs),
+        "primary_industry": industry,
+        "job_satisfaction": str(rng.randint(1, 10)),
+        "years_current_job": str(rng.randint(0, max(age - 21, 0))),
+        "industry": rng.choice(CHOICES["industry"]),
+        "company_size": rng.choice(CHOICES["company_size"]),
+        "share_skills": rng.choice(["yes", "no"]),
+        "key_skills": rng.choice(skills),
+        "skill_level": rng.choice(CHOICES["skill_level"]),
+        "tools_platforms": rng.choice(tools),
+        "certifications": rng.choice(["", "AWS SAA", "CFA Level 1", "PMP", "Google UX"]),
+        "portfolio_work": rng.choice(["", "github.com/example", "behance.net/example", "3 case studies"]),
+        "programming_langs": "", "prog_level": "", "ml_exp": "", "frameworks": "",
+        "cloud_exp": "", "data_tools": "", "github_projects": "",
+        "dream_job": rng.choice(dreams),
+        "target_years": str(rng.randint(1, 15)),
+        "retire_age": str(rng.randint(age + 1, max(age + 1, 70))),
+        "time_commit": str(rng.randint(1, 10)),
+        "work_life_balance": str(rng.randint(1, 10)),
+    }
+    for field in MONEY_FIELDS:
+        profile[field] = _money(rng, field, edge_rate)
+    for field, values in CHOICES.items():
+        if field not in profile:
+            profile[field] = rng.choice(values)
+
+    if profile["considering_masters"] == "no":
+        for field in MASTERS_FIELDS:
+            profile[field] = ""
+    for field, default in OPTIONAL_DEFAULTS.items():
+        if rng.random() < empty_rate:
+            profile[field] = default
+    if rng.random() < 0.01:
+        # Near the sanitizer's 2000-character cap
+        profile["dream_projects"] = "build " * 400
+    return {field: profile[field] for field in FIELDS}
+
+
+# Field order of the bundled sample payload
+FIELDS: List[str] = list(load_sample_profile("sample"))
+
+
+def generate_profiles(count: int, seed: int = 7, start: int = 0, **rates) -> Iterator[dict]:
+    """Profiles start .. start+count-1 of the corpus for seed"""
+    for index in range(start, start + count):
+        yield generate_profile(seed, index, **rates)
+
+
+def _chunk(args) -> str:
+    seed, start, count, rates = args
+    return "".join(json.dumps(p, ensure_ascii=False) + "\n" for p in generate_profiles(count, seed, start, **rates))
+
+
+def write_corpus(path: str, count: int, seed: int = 7, workers: int = 1, chunk_size: int = 5000, **rates) -> None:
+    """Write a JSONL corpus; chunks are generated in parallel and written in order"""
+    jobs = [(seed, start, min(chunk_size, count - start), rates) for start in range(0, count, chunk_size)]
+    with open(path, "w", encoding="utf-8") as f:
+        if workers <= 1:
+            for job in jobs:
+                f.write(_chunk(job))
+            return
+        with Pool(workers) as pool:
+            for text in pool.imap(_chunk, jobs):
+                f.write(text)
+
+
+def load_corpus(path: str, limit: Optional[int] = None) -> List[dict]:
+    """Read up to limit profiles from a JSONL corpus"""
+    profiles = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if limit is not None and len(profiles) >= limit:
+                break
+            if line.strip():
+                profiles.append(json.loads(line))
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="-", help="JSONL path, or - for stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--empty-rate", type=float, default=0.3, help="chance an optional field is left at its default")
+    parser.add_argument("--edge-rate", type=float, default=0.1, help="chance a money field holds an edge-case string")
+    args = parser.parse_args()
+
+    rates = {"empty_rate": args.empty_rate, "edge_rate": args.edge_rate}
+    if args.out == "-":
+        for profile in generate_profiles(args.count, args.seed, **rates):
+            sys.stdout.write(json.dumps(profile, ensure_ascii=False) + "\n")
+        return
+
+    start = time.perf_counter()
+    write_corpus(args.out, args.count, args.seed, args.workers, **rates)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.count} profiles (seed {args.seed}) to {args.out} in {elapsed:.1f}s "
+          f"({args.count / elapsed:,.0f} profiles/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
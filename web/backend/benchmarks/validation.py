@@ -0,0 +1,76 @@
+"""
+Profile validation benchmark
+Validates a synthetic corpus against UserProfile and renders every analysis prompt for it
+
+Usage: python -m benchmarks.validation [--corpus PATH | --count N] [--json]
+
+Reports validation and render throughput, and which fields rejected profiles (the
+corpus deliberately contains edge-case money strings and empty optional fields).
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+
+from pydantic import ValidationError
+
+from benchmarks.synthetic import generate_profiles, load_corpus
+from main import UserProfile
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="JSONL corpus from benchmarks.synthetic (default: generate --count)")
+    parser.add_argument("--count", type=int, default=10000, help="profiles to validate")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    payloads = load_corpus(args.corpus, args.count) if args.corpus else list(generate_profiles(args.count))
+
+    rejected: Counter = Counter()
+    profiles = []
+    start = time.perf_counter()
+    for payload in payloads:
+        try:
+            profiles.append(UserProfile(**payload))
+        except ValidationError as e:
+            rejected.update(".".join(str(part) for part in error["loc"]) for error in e.errors())
+    validate_s = time.perf_counter() - start
+
+    render_errors: Counter = Counter()
+    start = time.perf_counter()
+    for profile in profiles:
+        values = profile.dict()
+        for analysis_type in TEMPLATES:
+            try:
+                render_prompt(analysis_type, values)
+            except Exception as e:
+                render_errors[f"{analysis_type}: {type(e).__name__}"] += 1
+    render_s = time.perf_counter() - start
+
+    report = {
+        "prompt_version": PROMPT_VERSION,
+        "profiles": len(payloads),
+        "valid": len(profiles),
+        "validate_per_s": round(len(payloads) / validate_s),
+        "render_per_s": round(len(profiles) * len(TEMPLATES) / render_s) if profiles else 0,
+        "rejected_fields": dict(rejected.most_common()),
+        "render_errors": dict(render_errors.most_common()),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Prompt version: {PROMPT_VERSION}")
+    print(f"Validated {report['profiles']} profiles: {report['valid']} valid, "
+          f"{report['validate_per_s']:,} profiles/s; rendered {report['render_per_s']:,} prompts/s")
+    for field, count in rejected.most_common(10):
+        print(f"  rejected by {field}: {count}")
+    for error, count in render_errors.most_common(10):
+        print(f"  render error {error}: {count}")
+
+
+if __name__ == "__main__":
+    main()
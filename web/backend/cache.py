@@ -0,0 +1,74 @@
+"""
+In-memory Cache for Guindo Backend
+Thread-safe LRU cache with TTL for generated analyses
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class TTLCache:
+    """LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Cache of generated analyses, keyed by prompts.make_cache_key
+analysis_cache = TTLCache(
+    maxsize=int(os.getenv("ANALYSIS_CACHE_SIZE", 256)),
+    ttl=float(os.getenv("ANALYSIS_CACHE_TTL", 3600)),
+)
+
+# Profile-independent sections, keyed per analysis, heading, industry and prompt version
+shared_cache = TTLCache(
+    maxsize=int(os.getenv("SHARED_CACHE_SIZE", 128)),
+    ttl=float(os.getenv("SHARED_CACHE_TTL", 86400)),
+)
+
+
+__all__ = ["TTLCache", "analysis_cache", "shared_cache"]
@@ -0,0 +1,121 @@
+"""
+Combined Generation for Guindo Backend
+One request that writes every analyze-all section, split back by delimiter lines
+"""
+
+import re
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from prompts import (
+    COMBINED_TEMPLATE,
+    MANIFEST,
+    PROMPT_COMPACT,
+    PROMPT_LAYOUT,
+    PROMPT_VERSION,
+    TEMPLATES,
+    RenderedPrompt,
+    assemble,
+    compact_text,
+    make_cache_key,
+)
+
+# Sections in the order of the analyze-all response
+ANALYSIS_TYPES = ("career", "roi", "fire", "side_hustle", "interests_roadmap")
+
+SECTION_DELIMITER = "<<<SECTION: {name}>>>"
+DELIMITER_LINE = re.compile(r"^\s*<<<\s*SECTION:\s*(\w+)\s*>>>\s*$")
+
+
+def render_combined(
+    profile: Mapping,
+    compact: Optional[bool] = None,
+    layout: Optional[str] = None
+) -> RenderedPrompt:
+    """One prompt: the full profile once, and each analysis's instructions behind a delimiter"""
+    if compact is None:
+        compact = PROMPT_COMPACT
+    layout = layout or PROMPT_LAYOUT
+    references = layout == "prefix"
+    spec = MANIFEST["combined"]
+    profile_values = COMBINED_TEMPLATE.slot_values(profile)
+
+    static = [spec["preamble"].replace("{delimiter}", SECTION_DELIMITER.format(name=ANALYSIS_TYPES[0]))]
+    max_lines = 0
+    for analysis_type in ANALYSIS_TYPES:
+        template = TEMPLATES[analysis_type]
+        instructions = template.render(
+            template.slot_values(profile), compact=compact, part="instructions", references=references
+        )
+        static.append(f"{SECTION_DELIMITER.format(name=analysis_type)}\n{instructions.strip()}")
+        max_lines += template.max_lines or 0
+
+    body = COMBINED_TEMPLATE.render(profile_values, compact=compact)
+    if references:
+        static.insert(0, spec["title"])
+    prompt = assemble(static, spec["title"], body, layout)
+    version = PROMPT_VERSION
+    if compact:
+        prompt = compact_text(prompt)
+        version = f"{PROMPT_VERSION}/compact"
+    if references:
+        version = f"{version}/prefix"
+
+    return RenderedPrompt(
+        analysis_type="combined",
+        system=COMBINED_TEMPLATE.system_prompt(None),
+        prompt=prompt,
+        version=version,
+        cache_key=make_cache_key("combined", profile_values, version),
+        max_lines=max_lines,
+    )
+
+
+class SectionSplitter:
+    """Incrementally splits streamed model output into (section, content) pairs"""
+
+    def __init__(self):
+        self._buffer = ""
+        self._current: Optional[str] = None
+        self._lines: List[str] = []
+
+    def _line(self, line: str) -> List[Tuple[str, str]]:
+        match = DELIMITER_LINE.match(line)
+        if not match:
+            if self._current is not None:
+                self._lines.append(line)
+            return []
+        done = self._flush()
+        self._current = match.group(1)
+        return done
+
+    def _flush(self) -> List[Tuple[str, str]]:
+        if self._current is None:
+            return []
+        section = (self._current, "\n".join(self._lines).strip())
+        self._current, self._lines = None, []
+        return [section]
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """Add streamed text; returns sections completed by it"""
+        self._buffer += text
+        done = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            done.extend(self._line(line))
+        return done
+
+    def close(self) -> List[Tuple[str, str]]:
+        """End of stream; returns the last section"""
+        done = self._line(self._buffer) if self._buffer else []
+        self._buffer = ""
+        return done + self._flush()
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split a complete combined response into {section: content}"""
+    splitter = SectionSplitter()
+    sections = splitter.feed(text) + splitter.close()
+    return {name: content for name, content in sections if name in ANALYSIS_TYPES and content}
+
+
+__all__ = ["ANALYSIS_TYPES", "SectionSplitter", "render_combined", "split_sections"]
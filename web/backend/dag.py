@@ -0,0 +1,188 @@
+"""
+Analysis DAG for Guindo Backend
+Runs analyze-all with each analysis started as soon as the analyses it builds on are done
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from prompts import UPSTREAM
+
+# {analysis: {upstream analysis: [heading prefixes of the sections to pass on]}}
+DEPENDENCIES: Dict[str, Dict[str, List[str]]] = UPSTREAM.get("depends", {})
+SUMMARY_MAX_LINES: int = UPSTREAM.get("max_lines", 14)
+
+
+def _level(line: str) -> int:
+    """Markdown heading level of a line (0 when it is not a heading)"""
+    stripped = line.lstrip("#")
+    return len(line) - len(stripped) if stripped.startswith(" ") else 0
+
+
+def summarize(text: str, headings: Sequence[str], max_lines: int = SUMMARY_MAX_LINES) -> str:
+    """
+    Compact summary of an upstream result: the sections under the given heading
+    prefixes (up to the next heading of the same or a higher level), non-empty lines
+    only, capped at max_lines. Falls back to the opening lines.
+    """
+    lines = text.split("\n")
+    picked: List[str] = []
+    for heading in headings:
+        starts = [i for i, line in enumerate(lines) if line.startswith(heading)]
+        if not starts:
+            continue
+        start = starts[0]
+        level = _level(lines[start])
+        end = start + 1
+        while end < len(lines) and not (0 < _level(lines[end]) <= level):
+            end += 1
+        picked.extend(line for line in lines[start:end] if line.strip())
+    if not picked:
+        picked = [line for line in lines if line.strip()]
+    # Headings become bold labels so they don't read as sections of the new plan
+    picked = [f"**{line.lstrip('#').strip()}**" if _level(line) else line for line in picked]
+    return "\n".join(picked[:max_lines])
+
+
+@dataclass
+class NodeTrace:
+    """Timing of one DAG node, in ms since the run started"""
+    name: str
+    deps: Tuple[str, ...]
+    ready_ms: float = 0.0
+    start_ms: float = 0.0
+    end_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class UpstreamFailed(Exception):
+    """A node was skipped because a node it depends on failed"""
+
+
+@dataclass
+class DagRun:
+    """
+    Schedules nodes on a thread pool with maximal parallelism.
+
+    nodes maps a name to (dependencies, fn); fn receives {dependency: result}.
+    Iterate run() to get (name, result) pairs in completion order. By default the
+    first error cancels the rest and is raised; with fail_fast=False a failed node
+    is yielded as (name, None) with its exception in errors, nodes that depend on it
+    are skipped the same way with UpstreamFailed, and the other nodes keep running.
+    """
+    nodes: Mapping[str, Tuple[Sequence[str], Callable[[Dict[str, str]], str]]]
+    max_workers: Optional[int] = None
+    fail_fast: bool = True
+    traces: Dict[str, NodeTrace] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    wall_ms: float = 0.0
+
+    def __post_init__(self):
+        for name, (deps, _) in self.nodes.items():
+            unknown = [d for d in deps if d not in self.nodes]
+            if unknown:
+                raise ValueError(f"DAG node {name} depends on unknown nodes {unknown}")
+            self.traces[name] = NodeTrace(name, tuple(deps))
+
+    def run(self) -> Iterator[Tuple[str, str]]:
+        start = time.perf_counter()
+
+        def elapsed() -> float:
+            return (time.perf_counter() - start) * 1000
+
+        results: Dict[str, str] = {}
+        pending: Dict[Future, str] = {}
+
+        def timed(name: str, fn: Callable, upstream: Dict[str, str]) -> str:
+            self.traces[name].start_ms = elapsed()
+            try:
+                return fn(upstream)
+            finally:
+                self.traces[name].end_ms = elapsed()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(self.nodes)) as pool:
+            def submit_ready():
+                for name, (deps, fn) in self.nodes.items():
+                    if name in results or name in self.errors or name in pending.values():
+                        continue
+                    if all(d in results for d in deps):
+                        self.traces[name].ready_ms = elapsed()
+                        pending[pool.submit(timed, name, fn, {d: results[d] for d in deps})] = name
+
+            def skip_blocked() -> List[str]:
+                """Mark nodes whose dependencies failed as failed, until none are left"""
+                skipped = []
+                while True:
+                    blocked = [
+                        name for name, (deps, _) in self.nodes.items()
+                        if name not in self.errors and any(d in self.errors for d in deps)
+                    ]
+                    if not blocked:
+                        return skipped
+                    for name in blocked:
+                        failed = [d for d in self.nodes[name][0] if d in self.errors]
+                        self.errors[name] = UpstreamFailed(f"{name} skipped: {', '.join(failed)} failed")
+                        self.traces[name].error = UpstreamFailed.__name__
+                        skipped.append(name)
+
+            submit_ready()
+            if not pending and self.nodes:
+                raise ValueError("DAG has a cycle")
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        self.traces[name].error = type(e).__name__
+                        if self.fail_fast:
+                            for other in pending:
+                                other.cancel()
+                            raise
+                        self.errors[name] = e
+                        yield name, None
+                        for skipped in skip_blocked():
+                            yield skipped, None
+                        continue
+                    yield name, results[name]
+                submit_ready()
+                if not pending and len(results) + len(self.errors) < len(self.nodes):
+                    raise ValueError("DAG has a cycle")
+        self.wall_ms = elapsed()
+
+    def critical_path(self) -> List[str]:
+        """Chain of nodes that determined the finish time, first to last"""
+        if not self.traces:
+            return []
+        node = max(self.traces.values(), key=lambda t: t.end_ms)
+        path = [node.name]
+        while node.deps:
+            node = max((self.traces[d] for d in node.deps), key=lambda t: t.end_ms)
+            path.append(node.name)
+        return path[::-1]
+
+    def trace(self) -> dict:
+        """JSON-friendly timings and the critical path"""
+        path = self.critical_path()
+        return {
+            "wall_ms": round(self.wall_ms),
+            "nodes": [
+                {
+                    "name": t.name,
+                    "deps": list(t.deps),
+                    "queued_ms": round(t.start_ms - t.ready_ms),
+                    "start_ms": round(t.start_ms),
+                    "end_ms": round(t.end_ms),
+                    "error": t.error,
+                }
+                for t in sorted(self.traces.values(), key=lambda t: t.start_ms)
+            ],
+            "critical_path": path,
+            "critical_path_ms": round(self.traces[path[-1]].end_ms) if path else 0,
+        }
+
+
+__all__ = ["DEPENDENCIES", "DagRun", "NodeTrace", "UpstreamFailed", "summarize"]
@@ -0,0 +1,200 @@
+"""
+Skeleton-then-Expand Generation for Guindo Backend
+A fast outline call fixes the key numbers, then every section is written by its own
+concurrent call from a shared context header and stitched back in order
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from prompts import (
+    LINE_BUDGET,
+    MANIFEST,
+    PROMPT_COMPACT,
+    PROMPT_LAYOUT,
+    PROMPT_VERSION,
+    TEMPLATES,
+    RenderedPrompt,
+    assemble,
+    compact_text,
+    make_cache_key,
+)
+
+EXPANSION = MANIFEST.get("expansion", {})
+
+# Analysis types that support expansion, mapped to the word of their numbered
+# subsections ("### Scenario 1: ...") which are expanded individually
+EXPANDABLE: Dict[str, str] = EXPANSION.get("analyses", {})
+
+# Use skeleton-then-expand for EXPANDABLE analyses
+EXPANSION_ENABLED = os.getenv("EXPANSION_MODE", "0").lower() in ("1", "true", "yes")
+EXPANSION_WORKERS = int(os.getenv("EXPANSION_WORKERS", 12))
+
+# Outline lines per section, and the smallest line budget a section is given
+SKELETON_LINES_PER_UNIT = 3
+MIN_UNIT_LINES = 6
+
+SECTION_HEADING = re.compile(r"^## ")
+
+
+@dataclass(frozen=True)
+class Unit:
+    """One independently written piece of an analysis"""
+    heading: str                    # first line the model must write
+    instructions: str
+    section: Optional[str] = None   # "## ..." heading the stitcher adds before a split section
+    weight: int = 1                 # instruction lines, used to share out the line budget
+
+
+def _split_units(instructions: str, subsection_word: str) -> Tuple[str, List[Unit]]:
+    """Split rendered instructions into (shared context, units)"""
+    lines = instructions.split("\n")
+    budget_at = max((i for i, line in enumerate(lines) if LINE_BUDGET.search(line)), default=len(lines))
+    body, footer = lines[:budget_at], lines[budget_at:]
+    if footer:
+        # Style lines after "Max N lines" apply to every section; the budget itself is per unit
+        footer[0] = LINE_BUDGET.sub("", footer[0]).lstrip(". ")
+
+    starts = [i for i, line in enumerate(body) if SECTION_HEADING.match(line)]
+    context = "\n".join(body[:starts[0]] if starts else body).strip()
+    context = "\n\n".join([context, "\n".join(line for line in footer if line.strip())]).strip()
+
+    subsection = re.compile(rf"^### {re.escape(subsection_word)} \d+")
+    units = []
+    for start, end in zip(starts, starts[1:] + [len(body)]):
+        heading, section = body[start], body[start + 1:end]
+        subs = [i for i, line in enumerate(section) if subsection.match(line)]
+        if not subs:
+            text = "\n".join(body[start:end]).strip()
+            units.append(Unit(heading, text, weight=end - start))
+            continue
+        intro = "\n".join(section[:subs[0]]).strip()
+        for sub_start, sub_end in zip(subs, subs[1:] + [len(section)]):
+            text = "\n".join([intro, ""] + section[sub_start:sub_end]).strip()
+            units.append(Unit(
+                section[sub_start],
+                text,
+                section=heading if sub_start == subs[0] else None,
+                weight=sub_end - sub_start,
+            ))
+    return context, units
+
+
+@dataclass(frozen=True)
+class ExpansionPlan:
+    """Rendered prompts for one skeleton-then-expand generation"""
+    analysis_type: str
+    system: str
+    version: str
+    cache_key: str
+    layout: str
+    title: str
+    profile: str
+    context: str
+    skeleton: RenderedPrompt
+    units: Tuple[Unit, ...]
+    unit_lines: Tuple[int, ...]
+
+    def expansion_prompts(self, outline: str) -> List[RenderedPrompt]:
+        """One prompt per unit, each carrying the shared context, the profile and the agreed outline"""
+        prompts = []
+        for unit, max_lines in zip(self.units, self.unit_lines):
+            static = [
+                self.context,
+                EXPANSION["expand"].replace("{heading}", unit.heading),
+                f"SECTION TO WRITE:\n{unit.instructions}",
+                f"Max {max_lines} lines.",
+            ]
+            prompt = assemble(static, self.title, self.profile, self.layout) + f"\n\nOUTLINE:\n{outline.strip()}"
+            prompts.append(RenderedPrompt(
+                analysis_type=self.analysis_type,
+                system=self.system,
+                prompt=prompt,
+                version=self.version,
+                cache_key=self.cache_key,
+                max_lines=max_lines,
+            ))
+        return prompts
+
+    def stitch(self, sections: List[str]) -> str:
+        """Join expanded sections in order, adding the heading of split sections once"""
+        out = []
+        for unit, text in zip(self.units, sections):
+            text = text.strip()
+            if unit.section:
+                if text.startswith(unit.section):
+                    text = text[len(unit.section):].lstrip("\n")
+                out.append(unit.section)
+            out.append(text)
+        return "\n\n".join(out)
+
+
+def plan_expansion(
+    analysis_type: str,
+    profile: Mapping,
+    compact: Optional[bool] = None,
+    layout: Optional[str] = None
+) -> ExpansionPlan:
+    """Build the skeleton prompt and the units for an EXPANDABLE analysis type"""
+    if compact is None:
+        compact = PROMPT_COMPACT
+    layout = layout or PROMPT_LAYOUT
+    references = layout == "prefix"
+    template = TEMPLATES[analysis_type]
+    slot_values = template.slot_values(profile)
+    industry = profile.get("primary_industry")
+    key_values = dict(slot_values)
+    if isinstance(template.system, dict):
+        key_values["primary_industry"] = industry or ""
+
+    title = template.render(slot_values, part="title")
+    profile_text = template.render(slot_values, compact=compact, part="profile_body").strip()
+    instructions = template.render(slot_values, compact=compact, part="instructions", references=references)
+    if compact:
+        profile_text, instructions = compact_text(profile_text), compact_text(instructions)
+    context, units = _split_units(instructions, EXPANDABLE[analysis_type])
+    if references:
+        context = f"{title}\n\n{context}"
+
+    version = f"{PROMPT_VERSION}/compact" if compact else PROMPT_VERSION
+    if references:
+        version = f"{version}/prefix"
+    cache_key = make_cache_key(f"{analysis_type}/expanded", key_values, version)
+    system = template.system_prompt(industry)
+
+    total_lines = template.max_lines or 0
+    total_weight = sum(unit.weight for unit in units)
+    unit_lines = tuple(
+        max(MIN_UNIT_LINES, math.ceil(total_lines * unit.weight / total_weight))
+        for unit in units
+    )
+    headings = "\n".join(
+        f"{unit.section}\n{unit.heading}" if unit.section else unit.heading for unit in units
+    )
+    skeleton = RenderedPrompt(
+        analysis_type=analysis_type,
+        system=system,
+        prompt=assemble([context, EXPANSION["skeleton"], headings], title, profile_text, layout),
+        version=version,
+        cache_key=cache_key,
+        max_lines=SKELETON_LINES_PER_UNIT * len(units),
+    )
+    return ExpansionPlan(
+        analysis_type=analysis_type,
+        system=system,
+        version=version,
+        cache_key=cache_key,
+        layout=layout,
+        title=title,
+        profile=profile_text,
+        context=context,
+        skeleton=skeleton,
+        units=tuple(units),
+        unit_lines=unit_lines,
+    )
+
+
+__all__ = ["EXPANDABLE", "EXPANSION_ENABLED", "EXPANSION_WORKERS", "ExpansionPlan", "Unit", "plan_expansion"]
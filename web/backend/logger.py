@@ -51,9 +51,16 @@ def log_request(method: str, path: str, status_code: int, duration_ms: Optional[
         logger.info(message)
 
 
-def log_ai_request(analysis_type: str, model: str, tokens: Optional[int] = None):
+def log_ai_request(
+    analysis_type: str,
+    model: str,
+    tokens: Optional[int] = None,
+    prompt_version: Optional[str] = None
+):
     """Log AI API request"""
     message = f"AI Request - Type: {analysis_type}, Model: {model}"
+    if prompt_version:
+        message += f", Prompt: {prompt_version}"
     if tokens:
         message += f", Tokens: {tokens}"
     logger.info(message)
@@ -5,17 +5,29 @@ Modern, async API for personalized FIRE planning
 
 from fastapi import FastAPI, HTTPException, Header, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, validator, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Tuple
+import json
+import itertools
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from groq import Groq
+from groq import Groq, RateLimitError, APITimeoutError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from logger import logger, log_request, log_ai_request, log_error
+from prompts import PROMPT_VERSION, TEMPLATES, render_prompt
+from combined import ANALYSIS_TYPES, SectionSplitter, render_combined, split_sections
+from expansion import EXPANDABLE, EXPANSION_ENABLED, EXPANSION_WORKERS, plan_expansion
+from dag import DEPENDENCIES, DagRun, summarize
+from shared import render_shared, stitch_shared
+from cache import analysis_cache, shared_cache
+from routing import ROUTES, get_route, max_tokens_for
+from metrics import ai_metrics
 
 load_dotenv()
 
@@ -49,6 +61,11 @@ app.add_middleware(
 # Groq client
 client = Groq(api_key=os.getenv('GROQ_API_KEY'))
 
+# analyze-all strategy: "dag" (parallel, dependent analyses reuse upstream results),
+# "fanout" (one request per analysis, in turn) or "combined" (one request for all five)
+ANALYZE_ALL_MODE = os.getenv("ANALYZE_ALL_MODE", "dag")
+ANALYZE_ALL_MODES = ("dag", "fanout", "combined")
+
 # ============ SECURITY ============
 
 async def verify_api_key(x_api_key: Optional[str] = Header(None)) -> str:
@@ -238,714 +255,415 @@ class AnalysisResponse(BaseModel):
     analysis_type: str
     timestamp: str
 
+class ProfileUpdateRequest(BaseModel):
+    profile: UserProfile
+    previous_profile: Optional[UserProfile] = None  # lets the response report which analyses the edit affects
+    analysis_types: Optional[List[str]] = None  # defaults to all five
+
 # ============ AI HELPERS ============
 
-def call_ai(prompt: str, system: str, analysis_type: str = "general") -> str:
-    """Call Groq API with logging"""
-    model = "llama-3.3-70b-versatile"
+def _create_completion(
+    prompt: str,
+    system: str,
+    analysis_type: str,
+    prompt_version: Optional[str],
+    max_tokens: int,
+    stream: bool = False
+):
+    """
+    Open a chat completion through the routing table, falling back when the primary
+    model is rate-limited or slow.
 
-    try:
-        logger.info(f"AI Request - Type: {analysis_type}, Model: {model}")
-
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
+    Returns (response, model, start_time, is_fallback). Failures are recorded and raised as HTTPException.
+    """
+    route = get_route(analysis_type)
+    models = [route.model] + ([route.fallback_model] if route.fallback_model else [])
+
+    for attempt, model in enumerate(models):
+        is_fallback = attempt > 0
+        has_fallback = attempt + 1 < len(models)
+        # Fail fast on the primary model when there is a fallback to switch to
+        request_client = client.with_options(max_retries=0, timeout=route.timeout) if has_fallback else client
+        start_time = time.time()
+
+        try:
+            log_ai_request(analysis_type, model, prompt_version=prompt_version)
+
+            response = request_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=route.temperature,
+                max_tokens=max_tokens,
+                stream=stream
+            )
+            return response, model, start_time, is_fallback
+
+        except (RateLimitError, APITimeoutError) as e:
+            ai_metrics.record_call(
+                analysis_type, model, (time.time() - start_time) * 1000, max_tokens,
+                fallback=is_fallback, error=type(e).__name__
+            )
+            if not has_fallback:
+                log_error(e, context=f"AI Request ({analysis_type})")
+                raise HTTPException(status_code=500, detail=f"AI Error: {str(e)}")
+            logger.warning(f"AI Fallback - Type: {analysis_type}, Model: {model} -> {models[attempt + 1]} ({type(e).__name__})")
+
+        except Exception as e:
+            ai_metrics.record_call(
+                analysis_type, model, (time.time() - start_time) * 1000, max_tokens,
+                fallback=is_fallback, error=type(e).__name__
+            )
+            log_error(e, context=f"AI Request ({analysis_type})")
+            raise HTTPException(status_code=500, detail=f"AI Error: {str(e)}")
+
+
+def _record_usage(analysis_type: str, model: str, start_time: float, max_tokens: int,
+                  usage, prompt_version: Optional[str], is_fallback: bool) -> None:
+    """Log token usage (when the API reports it) and record the call"""
+    duration_ms = (time.time() - start_time) * 1000
+    prompt_tokens = completion_tokens = 0
+    if usage:
+        prompt_tokens = usage.prompt_tokens
+        completion_tokens = usage.completion_tokens
+        logger.info(
+            f"AI Response - Type: {analysis_type}, Model: {model}, Prompt: {prompt_version}, "
+            f"Tokens: {usage.total_tokens}, Max tokens: {max_tokens}, Duration: {duration_ms:.0f}ms"
         )
+    ai_metrics.record_call(
+        analysis_type, model, duration_ms, max_tokens,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        fallback=is_fallback
+    )
 
-        # Log token usage if available
-        if hasattr(response, 'usage') and response.usage:
-            tokens = response.usage.total_tokens
-            logger.info(f"AI Response - Type: {analysis_type}, Tokens: {tokens}")
-
-        content = response.choices[0].message.content
-        if content is None:
-            raise ValueError("AI response content is None")
-        return content
 
-    except Exception as e:
-        log_error(e, context=f"AI Request ({analysis_type})")
-        raise HTTPException(status_code=500, detail=f"AI Error: {str(e)}")
+def call_ai(
+    prompt: str,
+    system: str,
+    analysis_type: str = "general",
+    prompt_version: Optional[str] = None,
+    max_lines: Optional[int] = None
+) -> str:
+    """Call Groq API through the routing table and return the full response text"""
+    max_tokens = max_tokens_for(max_lines, get_route(analysis_type).max_tokens_cap)
+    response, model, start_time, is_fallback = _create_completion(
+        prompt, system, analysis_type, prompt_version, max_tokens
+    )
+    _record_usage(analysis_type, model, start_time, max_tokens,
+                  getattr(response, 'usage', None), prompt_version, is_fallback)
+
+    content = response.choices[0].message.content
+    if content is None:
+        log_error(ValueError("AI response content is None"), context=f"AI Request ({analysis_type})")
+        raise HTTPException(status_code=500, detail="AI Error: AI response content is None")
+    return content
+
+
+def call_ai_stream(
+    prompt: str,
+    system: str,
+    analysis_type: str = "general",
+    prompt_version: Optional[str] = None,
+    max_lines: Optional[int] = None
+) -> Iterator[str]:
+    """Like call_ai, but yields the response text as it is generated"""
+    max_tokens = max_tokens_for(max_lines, get_route(analysis_type).max_tokens_cap)
+    response, model, start_time, is_fallback = _create_completion(
+        prompt, system, analysis_type, prompt_version, max_tokens, stream=True
+    )
+    usage = None
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        # Groq reports usage on the final chunk
+        x_groq = getattr(chunk, 'x_groq', None)
+        usage = getattr(x_groq, 'usage', None) or usage
+    _record_usage(analysis_type, model, start_time, max_tokens, usage, prompt_version, is_fallback)
 
 # ============ ANALYSIS FUNCTIONS ============
 
-def analyze_career(profile: UserProfile) -> str:
-    """Generate career path analysis with 2025 market insights"""
+def shared_section(analysis_type: str, heading: str, industry: Optional[str]) -> str:
+    """A profile-independent section, generated once per industry and prompt version"""
+    rendered = render_shared(analysis_type, heading, industry)
 
-    # Determine industry from user profile
-    industry = profile.primary_industry or "Technology & Engineering"
-
-    # Industry-specific system prompts
-    industry_prompts = {
-        "Technology & Engineering": "You are an experienced tech career coach. As of 2025, you provide CLEAR and ACTIONABLE roadmaps with current market data, trending technologies, and realistic salary benchmarks. You stay updated on the latest tools, frameworks, and industry trends.",
-        "Business & Finance": "You are an experienced business and finance career consultant. As of 2025, you provide CLEAR and ACTIONABLE roadmaps for MBA, consulting, finance, and corporate careers with current market data, realistic salary benchmarks, and industry trends.",
-        "Healthcare & Medicine": "You are an experienced healthcare career consultant. As of 2025, you provide CLEAR and ACTIONABLE roadmaps for medical professionals with current market data, specialty insights, residency paths, and realistic salary benchmarks.",
-        "Creative & Design": "You are an experienced creative industry career consultant. As of 2025, you provide CLEAR and ACTIONABLE roadmaps for designers, artists, and creative professionals with current market data, portfolio strategies, and realistic income benchmarks.",
-        "Education": "You are an experienced education career consultant. As of 2025, you provide CLEAR and ACTIONABLE roadmaps for educators and academic professionals with current market data and realistic salary benchmarks.",
-        "Legal": "You are an experienced legal career consultant. As of 2025, you provide CLEAR and ACTIONABLE roadmaps for legal professionals with current market data, firm paths, and realistic salary benchmarks.",
-        "Other": "You are an experienced multi-industry career coach. As of 2025, you provide CLEAR and ACTIONABLE roadmaps with current market data and realistic salary benchmarks for various industries."
-    }
+    cached = shared_cache.get(rendered.cache_key)
+    if cached is not None:
+        return cached
 
-    system = industry_prompts.get(industry, industry_prompts["Other"])
-
-    prompt = f"""DETAILED PERSONAL CAREER ANALYSIS:
-
-👤 PERSON:
-- {profile.name}, {profile.age} years old, {profile.university} {profile.major} ({profile.grad_year})
-- Location: {profile.location}, Open to relocation: {profile.relocation_ok}
-- Biggest obstacle: {profile.biggest_obstacle}, What they need most: {profile.need_most}
-
-💼 CURRENT SITUATION:
-- Position: {profile.current_job} (${profile.current_salary}/year)
-- Satisfaction: {profile.job_satisfaction}/10, Experience: {profile.years_current_job}
-- Industry: {profile.industry}, Company size: {profile.company_size}
-
-🛠️ SKILLS:
-{"- Key Skills: " + profile.key_skills if profile.key_skills else "- Professional skills not specified"}
-{"- Skill Level: " + profile.skill_level if profile.skill_level else ""}
-{"- Tools/Platforms: " + profile.tools_platforms if profile.tools_platforms else ""}
-{"- Certifications/Licenses: " + profile.certifications if profile.certifications else ""}
-{"- Portfolio/Work: " + profile.portfolio_work if profile.portfolio_work else ""}
-
-🎓 EDUCATION:
-- Master's consideration: {profile.considering_masters}
-- Fields interested: {profile.masters_fields_interested}
-- Location preference: {profile.masters_location_preference}
-- Can afford: {profile.can_afford_masters}
-
-🎯 GOALS:
-- Dream role: {profile.dream_job}
-- Target salary: ${profile.dream_salary}/year (in {profile.target_years} years)
-- Career path preference: {profile.career_path_preference}
-- Work-life balance importance: {profile.work_life_balance}
-- Learning commitment: {profile.time_commit} hours/week
-- Learning style: {profile.learning_style}
-
-CREATE DETAILED CAREER PLAN (Markdown format):
-
-**IMPORTANT 2025 CONTEXT**:
-- Use 2025 salary data from Levels.fyi, Glassdoor, LinkedIn Salary
-- Recommend current tools: Cursor IDE, Claude/GPT-4, v0.dev, Replit Agent, etc.
-- Focus on trending tech: LLMs/AI agents, Next.js 15, Python 3.12, Rust, Go
-- Mention 2025 market trends: 🔥 Hot, ⚡ Rising, 📈 Growing, 📊 Steady
-
-## 1️⃣ Current Situation Analysis (2025 Perspective)
-- **Strengths** (3 points - mention if skills are 🔥 hot in 2025)
-- **Gaps/Risks** (3 points - what's outdated or missing in 2025 market)
-- **Master's Decision**: Should they do it? (clear reasoning with 2025 ROI data)
-
-## 2️⃣ Step-by-Step Roadmap
-- **First 3 Months**: Concrete actions (use 2025 tools/platforms)
-- **6-12 Months**: Skills/Certifications (trending in 2025)
-- **1-2 Years**: Position changes
-- **3-5 Years**: Reaching target role
-
-## 3️⃣ Priority Skills (2025 Edition)
-- **Immediate** (1-3 months): 🔥 Hot skills to learn NOW
-  - Specific versions: e.g., "Next.js 15 with Server Components", "FastAPI + Pydantic V2"
-- **Mid-term** (3-12 months): ⚡ Rising technologies
-- **Long-term** (1-2 years): 📈 Future-proof skills
-
-## 4️⃣ Projects & Certifications
-- **3 project recommendations** (using 2025 tech stack)
-  - Example: "Build an AI agent with LangChain + GPT-4 API"
-- **2-3 certifications** (2025 relevant)
-  - Prioritize: AWS/Azure AI certifications, etc.
-
-## 5️⃣ Salary & Timeline Projection (2025 Benchmark Data)
-| Year | Position | Salary (2025 $) | Market Trend | Notes |
-|------|----------|-----------------|--------------|-------|
-| 0 | {profile.current_job} | ${profile.current_salary} | - | Now |
-| ... | ... | ... | 🔥/⚡/📈 | ... |
-
-**Use 2025 salary ranges from Levels.fyi for {profile.dream_job}**
-
-## 6️⃣ Risks & Plan B
-- Failure probability (considering 2025 job market)
-- Things to watch out for (AI automation, market saturation)
-- Alternative plan
-
-## 7️⃣ 2025 Tools & Resources to Use NOW
-- **AI Coding**: Cursor, GitHub Copilot, v0.dev
-- **Learning**: YouTube creators, specific Discord communities
-- **Job Search**: Levels.fyi, Wellfound (AngelList), specific Slack/Discord
-
-CLEAR, ACTIONABLE, CURRENT. Max 60 lines.
-Every recommendation should feel like it's from 2025, not 2020."""
-
-    return call_ai(prompt, system, analysis_type="career")
+    section = call_ai(
+        rendered.prompt,
+        rendered.system,
+        analysis_type="shared",
+        prompt_version=rendered.version,
+        max_lines=rendered.max_lines
+    )
+    shared_cache.set(rendered.cache_key, section)
+    return section
 
-def analyze_roi(profile: UserProfile) -> str:
-    """Generate ULTRA DETAILED education ROI analysis with 2025 program recommendations"""
+def expand_analysis(analysis_type: str, profile: UserProfile) -> str:
+    """
+    Skeleton-then-expand: a fast call writes the outline and key numbers, then each
+    section is written concurrently from the shared header and stitched in order
+    """
+    plan = plan_expansion(analysis_type, profile.dict())
+
+    cached = analysis_cache.get(plan.cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit - Type: {analysis_type} (expanded), Prompt: {plan.version}")
+        return cached
+
+    outline = call_ai(
+        plan.skeleton.prompt,
+        plan.skeleton.system,
+        analysis_type="skeleton",
+        prompt_version=plan.version,
+        max_lines=plan.skeleton.max_lines
+    )
+    prompts = plan.expansion_prompts(outline)
+    with ThreadPoolExecutor(max_workers=min(EXPANSION_WORKERS, len(prompts))) as pool:
+        sections = list(pool.map(
+            lambda rendered: call_ai(
+                rendered.prompt,
+                rendered.system,
+                analysis_type=analysis_type,
+                prompt_version=rendered.version,
+                max_lines=rendered.max_lines
+            ),
+            prompts
+        ))
+
+    analysis = plan.stitch(sections)
+    analysis_cache.set(plan.cache_key, analysis)
+    return analysis
+
+def generate_analysis(
+    analysis_type: str,
+    profile: UserProfile,
+    upstream: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Render the analysis prompt, serving repeated requests from cache.
 
-    # Industry-specific education analysis
-    industry = profile.primary_industry or "Technology & Engineering"
-
-    industry_ed_prompts = {
-        "Technology & Engineering": "You are a world-class tech education consultant and financial analyst. As of 2025, you analyze Master's degrees, bootcamps, certifications, and self-learning for tech professionals with current tuition costs, 2025-2026 admission data, and ROI statistics.",
-        "Business & Finance": "You are a world-class business education consultant and financial analyst. As of 2025, you analyze MBA programs, executive education, CFA, CPA, and other business credentials with current costs, admission data, and ROI statistics.",
-        "Healthcare & Medicine": "You are a world-class medical education consultant and financial analyst. As of 2025, you analyze medical specialties, residency paths, fellowships, and additional certifications with current costs and ROI statistics.",
-        "Creative & Design": "You are a world-class creative education consultant and financial analyst. As of 2025, you analyze MFA programs, design bootcamps, specialized courses, and portfolio schools with current costs and ROI statistics.",
-        "Education": "You are a world-class education sector consultant and financial analyst. As of 2025, you analyze Master's in Education, EdD, PhD programs, and teaching certifications with current costs and ROI statistics.",
-        "Legal": "You are a world-class legal education consultant and financial analyst. As of 2025, you analyze law school (JD), LLM programs, legal specializations, and bar exam preparation with current costs and ROI statistics.",
-        "Other": "You are a world-class education consultant and financial analyst. As of 2025, you analyze various advanced degrees and professional certifications across industries with current costs and ROI statistics."
-    }
+    upstream holds summaries of other analyses' results for the prompt to build on.
+    """
+    if EXPANSION_ENABLED and analysis_type in EXPANDABLE and not upstream:
+        return expand_analysis(analysis_type, profile)
+
+    rendered = render_prompt(analysis_type, profile.dict(), upstream=upstream)
+
+    cached = analysis_cache.get(rendered.cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit - Type: {analysis_type}, Prompt: {rendered.version}")
+        return cached
+
+    if not rendered.shared:
+        analysis = call_ai(
+            rendered.prompt,
+            rendered.system,
+            analysis_type=analysis_type,
+            prompt_version=rendered.version,
+            max_lines=rendered.max_lines
+        )
+    else:
+        # Shared sections are usually cached; missing ones are written alongside the personal part
+        with ThreadPoolExecutor(max_workers=1 + len(rendered.shared)) as pool:
+            shared = {
+                heading: pool.submit(shared_section, analysis_type, heading, profile.primary_industry)
+                for heading in rendered.shared
+            }
+            analysis = call_ai(
+                rendered.prompt,
+                rendered.system,
+                analysis_type=analysis_type,
+                prompt_version=rendered.version,
+                max_lines=rendered.max_lines
+            )
+            analysis = stitch_shared(analysis_type, analysis, {h: f.result() for h, f in shared.items()})
+    analysis_cache.set(rendered.cache_key, analysis)
+    return analysis
 
-    system = industry_ed_prompts.get(industry, industry_ed_prompts["Other"])
-
-    years_left = int(profile.retire_age) - int(profile.age)
-    current_age = int(profile.age)
-
-    prompt = f"""ULTRA DETAILED EDUCATION & MASTER'S ANALYSIS + PROGRAM RECOMMENDATIONS
-
-👤 PERSON:
-- {profile.name}, {current_age} years old, {profile.university} {profile.major}
-- Master's consideration: {profile.considering_masters}
-- Fields interested: {profile.masters_fields_interested}
-- Location preference: {profile.masters_location_preference}
-- Program language: {profile.masters_program_language}
-- Type: {profile.masters_type}
-- Budget: {profile.can_afford_masters}
-- Timeline: {profile.masters_timeline}
-- Work while studying: {profile.masters_work_while_study}
-- Priority: {profile.masters_priority}
-- Programs in mind: {profile.masters_specific_programs}
-- Concerns: {profile.masters_concerns}
-
-💰 FINANCIAL:
-- Current salary: ${profile.current_salary}, Savings: ${profile.savings}
-- Target: {profile.dream_job} - ${profile.dream_salary}/year
-- FIRE goal: Retire at {profile.retire_age}, {years_left} years left
-- Risk tolerance: {profile.risk_tolerance}
-
-**IMPORTANT 2025 CONTEXT**:
-- Use 2025-2026 tuition costs (check recent updates!)
-- Reference 2024-2025 admission cycles and acceptance rates
-- Use post-COVID salary data (2023-2025 graduates)
-- Mention program changes, new specializations
-- For each university: Check if they added AI/ML tracks in 2024-2025
-- Include trend indicators: 🔥 Program getting more competitive, ⚡ New program, 📈 Rising in rankings
-
-## 1️⃣ MASTER'S DECISION ANALYSIS
-
-### Is a Master's Necessary for You?
-- For {profile.dream_job}, is a master's **REQUIRED** or just a **BONUS**?
-- Can you reach this position WITHOUT a master's?
-- What's the real value of a master's in this field?
-
-## 2️⃣ DETAILED SCENARIO COMPARISON (6 Scenarios)
-
-For each scenario provide:
-- Total cost (tuition + living + opportunity cost)
-- Starting salary (post-master's)
-- Total earnings over {years_left} years
-- NPV (5% discount rate)
-- ROI (%)
-- How many years to reach {profile.dream_job}
-- Impact on FIRE goal ({years_left} years)
-
-### Scenario 1: NO Master's - Straight to Work
-- Advantages / Disadvantages
-- Financial calculations
-
-### Scenario 2: Public University Master (Low/Free Cost)
-- Which universities (top 3-5 in user's country/region)
-- Advantages / Disadvantages
-- Financial calculations
-
-### Scenario 3: Private University Master ($5-15K)
-- Which specific programs (concrete recommendations)
-- Advantages / Disadvantages
-- Financial calculations
-
-### Scenario 4: European Master ($15-30K)
-- Which countries/programs (budget-friendly)
-- Germany (tuition-free), Netherlands, Sweden, etc.
-- Advantages / Disadvantages
-- Financial calculations
-
-### Scenario 5: US/UK Top Programs ($60K+)
-- Which programs (especially evaluate {profile.masters_specific_programs} if mentioned)
-- Scholarship opportunities
-- Advantages / Disadvantages
-- Financial calculations
-
-### Scenario 6: Online/Part-time Master
-- Which programs (Georgia Tech OMSCS, UT Austin, etc.)
-- Advantages / Disadvantages
-- Financial calculations
-
-## 3️⃣ CONCRETE PROGRAM RECOMMENDATIONS
-
-Based on your profile, the BEST 5-7 PROGRAMS for you:
-
-For each program provide:
-- **Program Name & University**
-- **Location & City**
-- **Duration** (1 year / 2 years / part-time)
-- **Total Cost** (realistic estimate)
-- **Your Admission Chance** (low/medium/high + reasoning)
-- **Strengths** (career impact, network, location)
-- **Weaknesses**
-- **ROI Score** (/10)
-- **Fit Score for You** (/10)
-- **Application Deadline** (approximate)
-
-Example format:
-### Program 1: MIT Computer Science MS
-- **Location**: Cambridge, MA, USA
-- **Duration**: 2 years (thesis-based)
-- **Cost**: ~$80K
-- **Admission Chance**: Medium (strong tech background needed)
-- **Strengths**: Prestige, network, research opportunities
-- **Weaknesses**: High cost, competitive admission
-- **ROI**: 9/10
-- **Fit**: 7/10
-
-## 4️⃣ DETAILED FINANCIAL TABLE
-
-| Scenario | Cost | Starting Salary | 5Y Total | 10Y Total | NPV | ROI | FIRE Impact |
-|---------|------|------------------|----------|-----------|-----|-----|-------------|
-| 1. Work | $0   | $?K             | $?K      | $?K       | $?K | -   | ? years     |
-| 2. Public | $?K | $?K            | $?K      | $?K       | $?K | ?%  | ? years     |
-| 3. Private | $?K | $?K           | $?K      | $?K       | $?K | ?%  | ? years     |
-| 4. Europe | $?K  | $?K            | $?K      | $?K       | $?K | ?%  | ? years     |
-| 5. US/UK | $?K  | $?K             | $?K      | $?K       | $?K | ?%  | ? years     |
-| 6. Online | $?K | $?K             | $?K      | $?K       | $?K | ?%  | ? years     |
-
-## 5️⃣ ADDRESSING YOUR CONCERNS
-
-Concerns: {profile.masters_concerns}
-
-Address EACH concern individually with solutions and recommendations.
-
-## 6️⃣ CLEAR RECOMMENDATION & DECISION TREE
-
-### IF {profile.masters_priority} is your priority:
-→ Which scenario/program should you choose?
-→ Why this one?
-→ How to apply?
-→ How to finance it?
-
-### ALTERNATIVE PLAN:
-If your best option doesn't work out, what's Plan B?
-
-### TIMELINE:
-- Now - 3 months: ?
-- 3-6 months: ?
-- 6-12 months: ?
-- Application deadlines
-
-### FINAL VERDICT:
-1 paragraph, CLEAR decision: Do/Don't do a master's + which program + why?
-
-Max 100 lines. DETAILED, CONCRETE, ACTIONABLE.
-Use real program names, universities, cities.
-Make calculations REALISTIC."""
-
-    return call_ai(prompt, system, analysis_type="roi")
+def analyze_career(profile: UserProfile) -> str:
+    """Generate career path analysis with 2025 market insights"""
+    return generate_analysis("career", profile)
+
+def analyze_roi(profile: UserProfile) -> str:
+    """Generate ULTRA DETAILED education ROI analysis with 2025 program recommendations"""
+    return generate_analysis("roi", profile)
 
 def analyze_fire(profile: UserProfile) -> str:
     """Generate FIRE retirement plan with 2025 investment strategies"""
-    system = "You are a FIRE (Financial Independence, Retire Early) movement expert. As of 2025, you create REALISTIC and ACTIONABLE retirement plans using current inflation rates, 2025 investment platforms, updated 4% rule discussions, and modern portfolio strategies. You understand post-2024 market conditions and tax-advantaged accounts."
-
-    current_age = int(profile.age)
-    retire_age = int(profile.retire_age)
-    years = retire_age - current_age
-
-    prompt = f"""PERSONALIZED FIRE RETIREMENT PLAN (Markdown format):
-
-👤 PERSON:
-{profile.name}: Age {current_age} → {retire_age} ({years} years to FIRE)
-Lifestyle: {profile.fire_lifestyle}
-Location: {profile.retirement_location}
-Passive income interest: {profile.passive_income_interest}
-
-💰 FINANCIAL SITUATION:
-- Current salary: ${profile.current_salary}/year
-- Dream salary: ${profile.dream_salary}/year
-- Monthly expenses: ${profile.monthly_expenses}
-- Savings: ${profile.savings}
-- Monthly savings goal: ${profile.monthly_savings_goal}
-- Debts: ${profile.debts}
-- Family support: {profile.family_support}
-- Risk tolerance: {profile.risk_tolerance}
-
-**IMPORTANT 2025 CONTEXT**:
-- Use 2025 inflation rate (current estimates)
-- Recommend 2025 investment platforms: Vanguard, Fidelity, IBKR, Schwab
-- Reference updated 4% rule discussions (some say 3.5% post-2024)
-- ETF recommendations: VT, VTI, VXUS (check 2025 expense ratios)
-- Tax optimization: Roth IRA limits 2025, backdoor Roth strategies
-- Include crypto allocation debate (if risk tolerance allows)
-- Market trend: 📈 Consider recent bull/bear market impact
-
-## 1️⃣ Reality Check
-- Is retiring at {retire_age} realistic in {years} years?
-- What are the main risks and challenges?
-- Required portfolio size (4% rule calculation)
-
-## 2️⃣ Monthly Savings Plan
-- With current salary (${profile.current_salary}): How much can you save?
-- With target salary (${profile.dream_salary}): How much can you save?
-- Required savings rate: ?%
-- Can you reach it? How?
-
-## 3️⃣ Investment Strategy
-Risk tolerance: {profile.risk_tolerance}
-- Stocks/ETFs: ?%
-- Bonds: ?%
-- Real Estate: ?%
-- Alternative investments: ?%
-- Recommended platforms/brokers
-- Specific fund recommendations
-
-## 4️⃣ Annual Milestones
-| Year | Age | Portfolio Value | How to Reach |
-|------|-----|-----------------|--------------|
-| 0 | {current_age} | ${profile.savings} | Current |
-| ... | ... | ... | ... |
-| {years} | {retire_age} | $? | FIRE! |
-
-## 5️⃣ Income Growth Strategy
-- Main job salary projection
-- Side income target (from side hustle plan)
-- Is side income necessary for FIRE?
-- How to accelerate income growth
-
-## 6️⃣ Expense Optimization
-- Current: ${profile.monthly_expenses}/month
-- Optimized target: ?
-- Major cutting opportunities
-- Lifestyle changes needed
-- Impact on FIRE timeline
-
-## 7️⃣ Emergency Plans
-- **Bear Market**: What if market drops 50%?
-- **Job Loss**: Backup plan?
-- **Health Issues**: Insurance coverage?
-- **Inflation**: How to protect?
-
-## 8️⃣ First 30 Days Action Plan
-5 concrete steps to start NOW:
-1. ?
-2. ?
-3. ?
-4. ?
-5. ?
-
-## 9️⃣ Success Probability
-- With current approach: ?%
-- With all recommendations: ?%
-- Key factors affecting success
-- Biggest obstacles to watch out for
-
-## 🔟 FIRE Number Breakdown
-- Annual expenses in retirement: $?
-- Required portfolio (4% rule): $?
-- With {profile.fire_lifestyle} lifestyle: $?
-- Monthly passive income needed: $?
-
-Max 60 lines. REALISTIC, DETAILED, ACTIONABLE."""
-
-    return call_ai(prompt, system, analysis_type="fire")
+    return generate_analysis("fire", profile)
 
 def analyze_side_hustle(profile: UserProfile) -> str:
     """Generate side income strategies with 2025 platforms and trends"""
-
-    # Industry-specific side hustle opportunities
-    industry = profile.primary_industry or "Technology & Engineering"
-
-    industry_hustle_prompts = {
-        "Technology & Engineering": "You are an entrepreneurship and tech side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for tech professionals using current platforms (Gumroad, Lemon Squeezy, Stripe), trending niches (AI tools, no-code, SaaS), and realistic 2025 freelance rates.",
-        "Business & Finance": "You are an entrepreneurship and business side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for business professionals including consulting, coaching, courses, and financial advisory with realistic 2025 rates.",
-        "Healthcare & Medicine": "You are an entrepreneurship and healthcare side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for medical professionals including telemedicine, medical writing, consulting, and education with realistic 2025 rates.",
-        "Creative & Design": "You are an entrepreneurship and creative side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for creatives including freelance work, digital products, stock assets, and courses with realistic 2025 rates.",
-        "Education": "You are an entrepreneurship and education side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for educators including tutoring, course creation, educational content, and consulting with realistic 2025 rates.",
-        "Legal": "You are an entrepreneurship and legal side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas for legal professionals including consulting, legal writing, courses, and advisory services with realistic 2025 rates.",
-        "Other": "You are an entrepreneurship and side income consultant. As of 2025, you provide CONCRETE, ACTIONABLE side business ideas using current platforms and realistic 2025 rates for various industries."
-    }
-
-    system = industry_hustle_prompts.get(industry, industry_hustle_prompts["Other"])
-
-    prompt = f"""PERSONALIZED SIDE INCOME STRATEGIES (Markdown format):
-
-👤 PERSON:
-{profile.name}, {profile.age} years old
-Industry: {industry}
-{"Key Skills: " + profile.key_skills if profile.key_skills else ""}
-{"Tools/Platforms: " + profile.tools_platforms if profile.tools_platforms else ""}
-{"Portfolio/Work: " + profile.portfolio_work if profile.portfolio_work else ""}
-
-⏰ TIME & PREFERENCES:
-- Available time for side hustle: {profile.time_for_side}
-- Interests: {profile.side_interests}
-- Freelance experience: {profile.freelance_exp}
-- Preferred side income type: {profile.preferred_side_income}
-- Monthly goal: ${profile.monthly_side_income_goal}
-- Learning commitment: {profile.time_commit} hours/week
-- Work-life balance importance: {profile.work_life_balance}
-
-💰 GOALS:
-- FIRE target age: {profile.retire_age}
-- Monthly side income goal: ${profile.monthly_side_income_goal}
-- Risk tolerance: {profile.risk_tolerance}
-
-**IMPORTANT 2025 CONTEXT**:
-- Recommend 2025 platforms: Gumroad, Lemon Squeezy, Whop, Stripe
-- Trending niches: 🔥 AI tools/wrappers, AI content, no-code solutions, automation
-- Freelance rates: Use 2025 Upwork/Contra/Toptal averages
-- Creator tools: Beehiiv, ConvertKit, Substack (2025 features)
-- Payment: Stripe Climate, crypto payments becoming mainstream
-- Market indicators: 🔥 Very hot / ⚡ Growing / 📈 Emerging
-
-## 5 SIDE INCOME STRATEGIES (Easy → Hard)
-
-For EACH strategy provide:
-
-### Strategy 1: Freelance/Consulting
-- **What you'll do**: Specific services (be concrete)
-- **Income Timeline**: Month 1 $?, Month 6 $?, Year 1 $?
-- **Time Investment**: Initial setup hours, weekly maintenance hours
-- **Startup Cost**: $?
-- **Fit Score**: ?/10 (how well this matches your skills/interests)
-- **First 30 Days Plan**:
-  - Week 1: ?
-  - Week 2: ?
-  - Week 3: ?
-  - Week 4: ?
-- **Success Probability**: ?%
-- **Platforms to Use**: (Upwork, Fiverr, etc.)
-- **How to Get First Client**: Concrete steps
-
-### Strategy 2: Product/SaaS Development
-- **What you'll do**: Specific product idea
-- **Income Timeline**: Month 1 $?, Month 6 $?, Year 1 $?
-- **Time Investment**: Initial setup hours, weekly maintenance hours
-- **Startup Cost**: $?
-- **Fit Score**: ?/10
-- **First 30 Days Plan**: Week-by-week
-- **Success Probability**: ?%
-- **Tech Stack**: Recommended technologies
-- **Monetization**: How will you charge?
-
-### Strategy 3: Content Creation/Education
-- **What you'll do**: (YouTube, courses, blog, newsletter)
-- **Income Timeline**: Month 1 $?, Month 6 $?, Year 1 $?
-- **Time Investment**: Initial setup hours, weekly maintenance hours
-- **Startup Cost**: $?
-- **Fit Score**: ?/10
-- **First 30 Days Plan**: Week-by-week
-- **Success Probability**: ?%
-- **Platform**: Where to publish?
-- **Content Ideas**: First 10 topics
-
-### Strategy 4: Passive Income Products
-- **What you'll do**: (Digital products, templates, tools)
-- **Income Timeline**: Month 1 $?, Month 6 $?, Year 1 $?
-- **Time Investment**: Initial setup hours, weekly maintenance hours
-- **Startup Cost**: $?
-- **Fit Score**: ?/10
-- **First 30 Days Plan**: Week-by-week
-- **Success Probability**: ?%
-- **Distribution**: How to sell?
-
-### Strategy 5: Advanced/Scalable Business
-- **What you'll do**: Specific business model
-- **Income Timeline**: Month 1 $?, Month 6 $?, Year 1 $?
-- **Time Investment**: Initial setup hours, weekly maintenance hours
-- **Startup Cost**: $?
-- **Fit Score**: ?/10
-- **First 30 Days Plan**: Week-by-week
-- **Success Probability**: ?%
-- **Scaling Plan**: How to grow?
-
-## CLEAR RECOMMENDATION
-
-### Which strategy should you START with?
-- **Pick**: Strategy #?
-- **Why**: Reasoning based on skills, time, goals
-- **First 7 Days Action Plan**:
-  - Day 1: ?
-  - Day 2-3: ?
-  - Day 4-5: ?
-  - Day 6-7: ?
-
-### 6-Month Income Target
-- Conservative: $?/month
-- Realistic: $?/month
-- Optimistic: $?/month
-
-### Impact on FIRE Goal
-- Without side income: Retire at {profile.retire_age}
-- With ${profile.monthly_side_income_goal}/month side income: Retire ? years earlier
-
-### Backup Plan
-If your primary strategy doesn't work after 3 months, what's Plan B?
-
-Max 80 lines. CONCRETE, SPECIFIC, ACTIONABLE.
-Real platforms, real numbers, real timelines."""
-
-    return call_ai(prompt, system, analysis_type="side_hustle")
+    return generate_analysis("side_hustle", profile)
 
 def analyze_interests_roadmap(profile: UserProfile) -> str:
     """Generate passion-based career roadmap and alternative paths"""
-    system = "You are a career pivot specialist and passion-career alignment expert across all industries. You help people discover career paths that align with their true interests - whether in tech, business, healthcare, creative fields, or any other sector. As of 2025, you provide current industry insights and realistic transition strategies for any profession."
-
-    prompt = f"""PASSION-ALIGNED CAREER ROADMAP (Markdown format):
-
-👤 PERSON:
-{profile.name}, {profile.age} years old
-Current: {profile.current_job} (${profile.current_salary}/year)
-Industry: {profile.primary_industry or "Not specified"}
-{"Key Skills: " + profile.key_skills if profile.key_skills else ""}
-Dream role: {profile.dream_job}
-
-💝 PASSIONS & INTERESTS:
-- **Topics that excite them**: {profile.passion_topics}
-- **Flow state activities**: {profile.flow_activities}
-- **Dream projects**: {profile.dream_projects}
-- **Role models/inspiration**: {profile.role_models}
-
-🎯 CURRENT GOALS:
-- Target role: {profile.dream_job} (${profile.dream_salary}/year in {profile.target_years} years)
-- Career preference: {profile.career_path_preference}
-- FIRE goal: Retire at {profile.retire_age}
-
-## 1️⃣ PASSION-CAREER ALIGNMENT ANALYSIS
-
-### How aligned is your current path with your passions?
-- Current role ({profile.current_job}) vs interests alignment: ?/10
-- Dream role ({profile.dream_job}) vs passions alignment: ?/10
-- Are you on the right track or should you pivot?
-
-### Hidden Opportunities
-Based on passions ({profile.passion_topics}), identify 3-5 career paths they might not have considered:
-- Emerging roles in 2025 that match their interests
-- Intersection of their skills + passions
-- Non-obvious opportunities
-
-## 2️⃣ ALTERNATIVE CAREER PATHS (Based on Passions)
-
-For EACH path provide (3-5 paths total):
-
-### Path 1: [Role Name] 🔥
-**Example**: If interested in "AI + teaching" → AI/ML Educator, DevRel Engineer
-**Example**: If interested in "game dev" → Game AI Engineer, Technical Game Designer
-
-- **What it is**: Clear description
-- **Why it matches your passions**: Connect to {profile.passion_topics}, {profile.flow_activities}
-- **2025 Market Demand**: 🔥 Hot / ⚡ Rising / 📈 Growing / 📊 Steady / ⬇️ Declining
-- **Salary Range (2025)**: Entry: $?, Mid: $?, Senior: $?
-- **Required Skills**: What you already have vs what you need
-- **Time to Transition**: ? months realistically
-- **Companies Hiring**: Specific companies (2025 data)
-- **How to Start**: First 3 concrete steps
-- **Resources**: Specific courses, communities, people to follow
-- **Success Probability**: ?% (considering current background)
-- **Alignment Score**: ?/10 (passion fit)
-
-### Path 2-5: [Repeat format]
-
-## 3️⃣ PIVOT vs STAY COMPARISON
-
-### Option A: Stay on Current Path ({profile.dream_job})
-- Pros (3 points)
-- Cons (3 points)
-- 5-year projection
-- Passion fulfillment: ?/10
-
-### Option B: Pivot to Passion-Aligned Path ([Best Alternative])
-- Pros (3 points)
-- Cons (3 points)
-- 5-year projection
-- Passion fulfillment: ?/10
-
-### Financial Comparison
-| Path | Year 1 | Year 3 | Year 5 | FIRE Impact |
-|------|--------|--------|--------|-------------|
-| Current ({profile.dream_job}) | $? | $? | $? | Retire at {profile.retire_age} |
-| Passion ([Alternative]) | $? | $? | $? | Retire at ? |
-
-## 4️⃣ HYBRID APPROACH (Best of Both Worlds)
-
-Can you blend passion with current path?
-- **Strategy 1**: Side project approach (keep {profile.current_job}, build passion project)
-- **Strategy 2**: Internal pivot (same company, different role)
-- **Strategy 3**: Gradual transition (part-time both for ? months)
-- **Recommended**: Which hybrid strategy is best?
-
-## 5️⃣ CONCRETE TRANSITION PLAN
-
-### If you decide to pivot to [Best Passion-Aligned Path]:
-
-**Months 1-3: Foundation**
-- Week-by-week action plan
-- Skills to acquire
-- Projects to build
-- Network to build
-
-**Months 4-6: Building Credibility**
-- Concrete deliverables
-- Portfolio pieces
-- First paid work / contributions
-
-**Months 7-12: Transition**
-- When to quit current job (if needed)
-- How to get first role in new field
-- Financial safety net needed: $?
-
-### First 7 Days Starting TODAY:
-- Day 1: ?
-- Day 2-3: ?
-- Day 4-5: ?
-- Day 6-7: ?
-
-## 6️⃣ INSPIRATION & VALIDATION
-
-### Real People Who Made Similar Pivots:
-- Example 1: [Person/story similar to user's situation]
-- Example 2: [Another success story]
-- Where to find community: Specific Discord/Slack/communities (2025)
-
-### Your Dream Projects ({profile.dream_projects})
-How can these become reality?
-- Feasibility analysis
-- Monetization potential
-- Steps to start
-
-### Role Models ({profile.role_models})
-What can you learn from them?
-- Their journey insights
-- Applicable lessons
-- How to connect/learn from them
-
-## 7️⃣ FINAL RECOMMENDATION
-
-### Should you pivot or stay?
-**Clear verdict**: Stay on current path / Pivot to [X] / Hybrid approach
-**Reasoning**: 2-3 sentences
-
-### If PIVOT recommended:
-- Which path: [Specific role]
-- Why this one: [Reasoning based on passion + pragmatism]
-- Timeline: Start transition in ? months
-- Success keys: 3 critical factors
-
-### If STAY recommended:
-- How to inject passion into current path
-- Side projects to pursue
-- Long-term satisfaction strategy
-
-Max 90 lines. CONCRETE, INSPIRING, REALISTIC.
-Use 2025 job market data, real company names, specific resources.
-Show them a path where work = passion."""
-
-    return call_ai(prompt, system, analysis_type="interests_roadmap")
+    return generate_analysis("interests_roadmap", profile)
+
+ANALYSES = {
+    "career": analyze_career,
+    "roi": analyze_roi,
+    "fire": analyze_fire,
+    "side_hustle": analyze_side_hustle,
+    "interests_roadmap": analyze_interests_roadmap
+}
+
+# UserProfile fields each analysis reads, declared by its prompt template. Cache keys
+# are built from these fields only, so editing a field leaves other analyses cached.
+ANALYSIS_FIELDS = {analysis_type: TEMPLATES[analysis_type].fields for analysis_type in ANALYSES}
+
+_unknown_fields = set().union(*ANALYSIS_FIELDS.values()) - set(UserProfile.model_fields)
+if _unknown_fields:
+    raise ValueError(f"Prompt templates read fields missing from UserProfile: {sorted(_unknown_fields)}")
+
+def upstream_summaries(analysis_type: str, results: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Summaries of the upstream results an analysis builds on, None when it has no dependencies"""
+    headings = DEPENDENCIES.get(analysis_type, {})
+    return {name: summarize(results[name], headings[name]) for name in headings} or None
+
+def analysis_cache_key(
+    analysis_type: str,
+    profile: UserProfile,
+    upstream: Optional[Dict[str, str]] = None
+) -> str:
+    """Cache key generate_analysis uses for this analysis of the profile and upstream summaries"""
+    if EXPANSION_ENABLED and analysis_type in EXPANDABLE and not upstream:
+        return plan_expansion(analysis_type, profile.dict()).cache_key
+    return render_prompt(analysis_type, profile.dict(), upstream=upstream).cache_key
+
+def _cached_sections(profile: UserProfile) -> Dict[str, str]:
+    """Sections already in the analysis cache, keyed like the per-analysis requests"""
+    cached = {}
+    for analysis_type in ANALYSIS_TYPES:
+        try:
+            key = analysis_cache_key(analysis_type, profile)
+        except ValueError:
+            continue  # not renderable for this profile; generating it reports the error
+        analysis = analysis_cache.get(key)
+        if analysis is not None:
+            cached[analysis_type] = analysis
+    return cached
+
+def _store_section(profile: UserProfile, analysis_type: str, analysis: str) -> None:
+    """Cache a combined-mode section so single analyses of the same profile reuse it"""
+    analysis_cache.set(analysis_cache_key(analysis_type, profile), analysis)
+
+def run_combined(profile: UserProfile) -> Dict[str, str]:
+    """
+    Generate all five analyses in one request: the profile is sent once and the
+    response is split on section delimiters. Sections the model skipped are filled
+    in with single-analysis requests.
+    """
+    results = _cached_sections(profile)
+    if len(results) < len(ANALYSIS_TYPES):
+        rendered = render_combined(profile.dict())
+        response = call_ai(
+            rendered.prompt,
+            rendered.system,
+            analysis_type="combined",
+            prompt_version=rendered.version,
+            max_lines=rendered.max_lines
+        )
+        for analysis_type, analysis in split_sections(response).items():
+            if analysis_type not in results:
+                _store_section(profile, analysis_type, analysis)
+                results[analysis_type] = analysis
+
+    for analysis_type in ANALYSIS_TYPES:
+        if analysis_type not in results:
+            logger.warning(f"Combined response missing section {analysis_type}, generating separately")
+            results[analysis_type] = ANALYSES[analysis_type](profile)
+    return {analysis_type: results[analysis_type] for analysis_type in ANALYSIS_TYPES}
+
+def analysis_dag(profile: UserProfile, fail_fast: bool = True) -> DagRun:
+    """
+    analyze-all as a DAG: analyses without dependencies start at once; dependent ones
+    (FIRE on career and side hustle, interests on career) start when their upstream
+    analyses finish and get compact summaries of them instead of re-deriving them
+    """
+    def node(analysis_type: str):
+        def run(upstream: Dict[str, str]) -> str:
+            return generate_analysis(analysis_type, profile, upstream=upstream_summaries(analysis_type, upstream))
+        return tuple(DEPENDENCIES.get(analysis_type, {})), run
+
+    return DagRun({t: node(t) for t in ANALYSIS_TYPES}, fail_fast=fail_fast)
+
+def _log_dag(dag: DagRun) -> dict:
+    trace = dag.trace()
+    logger.info(
+        f"analyze-all DAG - Wall: {trace['wall_ms']}ms, "
+        f"Critical path: {' -> '.join(trace['critical_path'])} ({trace['critical_path_ms']}ms)"
+    )
+    return trace
+
+def run_dag(profile: UserProfile) -> Tuple[Dict[str, str], dict]:
+    """Run the analysis DAG; returns the results and the timing trace"""
+    dag = analysis_dag(profile)
+    results = dict(dag.run())
+    return {analysis_type: results[analysis_type] for analysis_type in ANALYSIS_TYPES}, _log_dag(dag)
+
+def _error_message(error: BaseException) -> str:
+    return str(error.detail) if isinstance(error, HTTPException) else f"{type(error).__name__}: {error}"
+
+def stream_sections(
+    profile: UserProfile,
+    mode: str,
+    trace: Optional[dict] = None
+) -> Iterator[Dict[str, str]]:
+    """
+    Yield {"section", "content"} events as each analysis completes (trace is filled in
+    dag mode). A section that fails yields {"section", "error"} and the others go on.
+    """
+    if mode == "dag":
+        dag = analysis_dag(profile, fail_fast=False)
+        for analysis_type, analysis in dag.run():
+            if analysis_type in dag.errors:
+                logger.warning(f"analyze-all section {analysis_type} failed: {dag.errors[analysis_type]}")
+                yield {"section": analysis_type, "error": _error_message(dag.errors[analysis_type])}
+            else:
+                yield {"section": analysis_type, "content": analysis}
+        if trace is not None:
+            trace.update(_log_dag(dag))
+        return
+
+    done = _cached_sections(profile)
+    for analysis_type, analysis in done.items():
+        yield {"section": analysis_type, "content": analysis}
+
+    if mode == "combined" and len(done) < len(ANALYSIS_TYPES):
+        try:
+            rendered = render_combined(profile.dict())
+            splitter = SectionSplitter()
+            chunks = call_ai_stream(
+                rendered.prompt,
+                rendered.system,
+                analysis_type="combined",
+                prompt_version=rendered.version,
+                max_lines=rendered.max_lines
+            )
+            for chunk in itertools.chain(chunks, [None]):
+                sections = splitter.feed(chunk) if chunk is not None else splitter.close()
+                for analysis_type, analysis in sections:
+                    if analysis_type in ANALYSIS_TYPES and analysis and analysis_type not in done:
+                        _store_section(profile, analysis_type, analysis)
+                        done[analysis_type] = analysis
+                        yield {"section": analysis_type, "content": analysis}
+        except Exception as e:
+            # Sections the combined call didn't deliver are generated one by one below
+            logger.warning(f"Combined analyze-all failed, generating remaining sections separately: {e}")
+
+    for analysis_type in ANALYSIS_TYPES:
+        if analysis_type not in done:
+            try:
+                yield {"section": analysis_type, "content": ANALYSES[analysis_type](profile)}
+            except Exception as e:
+                logger.warning(f"analyze-all section {analysis_type} failed: {e}")
+                yield {"section": analysis_type, "error": _error_message(e)}
 
 # ============ API ENDPOINTS ============
 
@@ -956,7 +674,9 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
-            "analyze": "/api/analyze (POST)"
+            "analyze": "/api/analyze (POST)",
+            "update_profile": "/api/update-profile (POST)",
+            "metrics": "/api/metrics"
         }
     }
 
@@ -965,7 +685,24 @@ async def health():
     """Health check"""
     return {
         "status": "healthy",
-        "groq_api_configured": bool(os.getenv('GROQ_API_KEY'))
+        "groq_api_configured": bool(os.getenv('GROQ_API_KEY')),
+        "prompt_version": PROMPT_VERSION,
+        "analysis_cache": analysis_cache.stats(),
+        "shared_cache": shared_cache.stats()
+    }
+
+@app.get("/api/metrics")
+async def metrics(api_key: str = Depends(verify_api_key)):
+    """
+    AI call metrics per analysis type and model, with the active routing table
+
+    Requires X-API-Key header for authentication.
+    """
+    return {
+        **ai_metrics.snapshot(),
+        "routes": {name: vars(route) for name, route in ROUTES.items()},
+        "analysis_cache": analysis_cache.stats(),
+        "shared_cache": shared_cache.stats()
     }
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
@@ -1009,11 +746,88 @@ async def analyze(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/update-profile")
+@limiter.limit("10/minute")  # 10 requests per minute per IP
+async def update_profile(
+    request: Request,
+    update: ProfileUpdateRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Re-run only the analyses whose inputs changed after a profile edit
+
+    Requires X-API-Key header for authentication.
+    Rate limit: 10 requests per minute per IP address.
+
+    Analyses whose declared fields are unchanged are served from cache; the rest
+    are regenerated. FIRE and interests build on summaries of the career and side
+    hustle results, as in analyze-all's dag mode, so those upstream analyses are
+    resolved first and count as affected when they change. With previous_profile,
+    changed_fields and affected list what the edit touched.
+
+    Returns: {analyses, regenerated, from_cache, changed_fields, affected, timestamp}
+    """
+    from datetime import datetime
+
+    analysis_types = update.analysis_types or list(ANALYSES)
+    invalid = [t for t in analysis_types if t not in ANALYSES]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid analysis_types {invalid}. Must be among: {list(ANALYSES)}"
+        )
+
+    changed_fields = affected = None
+    if update.previous_profile is not None:
+        before, after = update.previous_profile.dict(), update.profile.dict()
+        changed_fields = sorted(field for field in after if after[field] != before.get(field))
+
+        def touched(analysis_type: str) -> bool:
+            return bool(ANALYSIS_FIELDS[analysis_type] & set(changed_fields)) or any(
+                touched(name) for name in DEPENDENCIES.get(analysis_type, {})
+            )
+
+        affected = [t for t in analysis_types if touched(t)]
+
+    try:
+        results, regenerated, from_cache = {}, [], []
+
+        def resolve(analysis_type: str) -> str:
+            if analysis_type not in results:
+                upstream = upstream_summaries(
+                    analysis_type, {name: resolve(name) for name in DEPENDENCIES.get(analysis_type, {})}
+                )
+                cached = analysis_cache.get(analysis_cache_key(analysis_type, update.profile, upstream))
+                if cached is not None:
+                    results[analysis_type] = cached
+                    from_cache.append(analysis_type)
+                else:
+                    results[analysis_type] = generate_analysis(analysis_type, update.profile, upstream=upstream)
+                    regenerated.append(analysis_type)
+            return results[analysis_type]
+
+        analyses = {analysis_type: resolve(analysis_type) for analysis_type in analysis_types}
+
+        logger.info(f"Profile update - Changed: {changed_fields}, Regenerated: {regenerated}, Cached: {from_cache}")
+        return {
+            "analyses": analyses,
+            "regenerated": regenerated,
+            "from_cache": from_cache,
+            "changed_fields": changed_fields,
+            "affected": affected,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/analyze-all")
 @limiter.limit("3/hour")  # 3 requests per hour per IP (heavy operation)
 async def analyze_all(
     request: Request,
     profile: UserProfile,
+    mode: Optional[str] = None,
+    stream: bool = False,
+    trace: bool = False,
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -1022,19 +836,51 @@ async def analyze_all(
     Requires X-API-Key header for authentication.
     Rate limit: 3 requests per hour per IP address (this is a heavy operation).
 
-    Returns: {career, roi, fire, side_hustle, interests_roadmap}
+    mode: "dag" (in parallel; FIRE and interests build on career/side hustle results) |
+          "fanout" (one request per analysis) | "combined" (one request for all five),
+          defaults to ANALYZE_ALL_MODE
+    stream: return NDJSON events, one {"section", "content"} per analysis as it
+            completes ({"section", "error"} if it failed), then {"timestamp"}
+    trace: in dag mode, add per-analysis timings and the critical path as "trace"
+
+    Returns: {career, roi, fire, side_hustle, interests_roadmap, timestamp}
     """
     from datetime import datetime
 
+    mode = mode or ANALYZE_ALL_MODE
+    if mode not in ANALYZE_ALL_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode. Must be one of: {list(ANALYZE_ALL_MODES)}"
+        )
+
+    if stream:
+        def events():
+            dag_trace = {}
+            try:
+                for event in stream_sections(profile, mode, trace=dag_trace):
+                    yield json.dumps(event, ensure_ascii=False) + "\n"
+            except Exception as e:
+                yield json.dumps({"error": _error_message(e)}, ensure_ascii=False) + "\n"
+                return
+            final = {"timestamp": datetime.now().isoformat()}
+            if trace and dag_trace:
+                final["trace"] = dag_trace
+            yield json.dumps(final) + "\n"
+
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
     try:
-        results = {
-            "career": analyze_career(profile),
-            "roi": analyze_roi(profile),
-            "fire": analyze_fire(profile),
-            "side_hustle": analyze_side_hustle(profile),
-            "interests_roadmap": analyze_interests_roadmap(profile),
-            "timestamp": datetime.now().isoformat()
-        }
+        dag_trace = None
+        if mode == "dag":
+            results, dag_trace = run_dag(profile)
+        elif mode == "combined":
+            results = run_combined(profile)
+        else:
+            results = {name: run(profile) for name, run in ANALYSES.items()}
+        results["timestamp"] = datetime.now().isoformat()
+        if trace and dag_trace:
+            results["trace"] = dag_trace
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,80 @@
+"""
+Metrics for Guindo Backend
+In-process counters and latency summaries for AI calls
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional, Tuple
+
+# Latency samples kept per (analysis_type, model) for percentiles
+SAMPLE_SIZE = 500
+
+
+class AIMetrics:
+    """Aggregates AI calls by analysis type and model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], dict] = defaultdict(self._empty)
+
+    @staticmethod
+    def _empty() -> dict:
+        return {
+            "calls": 0,
+            "errors": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "max_tokens": 0,
+            "latency_ms": deque(maxlen=SAMPLE_SIZE),
+        }
+
+    def record_call(
+        self,
+        analysis_type: str,
+        model: str,
+        latency_ms: float,
+        max_tokens: int,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        fallback: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record one model call (error is the exception class name when it failed)"""
+        with self._lock:
+            stats = self._stats[(analysis_type, model)]
+            stats["calls"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["fallbacks"] += 1 if fallback else 0
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["max_tokens"] = max_tokens
+            stats["latency_ms"].append(latency_ms)
+
+    def snapshot(self) -> dict:
+        """JSON-friendly summary, one entry per analysis type and model"""
+        with self._lock:
+            out = []
+            for (analysis_type, model), stats in sorted(self._stats.items()):
+                latencies = sorted(stats["latency_ms"])
+                ok_calls = stats["calls"] - stats["errors"]
+                out.append({
+                    "analysis_type": analysis_type,
+                    "model": model,
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "fallbacks": stats["fallbacks"],
+                    "max_tokens": stats["max_tokens"],
+                    "avg_prompt_tokens": round(stats["prompt_tokens"] / ok_calls) if ok_calls else 0,
+                    "avg_completion_tokens": round(stats["completion_tokens"] / ok_calls) if ok_calls else 0,
+                    "p50_ms": round(latencies[len(latencies) // 2]) if latencies else None,
+                    "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)]) if latencies else None,
+                })
+            return {"ai_calls": out}
+
+
+ai_metrics = AIMetrics()
+
+
+__all__ = ["AIMetrics", "ai_metrics"]
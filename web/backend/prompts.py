@@ -0,0 +1,421 @@
+"""
+Prompt Templates for Guindo Backend
+Versioned prompt files compiled once at import time
+"""
+
+import hashlib
+import json
+import os
+import re
+import string
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+TEMPLATES_DIR = os.getenv(
+    "PROMPT_TEMPLATES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+)
+
+# Industry used when the profile does not specify one
+DEFAULT_INDUSTRY = "Technology & Engineering"
+
+# Compaction stage: drop empty/default fields, repeated boilerplate and table padding
+PROMPT_COMPACT = os.getenv("PROMPT_COMPACT", "1").lower() in ("1", "true", "yes")
+
+# Slot types allowed in manifest.json
+SLOT_TYPES: Dict[str, Callable] = {
+    "str": lambda v: "" if v is None else str(v),
+    "int": int,
+}
+
+# Slots computed from other profile fields rather than read directly
+DERIVED_SLOTS: Dict[str, Callable[[Mapping], int]] = {
+    "years_left": lambda v: int(v["retire_age"]) - int(v["age"]),
+    "years_to_fire": lambda v: int(v["retire_age"]) - int(v["age"]),
+}
+
+# Profile fields each derived slot is computed from
+DERIVED_FROM: Dict[str, Tuple[str, ...]] = {
+    "years_left": ("retire_age", "age"),
+    "years_to_fire": ("retire_age", "age"),
+}
+
+# A line holding only this marker separates the profile block from the instructions
+INSTRUCTIONS_MARKER = "@instructions"
+
+# A line holding only this marker before a "## " heading marks that section as
+# profile-independent: it may be generated once per industry and stitched in
+SHARED_MARKER = "@shared"
+SECTION_HEADING = re.compile(r"^## ")
+
+# Split shared sections out of the analysis prompts
+SHARED_SECTIONS = os.getenv("SHARED_SECTIONS", "1").lower() in ("1", "true", "yes")
+
+# Prompt layout: "prefix" puts the title and instructions first (slots shown as
+# [references]) and the profile last, so requests share a prefix that providers can
+# cache; "profile_first" is the original order
+LAYOUTS = ("prefix", "profile_first")
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "prefix")
+if PROMPT_LAYOUT not in LAYOUTS:
+    raise ValueError(f"PROMPT_LAYOUT must be one of {LAYOUTS}")
+
+# Line modes: always rendered, "?" dropped if any slot is empty, "~" dropped when compacting if all slots are empty
+LINE_ALWAYS, LINE_OPTIONAL, LINE_COMPACTABLE = "", "?", "~"
+
+# A compiled line is (mode, segments); a segment is (literal, slot, fallback)
+Segment = Tuple[str, Optional[str], Optional[str]]
+CompiledLine = Tuple[str, Tuple[Segment, ...]]
+
+# Declared output budget, e.g. "Max 60 lines."
+LINE_BUDGET = re.compile(r"\bMax (\d+) lines\b")
+
+TABLE_SEPARATOR = re.compile(r"^\|(\s*:?-+:?\s*\|)+$")
+TABLE_PADDING = re.compile(r" {2,}(?=\|)")
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A rendered prompt ready to send, plus the ids needed for caching and telemetry"""
+    analysis_type: str
+    system: str
+    prompt: str
+    version: str
+    cache_key: str
+    max_lines: Optional[int] = None
+    shared: Tuple[str, ...] = ()  # headings of shared sections left out of the prompt
+
+
+class PromptTemplate:
+    """
+    A prompt template compiled from a text file.
+
+    Syntax:
+    - {slot} is replaced with the slot value
+    - {slot|fallback} uses the fallback text when the slot is empty
+    - a line starting with "?" is dropped when any of its slots is empty
+    - a line starting with "~" is dropped when compacting and all of its slots are empty
+    - a line "@instructions" ends the profile block and starts the instructions
+    - a line "@shared" before a "## " heading marks that section as shared: it may not
+      use slots, and can be left out of the prompt and generated separately
+    - {{ and }} are literal braces
+
+    When compacting, slot values equal to their manifest default count as empty.
+    """
+
+    def __init__(self, name: str, source: str, slots: Dict[str, str], system):
+        self.name = name
+        self.slots = slots
+        self.system = system
+        self.split_at = None
+        self.shared_of: List[Optional[str]] = []  # per compiled line: heading of its shared section
+        self.lines = self._compile(source)
+        # Leading slot-free lines (the title), moved ahead of the instructions in the prefix layout
+        self.title_end = 0
+        while self.title_end < len(self.lines) and self.title_end != self.split_at:
+            mode, segments = self.lines[self.title_end]
+            if mode or not "".join(literal for literal, _, _ in segments) or any(slot for _, slot, _ in segments):
+                break
+            self.title_end += 1
+        budget = LINE_BUDGET.search(source)
+        self.max_lines = int(budget.group(1)) if budget else None
+
+    def _compile(self, source: str) -> List[CompiledLine]:
+        formatter = string.Formatter()
+        compiled = []
+        shared_next = False
+        shared = None
+        for raw_line in source.split("\n"):
+            if raw_line == INSTRUCTIONS_MARKER:
+                self.split_at = len(compiled)
+                continue
+            if raw_line == SHARED_MARKER:
+                shared_next = True
+                continue
+            if SECTION_HEADING.match(raw_line) or LINE_BUDGET.search(raw_line):
+                shared = raw_line if shared_next else None
+                shared_next = False
+            elif shared_next:
+                raise ValueError(f"{self.name}: {SHARED_MARKER} must be followed by a '## ' heading")
+            mode = raw_line[:1] if raw_line[:1] in (LINE_OPTIONAL, LINE_COMPACTABLE) else LINE_ALWAYS
+            line = raw_line[len(mode):]
+            segments = []
+            for literal, field, spec, conversion in formatter.parse(line):
+                if field is None:
+                    segments.append((literal, None, None))
+                    continue
+                if spec or conversion:
+                    raise ValueError(f"{self.name}: format specs are not supported in {{{field}}}")
+                slot, _, fallback = field.partition("|")
+                if slot not in self.slots:
+                    raise ValueError(f"{self.name}: slot '{slot}' is not declared in manifest.json")
+                if shared:
+                    raise ValueError(f"{self.name}: shared section '{shared}' uses slot '{slot}'")
+                segments.append((literal, slot, fallback or None))
+            compiled.append((mode, tuple(segments)))
+            self.shared_of.append(shared)
+        return compiled
+
+    @property
+    def shared_sections(self) -> Dict[str, str]:
+        """Shared sections as {heading: text}, in template order"""
+        sections: Dict[str, List[str]] = {}
+        for (_, segments), shared in zip(self.lines, self.shared_of):
+            if shared:
+                sections.setdefault(shared, []).append("".join(literal for literal, _, _ in segments))
+        return {heading: "\n".join(lines).strip() for heading, lines in sections.items()}
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """Profile fields the rendered prompt depends on (the system prompt may read primary_industry)"""
+        fields = set()
+        for slot in self.slots:
+            fields.update(DERIVED_FROM.get(slot, (slot,)))
+        if isinstance(self.system, dict):
+            fields.add("primary_industry")
+        return frozenset(fields)
+
+    def slot_values(self, values: Mapping) -> Dict[str, object]:
+        """Coerce profile values into typed slot values"""
+        result = {}
+        for slot, slot_type in self.slots.items():
+            try:
+                raw = DERIVED_SLOTS[slot](values) if slot in DERIVED_SLOTS else values[slot]
+            except KeyError as e:
+                raise ValueError(f"{self.name}: missing value for slot {e}")
+            result[slot] = SLOT_TYPES[slot_type](raw)
+        return result
+
+    def render(
+        self,
+        slot_values: Mapping,
+        compact: bool = False,
+        part: Optional[str] = None,
+        skip_shared: bool = False,
+        references: bool = False
+    ) -> str:
+        """
+        Render the template from already-coerced slot values.
+
+        part is "title", "profile", "profile_body" (profile without title) or
+        "instructions"; skip_shared leaves out the shared sections; references renders
+        slots as [reference] labels and keeps every line, so the text is the same for
+        all profiles.
+        """
+        lines = list(zip(self.lines, self.shared_of))
+        if part is not None:
+            if self.split_at is None:
+                raise ValueError(f"{self.name}: template has no {INSTRUCTIONS_MARKER} marker")
+            start, end = {
+                "title": (0, self.title_end),
+                "profile": (0, self.split_at),
+                "profile_body": (self.title_end, self.split_at),
+                "instructions": (self.split_at, len(lines)),
+            }[part]
+            lines = lines[start:end]
+
+        out = []
+        for (mode, segments), shared in lines:
+            if skip_shared and shared:
+                continue
+            parts = []
+            empty = []
+            for literal, slot, fallback in segments:
+                parts.append(literal)
+                if slot is None:
+                    continue
+                if references:
+                    parts.append(f"[{REFERENCES.get(slot, slot.replace('_', ' '))}]")
+                    continue
+                value = str(slot_values[slot])
+                empty.append(not value or (compact and value == DEFAULTS.get(slot)))
+                parts.append(value or fallback or "")
+            if mode == LINE_OPTIONAL and any(empty):
+                continue
+            if mode == LINE_COMPACTABLE and compact and empty and all(empty):
+                continue
+            out.append("".join(parts))
+        return "\n".join(out)
+
+    def system_prompt(self, industry: Optional[str]) -> str:
+        """Select the system prompt, by industry when the template has a table"""
+        if isinstance(self.system, str):
+            return self.system
+        return self.system.get(industry or DEFAULT_INDUSTRY, self.system["Other"])
+
+
+def compact_text(text: str) -> str:
+    """
+    Drop repeats of boilerplate lines (the first copy is kept), trailing spaces,
+    table padding and repeated blank lines
+    """
+    out = []
+    seen = set()
+    for line in text.split("\n"):
+        line = line.rstrip()
+        if line in BOILERPLATE:
+            if line in seen:
+                continue
+            seen.add(line)
+        if line.startswith("|"):
+            if TABLE_SEPARATOR.match(line):
+                line = "|" + "-|" * (line.count("|") - 1)
+            else:
+                line = TABLE_PADDING.sub(" ", line)
+        if not line and (not out or not out[-1]):
+            continue
+        out.append(line)
+    return "\n".join(out).strip("\n")
+
+
+def _load_templates(templates_dir: str) -> Tuple[dict, str, Dict[str, PromptTemplate], PromptTemplate]:
+    """Load and compile every template listed in manifest.json"""
+    digest = hashlib.sha256()
+    manifest_path = os.path.join(templates_dir, "manifest.json")
+    with open(manifest_path, "rb") as f:
+        manifest_bytes = f.read()
+    digest.update(manifest_bytes)
+    manifest = json.loads(manifest_bytes)
+
+    def load(name: str, spec: dict) -> PromptTemplate:
+        for slot_type in spec["slots"].values():
+            if slot_type not in SLOT_TYPES:
+                raise ValueError(f"{name}: unknown slot type '{slot_type}'")
+        with open(os.path.join(templates_dir, spec["template"]), "rb") as f:
+            source = f.read()
+        digest.update(source)
+        return PromptTemplate(
+            name=name,
+            source=source.decode("utf-8").rstrip("\n"),
+            slots=spec["slots"],
+            system=spec["system"],
+        )
+
+    templates = {name: load(name, spec) for name, spec in manifest["analyses"].items()}
+    combined = load("combined", manifest["combined"])
+
+    version = f"{manifest['version']}+{digest.hexdigest()[:8]}"
+    return manifest, version, templates, combined
+
+
+# COMBINED_TEMPLATE renders the whole profile once for single-call analyze-all
+MANIFEST, PROMPT_VERSION, TEMPLATES, COMBINED_TEMPLATE = _load_templates(TEMPLATES_DIR)
+DEFAULTS: Dict[str, str] = MANIFEST.get("defaults", {})
+# Instruction lines several templates share; compaction keeps one copy per prompt
+BOILERPLATE = frozenset(MANIFEST.get("compaction", {}).get("boilerplate", []))
+# Line budget of each shared section, taken off the analysis it is split from
+SHARED_MAX_LINES: int = MANIFEST.get("shared", {}).get("max_lines", 0)
+# Prefix layout: reference labels for slots used in instructions, and the profile heading
+REFERENCES: Dict[str, str] = MANIFEST.get("layout", {}).get("references", {})
+PROFILE_HEADING: str = MANIFEST.get("layout", {}).get("profile_heading", "PROFILE:")
+# Analysis dependencies for analyze-all and how upstream summaries are introduced
+UPSTREAM: dict = MANIFEST.get("upstream", {})
+
+
+def make_cache_key(analysis_type: str, values: Mapping, version: str = PROMPT_VERSION) -> str:
+    """Cache key for an analysis: prompt version + analysis type + the values it reads"""
+    payload = json.dumps(
+        {"v": version, "t": analysis_type, "f": dict(values)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def assemble(
+    static: List[str],
+    profile_title: str,
+    profile_body: str,
+    layout: str = PROMPT_LAYOUT
+) -> str:
+    """
+    Join prompt parts in the given layout. Prefix: static parts, then the profile under
+    PROFILE_HEADING. Profile first: the profile (title and body), then the static parts.
+    """
+    if layout == "prefix":
+        return "\n\n".join(static + [f"{PROFILE_HEADING}\n{profile_body.strip()}"])
+    return "\n\n".join([f"{profile_title}\n\n{profile_body.strip()}".strip()] + static)
+
+
+def render_prompt(
+    analysis_type: str,
+    profile: Mapping,
+    compact: Optional[bool] = None,
+    split_shared: Optional[bool] = None,
+    layout: Optional[str] = None,
+    upstream: Optional[Mapping[str, str]] = None
+) -> RenderedPrompt:
+    """
+    Render the system and user prompt for an analysis type from a profile dict.
+
+    With split_shared, shared sections are left out and their line budget is taken
+    off the prompt's; RenderedPrompt.shared lists them for shared.py to fill in.
+    upstream maps analysis types to summaries of their results, appended at the end
+    so the model reuses them instead of re-deriving them.
+    """
+    if compact is None:
+        compact = PROMPT_COMPACT
+    if split_shared is None:
+        split_shared = SHARED_SECTIONS
+    layout = layout or PROMPT_LAYOUT
+    template = TEMPLATES[analysis_type]
+    shared = tuple(template.shared_sections) if split_shared else ()
+    slot_values = template.slot_values(profile)
+    industry = profile.get("primary_industry")
+    key_values = dict(slot_values)
+    if isinstance(template.system, dict):
+        key_values["primary_industry"] = industry or ""
+
+    system = template.system_prompt(industry)
+    if layout == "prefix":
+        title = template.render(slot_values, part="title")
+        instructions = template.render(
+            slot_values, compact=compact, part="instructions", skip_shared=bool(shared), references=True
+        )
+        body = template.render(slot_values, compact=compact, part="profile_body")
+        prompt = assemble([f"{title}\n\n{instructions.strip()}".strip()], title, body, layout)
+    else:
+        prompt = template.render(slot_values, compact=compact, skip_shared=bool(shared))
+    version = PROMPT_VERSION
+    if compact:
+        prompt = compact_text(prompt)
+        version = f"{PROMPT_VERSION}/compact"
+    if layout == "prefix":
+        version = f"{version}/prefix"
+    if upstream:
+        key_values["upstream"] = dict(upstream)
+        blocks = [
+            f"{UPSTREAM['label'].replace('{analysis}', name.replace('_', ' '))}\n{summary.strip()}"
+            for name, summary in upstream.items()
+        ]
+        prompt = "\n\n".join([prompt, UPSTREAM["heading"]] + blocks)
+
+    max_lines = template.max_lines
+    if shared:
+        version = f"{version}/split"
+        if max_lines:
+            max_lines = max(1, max_lines - SHARED_MAX_LINES * len(shared))
+            prompt = LINE_BUDGET.sub(f"Max {max_lines} lines", prompt)
+
+    return RenderedPrompt(
+        analysis_type=analysis_type,
+        system=system,
+        prompt=prompt,
+        version=version,
+        cache_key=make_cache_key(analysis_type, key_values, version),
+        max_lines=max_lines,
+        shared=shared,
+    )
+
+
+__all__ = [
+    "COMBINED_TEMPLATE",
+    "PROMPT_VERSION",
+    "TEMPLATES",
+    "PromptTemplate",
+    "assemble",
+    "RenderedPrompt",
+    "compact_text",
+    "make_cache_key",
+    "render_prompt",
+]
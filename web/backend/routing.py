@@ -0,0 +1,79 @@
+"""
+Model Routing for Guindo Backend
+Per-analysis model, fallback model and output budget
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from logger import logger
+
+PRIMARY_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+FAST_MODEL = os.getenv("LLM_FAST_MODEL", "llama-3.1-8b-instant")
+
+# Output budget: markdown lines (tables, bullets) average well under this many tokens
+TOKENS_PER_LINE = int(os.getenv("LLM_TOKENS_PER_LINE", 32))
+MAX_TOKENS_HEADROOM = 1.25
+MAX_TOKENS_CAP = int(os.getenv("LLM_MAX_TOKENS", 4096))
+# The combined analyze-all request writes all five sections in one response
+COMBINED_MAX_TOKENS_CAP = int(os.getenv("LLM_COMBINED_MAX_TOKENS", 16384))
+
+
+@dataclass(frozen=True)
+class Route:
+    """Where an analysis type is sent"""
+    model: str = PRIMARY_MODEL
+    fallback_model: Optional[str] = FAST_MODEL
+    temperature: float = 0.7
+    timeout: float = 60.0  # seconds before the primary model counts as slow
+    max_tokens_cap: int = MAX_TOKENS_CAP
+
+
+# Default routing table. Override per analysis type with MODEL_ROUTES, e.g.
+# MODEL_ROUTES='{"fire": {"model": "llama-3.1-8b-instant", "fallback_model": null}}'
+DEFAULT_ROUTES: Dict[str, Route] = {
+    "career": Route(),
+    "roi": Route(timeout=90.0),
+    "fire": Route(),
+    "side_hustle": Route(timeout=75.0),
+    "interests_roadmap": Route(timeout=75.0),
+    "combined": Route(timeout=180.0, max_tokens_cap=COMBINED_MAX_TOKENS_CAP),
+    # Outline call of skeleton-then-expand generation: short, so the fast model goes first
+    "skeleton": Route(model=FAST_MODEL, fallback_model=PRIMARY_MODEL, temperature=0.3, timeout=30.0),
+}
+
+
+def _load_routes() -> Dict[str, Route]:
+    """Apply MODEL_ROUTES overrides on top of the default table"""
+    routes = dict(DEFAULT_ROUTES)
+    overrides = os.getenv("MODEL_ROUTES")
+    if not overrides:
+        return routes
+    try:
+        for analysis_type, fields in json.loads(overrides).items():
+            routes[analysis_type] = replace(routes.get(analysis_type, Route()), **fields)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Ignoring invalid MODEL_ROUTES: {e}")
+        return dict(DEFAULT_ROUTES)
+    return routes
+
+
+ROUTES = _load_routes()
+
+
+def get_route(analysis_type: str) -> Route:
+    """Route for an analysis type (default route for unknown types)"""
+    return ROUTES.get(analysis_type, Route())
+
+
+def max_tokens_for(max_lines: Optional[int], cap: int = MAX_TOKENS_CAP) -> int:
+    """Derive max_tokens from a prompt's declared line budget"""
+    if not max_lines:
+        return cap
+    return min(cap, math.ceil(max_lines * TOKENS_PER_LINE * MAX_TOKENS_HEADROOM))
+
+
+__all__ = ["Route", "ROUTES", "get_route", "max_tokens_for"]
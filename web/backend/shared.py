@@ -0,0 +1,75 @@
+"""
+Shared Sections for Guindo Backend
+Profile-independent sections generated once per industry and stitched into analyses
+"""
+
+from typing import Mapping, Optional
+
+from prompts import (
+    DEFAULT_INDUSTRY,
+    MANIFEST,
+    PROMPT_VERSION,
+    SECTION_HEADING,
+    SHARED_MAX_LINES,
+    TEMPLATES,
+    RenderedPrompt,
+    make_cache_key,
+)
+
+
+def render_shared(analysis_type: str, heading: str, industry: Optional[str] = None) -> RenderedPrompt:
+    """Prompt for one shared section; industry only matters for industry-specific analyses"""
+    template = TEMPLATES[analysis_type]
+    by_industry = isinstance(template.system, dict)
+    industry = industry or DEFAULT_INDUSTRY
+    # Industries without their own system prompt share the "Other" section
+    industry_key = (industry if industry in template.system else "Other") if by_industry else ""
+    audience = f" working in {industry}" if by_industry else ""
+    instruction = MANIFEST["shared"]["prompt"].replace("{audience}", audience).replace("{heading}", heading)
+    prompt = "\n\n".join([
+        instruction,
+        template.shared_sections[heading],
+        f"Max {SHARED_MAX_LINES} lines.",
+    ])
+    return RenderedPrompt(
+        analysis_type=analysis_type,
+        system=template.system_prompt(industry),
+        prompt=prompt,
+        version=PROMPT_VERSION,
+        cache_key=make_cache_key(
+            f"{analysis_type}/shared",
+            {"heading": heading, "primary_industry": industry_key},
+        ),
+        max_lines=SHARED_MAX_LINES,
+    )
+
+
+def _number(heading: str) -> str:
+    """'## 8️⃣ First 30 Days' -> '## 8️⃣'"""
+    return " ".join(heading.split()[:2])
+
+
+def stitch_shared(analysis_type: str, text: str, sections: Mapping[str, str]) -> str:
+    """Insert generated shared sections where the template has them, else append them"""
+    template = TEMPLATES[analysis_type]
+    headings = [
+        "".join(literal for literal, _, _ in segments)
+        for _, segments in template.lines
+        if segments and SECTION_HEADING.match(segments[0][0])
+    ]
+    lines = text.rstrip().split("\n")
+    for heading, section in sections.items():
+        following = headings[headings.index(heading) + 1:] if heading in headings else []
+        at = len(lines)
+        for next_heading in following:
+            if next_heading in sections:
+                continue
+            found = [i for i, line in enumerate(lines) if line.startswith(_number(next_heading))]
+            if found:
+                at = found[0]
+                break
+        lines[at:at] = [section.strip(), ""] if at < len(lines) else ["", section.strip()]
+    return "\n".join(lines)
+
+
+__all__ = ["render_shared", "stitch_shared"]
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("groq")
+pytest.importorskip("slowapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from benchmarks import load_sample_profile  # noqa: E402
+from cache import TTLCache  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "analysis_cache", TTLCache())
+    monkeypatch.setattr(main, "shared_cache", TTLCache())
+    # Each test streams analyze-all once; keep the per-IP limit out of the way
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    return TestClient(main.app)
+
+
+def _events(response):
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def _fake_model(fail=()):
+    def call_ai(prompt, system, analysis_type="unknown", **kwargs):
+        if analysis_type in fail:
+            raise RuntimeError(f"{analysis_type} model error")
+        return f"## 5️⃣ Salary\nProjected 100k\n{analysis_type} done"
+    return call_ai
+
+
+@pytest.mark.parametrize("mode", ["dag", "fanout"])
+def test_model_error_in_one_section_keeps_the_others(client, monkeypatch, mode):
+    monkeypatch.setattr(main, "call_ai", _fake_model(fail={"roi"}))
+    events = _events(client.post(f"/api/analyze-all?mode={mode}&stream=true", json=load_sample_profile()))
+
+    sections = {e["section"]: e for e in events if "section" in e}
+    assert set(sections) == set(main.ANALYSIS_TYPES)
+    assert "roi model error" in sections["roi"]["error"]
+    assert all("content" in sections[t] for t in main.ANALYSIS_TYPES if t != "roi")
+    assert "timestamp" in events[-1]
+
+
+def test_bad_profile_value_reports_each_failed_section(client, monkeypatch):
+    monkeypatch.setattr(main, "call_ai", _fake_model())
+    profile = dict(load_sample_profile(), retire_age="soon")
+    events = _events(client.post("/api/analyze-all?mode=dag&stream=true", json=profile))
+
+    sections = {e["section"]: e for e in events if "section" in e}
+    assert set(sections) == set(main.ANALYSIS_TYPES)
+    assert "content" in sections["career"]
+    assert "ValueError" in sections["fire"]["error"]
+    assert "timestamp" in events[-1]
+
+
+def test_dag_skips_analyses_built_on_a_failed_one(client, monkeypatch):
+    monkeypatch.setattr(main, "call_ai", _fake_model(fail={"career"}))
+    events = _events(client.post("/api/analyze-all?mode=dag&stream=true", json=load_sample_profile()))
+
+    sections = {e["section"]: e for e in events if "section" in e}
+    assert "career model error" in sections["career"]["error"]
+    assert "UpstreamFailed" in sections["fire"]["error"]
+    assert "UpstreamFailed" in sections["interests_roadmap"]["error"]
+    assert "content" in sections["roi"] and "content" in sections["side_hustle"]
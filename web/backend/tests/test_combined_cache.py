@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("groq")
+pytest.importorskip("slowapi")
+
+import main  # noqa: E402
+from benchmarks import load_sample_profile  # noqa: E402
+from cache import TTLCache  # noqa: E402
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Expansion on, fresh caches, and a model that records what it was asked for"""
+    sent = []
+
+    def fake_call_ai(prompt, system, analysis_type="unknown", **kwargs):
+        sent.append(analysis_type)
+        return f"## 1️⃣ Outline\n{analysis_type} section"
+
+    monkeypatch.setattr(main, "EXPANSION_ENABLED", True)
+    monkeypatch.setattr(main, "call_ai", fake_call_ai)
+    monkeypatch.setattr(main, "analysis_cache", TTLCache())
+    monkeypatch.setattr(main, "shared_cache", TTLCache())
+    return sent
+
+
+@pytest.mark.parametrize("analysis_type", sorted(main.EXPANDABLE))
+def test_combined_section_is_reused_by_expanded_analysis(calls, analysis_type):
+    profile = main.UserProfile(**load_sample_profile())
+    main._store_section(profile, analysis_type, "from combined")
+
+    assert main.generate_analysis(analysis_type, profile) == "from combined"
+    assert calls == []
+
+
+@pytest.mark.parametrize("analysis_type", sorted(main.EXPANDABLE))
+def test_expanded_analysis_is_found_by_combined_mode(calls, analysis_type):
+    profile = main.UserProfile(**load_sample_profile())
+    analysis = main.generate_analysis(analysis_type, profile)
+
+    assert main._cached_sections(profile)[analysis_type] == analysis
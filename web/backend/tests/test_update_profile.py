@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("groq")
+pytest.importorskip("slowapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from cache import TTLCache  # noqa: E402
+from benchmarks import load_sample_profile  # noqa: E402
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the model with canned Markdown and record the prompts sent"""
+    sent = []
+
+    def fake_call_ai(prompt, system, analysis_type="unknown", **kwargs):
+        sent.append(analysis_type)
+        return f"## 5️⃣ Salary\nProjected 100k\n### Which strategy should you START with?\nTutoring ({len(sent)})"
+
+    monkeypatch.setattr(main, "call_ai", fake_call_ai)
+    monkeypatch.setattr(main, "analysis_cache", TTLCache())
+    monkeypatch.setattr(main, "shared_cache", TTLCache())
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    return sent
+
+
+def test_update_profile_reuses_dag_results(calls):
+    client = TestClient(main.app)
+    profile = load_sample_profile()
+
+    dag = client.post("/api/analyze-all?mode=dag", json=profile)
+    assert dag.status_code == 200
+    generated = len(calls)
+
+    update = client.post("/api/update-profile", json={"profile": profile, "previous_profile": profile})
+    assert update.status_code == 200
+    body = update.json()
+    assert body["regenerated"] == []
+    assert sorted(body["from_cache"]) == sorted(main.ANALYSES)
+    assert len(calls) == generated
+    for analysis_type in main.ANALYSES:
+        assert body["analyses"][analysis_type] == dag.json()[analysis_type]
+
+
+def test_upstream_edit_regenerates_dependents(calls):
+    client = TestClient(main.app)
+    profile = load_sample_profile()
+    client.post("/api/analyze-all?mode=dag", json=profile)
+
+    edited = dict(profile, side_interests=profile["side_interests"] + ", woodworking")
+    body = client.post(
+        "/api/update-profile", json={"profile": edited, "previous_profile": profile}
+    ).json()
+    assert sorted(body["affected"]) == ["fire", "side_hustle"]
+    assert sorted(body["regenerated"]) == ["fire", "side_hustle"]
@@ -0,0 +1,55 @@
+"""
+Token Estimates for Guindo Backend
+Local token counting for prompt budgeting and reports
+"""
+
+import math
+import re
+from typing import List, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to the heuristic below
+    _ENCODING = None
+
+# Rough pre-tokenizer: words with a leading space, digit runs, punctuation runs, whitespace
+_PIECES = re.compile(r" ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+
+# Headings that start a prompt section: "## ...", "**...**:" or upper-case blocks like "👤 PERSON:"
+_SECTION_HEADING = re.compile(r"^(#{1,3} .+|\*\*[^*]+\*\*:|\W*[A-Z]{3,}[^:]*:)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (tiktoken cl100k when installed, heuristic otherwise)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        if piece.isspace():
+            tokens += 1 if "\n" in piece or len(piece) > 1 else 0
+        elif piece.isascii():
+            tokens += max(1, math.ceil(len(piece.strip()) / 6))
+        else:
+            tokens += max(1, math.ceil(len(piece.encode("utf-8")) / 3))
+    return tokens
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split a prompt into (heading, body) sections; text before the first heading is "preamble" """
+    sections = [("preamble", [])]
+    for line in text.split("\n"):
+        if _SECTION_HEADING.match(line.strip()):
+            sections.append((line.strip().lstrip("# ").rstrip(":"), [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(title, "\n".join(lines)) for title, lines in sections if any(l.strip() for l in lines)]
+
+
+def section_tokens(text: str) -> List[Tuple[str, int]]:
+    """Estimated tokens per prompt section"""
+    return [(title, estimate_tokens(body)) for title, body in split_sections(text)]
+
+
+__all__ = ["estimate_tokens", "split_sections", "section_tokens"]